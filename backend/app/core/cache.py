@@ -0,0 +1,241 @@
+import hashlib
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+from fastapi import Request, Response
+from app.core.config import settings
+from app.core.serialization import dump_json
+from app.core.downloads import not_modified
+from app.core.metrics import REGISTRY
+
+# Response cache with tag-version invalidation. Every tag has a version
+# token; an entry's key embeds the versions of its tags at the time it was
+# computed, so bumping a tag makes all its entries unreachable at once and
+# they simply age out of the LRU / TTL. A version also records when the tag
+# was bumped: a replica read within READ_YOUR_WRITES_SECONDS of that may not
+# show the write yet and is served but not stored.
+
+cache_requests = REGISTRY.counter(
+    "response_cache_requests_total", "Response cache lookups", ["endpoint", "result"]
+)
+cache_invalidations = REGISTRY.counter(
+    "response_cache_invalidations_total", "Response cache tags invalidated"
+)
+cache_errors = REGISTRY.counter(
+    "response_cache_errors_total", "Response cache backend failures (served uncached)"
+)
+not_modified_responses = REGISTRY.counter(
+    "response_not_modified_total", "List responses answered 304 from If-None-Match", ["endpoint"]
+)
+
+def _new_version(bumped: float = 0.0) -> str:
+    # "<random>:<wall clock ms of the bump>", 0 for a tag never bumped
+    return f"{uuid.uuid4().hex[:12]}:{int(bumped * 1000)}"
+
+def _bumped_at(version: str) -> float:
+    _, _, bumped = version.partition(":")
+    try:
+        return int(bumped) / 1000
+    except ValueError:
+        # Tokens written before bump times were recorded
+        return 0.0
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def tag_versions(self, tags: list[str]) -> list[str]:
+        # Current version of each tag. Unknown tags get a fresh random version,
+        # never a fixed initial one, so a forgotten tag cannot resurrect
+        # entries stored under an earlier version.
+        ...
+
+    @abstractmethod
+    async def bump(self, tags: list[str]) -> None: ...
+
+class MemoryCache(CacheBackend):
+    # Per worker; only touched from the event loop thread, so no locking
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._tags: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def tag_versions(self, tags: list[str]) -> list[str]:
+        versions = []
+        for tag in tags:
+            version = self._tags.get(tag)
+            if version is None:
+                version = self._tags[tag] = _new_version()
+            self._tags.move_to_end(tag)
+            versions.append(version)
+        while len(self._tags) > self.max_entries:
+            self._tags.popitem(last=False)
+        return versions
+
+    async def bump(self, tags: list[str]) -> None:
+        now = time.time()
+        for tag in tags:
+            self._tags[tag] = _new_version(now)
+            self._tags.move_to_end(tag)
+
+class RedisCache(CacheBackend):
+    # Shared across workers. redis is an optional dependency, only imported
+    # when this backend is selected; any server speaking the Redis protocol
+    # (Redis, Valkey, KeyDB, a local stand-in) works.
+    def __init__(self, url: str, prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires redis (pip install redis)") from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+
+    async def tag_versions(self, tags: list[str]) -> list[str]:
+        keys = [f"{self.prefix}tag:{t}" for t in tags]
+        values = await self.client.mget(keys)
+        missing = [k for k, v in zip(keys, values) if v is None]
+        if missing:
+            # SET NX: concurrent first readers agree on one version
+            async with self.client.pipeline(transaction=False) as pipe:
+                for k in missing:
+                    pipe.set(k, _new_version(), nx=True)
+                await pipe.execute()
+            values = await self.client.mget(keys)
+        return [v.decode() if isinstance(v, bytes) else str(v) for v in values]
+
+    async def bump(self, tags: list[str]) -> None:
+        now = time.time()
+        await self.client.mset({f"{self.prefix}tag:{t}": _new_version(now) for t in tags})
+
+@lru_cache
+def get_cache_backend() -> Optional[CacheBackend]:
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCache(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_KEY_PREFIX)
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    return None
+
+def task_tags(project_id: int, buyer_id: Optional[int], developer_id: Optional[int]) -> list[str]:
+    # Every cached view a task change can show up in
+    return [f"project:{project_id}", f"user:{buyer_id}", f"user:{developer_id}", "tasks"]
+
+async def invalidate(*tags: str):
+    # Call after the write has committed
+    backend = get_cache_backend()
+    tags = [t for t in dict.fromkeys(tags) if t]
+    if backend is None or not tags:
+        return
+    try:
+        await backend.bump(tags)
+        cache_invalidations.inc(len(tags))
+    except Exception:
+        # Entries still expire after RESPONSE_CACHE_TTL_SECONDS
+        cache_errors.inc()
+
+# Headers set by other dependencies (pagination cursors) that belong to the
+# cached response
+_CACHED_HEADERS = ("x-next-cursor", "link")
+
+def list_etag(body: bytes) -> str:
+    # Weak: identifies the JSON representation, not a byte sequence for ranges
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+class ResponseCache:
+    # Per-request dependency:
+    #   if (hit := await cache.lookup("projects:list", tags, vary=user.id)) is not None:
+    #       return hit
+    #   ...
+    #   return await cache.store(result, List[ProjectRead])
+    # Responses carry a weak ETag of the body, computed once when stored; a
+    # matching If-None-Match gets an empty 304, so a client whose list has
+    # not changed costs neither serialization nor transfer.
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+        self.backend = get_cache_backend()
+        self._key: Optional[str] = None
+        self._endpoint = ""
+        self._bumped = 0.0
+
+    def _respond(self, body: bytes, headers: dict) -> Response:
+        if not_modified(self.request, headers["etag"], None):
+            not_modified_responses.inc(endpoint=self._endpoint)
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def lookup(self, endpoint: str, tags: list[str], vary: Any = "") -> Optional[Response]:
+        self._endpoint = endpoint
+        if self.backend is None:
+            return None
+        query = sorted(self.request.query_params.multi_items())
+        try:
+            versions = await self.backend.tag_versions(tags)
+            self._key = f"{endpoint}|{vary}|{query}|{versions}"
+            self._bumped = max(map(_bumped_at, versions), default=0.0)
+            cached = await self.backend.get(self._key)
+        except Exception:
+            cache_errors.inc()
+            self._key = None
+            return None
+        if cached is None:
+            cache_requests.inc(endpoint=endpoint, result="miss")
+            return None
+        cache_requests.inc(endpoint=endpoint, result="hit")
+        raw_headers, _, body = cached.partition(b"\n")
+        headers = json.loads(raw_headers)
+        headers["x-cache"] = "hit"
+        return self._respond(body, headers)
+
+    def _may_be_stale(self) -> bool:
+        # Read from a replica soon after a write to one of the tags: the
+        # replica may still lag behind it, and caching the result would pin
+        # the stale view under the new version for the whole TTL
+        replica = getattr(self.request.state, "replica_read", False)
+        return replica and time.time() - self._bumped < settings.READ_YOUR_WRITES_SECONDS
+
+    async def store(self, content: Any, response_type: Any) -> Response:
+        body = dump_json(content, response_type)
+        headers = {k: v for k, v in self.response.headers.items() if k in _CACHED_HEADERS}
+        # no-cache: clients and proxies may store it but must revalidate
+        headers.update({"etag": list_etag(body), "cache-control": "private, no-cache"})
+        if self._key is not None and not self._may_be_stale():
+            try:
+                await self.backend.set(
+                    self._key,
+                    json.dumps(headers).encode() + b"\n" + body,
+                    settings.RESPONSE_CACHE_TTL_SECONDS,
+                )
+            except Exception:
+                cache_errors.inc()
+        return self._respond(body, {**headers, "x-cache": "miss"})
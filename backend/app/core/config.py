@@ -6,11 +6,168 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     
     DATABASE_URL: str
+    # Optional read replicas (JSON list in the env), used round-robin by
+    # get_read_db. Clients are pinned to the primary for
+    # READ_YOUR_WRITES_SECONDS after they commit, and for as long after an
+    # invalidation replica reads are not cached; an unreachable replica is
+    # skipped for REPLICA_RETRY_SECONDS.
+    DATABASE_REPLICA_URLS: list[str] = []
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Where recent writers are remembered: "memory" (per worker) or "redis"
+    # (shared, needs redis)
+    READ_YOUR_WRITES_BACKEND: str = "memory"
+    READ_YOUR_WRITES_REDIS_URL: str = "redis://localhost:6379/0"
+    READ_YOUR_WRITES_KEY_PREFIX: str = "ryw:"
+    REPLICA_RETRY_SECONDS: float = 30.0
+    # Connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg per-connection prepared statement cache
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Disable prepared statement caching for PgBouncer transaction pooling
+    DB_PGBOUNCER_MODE: bool = False
+    # Schema handling at startup: "migrate" applies pending migrations
+    # (app/migrations), "check" refuses to start while any are pending and
+    # "skip" does not touch the schema at all, for deployments that run
+    # `python -m app.core.migrations` as a release step.
+    SCHEMA_MODE: str = "migrate"
+    # Startup waits for the database with exponential backoff and jitter
+    # (base doubling up to max) and gives up after the timeout. Each attempt,
+    # and each /readyz check, may take DB_PING_TIMEOUT_SECONDS.
+    DB_STARTUP_TIMEOUT_SECONDS: float = 60.0
+    DB_RETRY_BASE_SECONDS: float = 0.1
+    DB_RETRY_MAX_SECONDS: float = 5.0
+    DB_PING_TIMEOUT_SECONDS: float = 2.0
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     UPLOAD_DIR: str = "/app/uploads"
+    # Solution uploads are streamed to disk in chunks of this size; requests
+    # with a larger body than the limit are rejected with 413.
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MAX_UPLOAD_SIZE_BYTES: int = 512 * 1024 * 1024
+
+    # Content-addressed solution storage: "local" ({UPLOAD_DIR}/blobs) or
+    # "s3" (any S3-compatible endpoint, e.g. a local MinIO; needs boto3)
+    STORAGE_BACKEND: str = "local"
+    S3_ENDPOINT_URL: str | None = None
+    S3_BUCKET: str = "solutions"
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_REGION: str | None = None
+    # `blobs gc` leaves unreferenced blobs younger than this alone: an upload
+    # is stored before the row referencing it commits
+    BLOB_GC_GRACE_SECONDS: int = 3600
+
+    # Solution downloads. "x-accel" (nginx) / "x-sendfile" (Apache, lighttpd)
+    # hand the file to the reverse proxy; DOWNLOAD_OFFLOAD_PREFIX is the
+    # internal location mapped to UPLOAD_DIR. Local storage only.
+    DOWNLOAD_OFFLOAD: str = "none"
+    DOWNLOAD_OFFLOAD_PREFIX: str = "/protected-uploads"
+    # Use the ASGI zero-copy send extension when the server offers it
+    DOWNLOAD_ZERO_COPY: bool = True
+
+    # bcrypt cost factor. Hashes with a different cost are transparently
+    # re-hashed on the next successful login.
+    BCRYPT_ROUNDS: int = 12
+    # Dedicated threads for bcrypt (it releases the GIL) and how many extra
+    # calls may wait for one before new logins get a 503.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # In-process cache of authenticated principals, keyed by token subject.
+    # Each worker has its own copy, so TTL bounds staleness across workers.
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+    # Embed uid/role/name claims in issued JWTs and trust them on the way in,
+    # skipping the user lookup entirely. Role changes then only take effect
+    # once the token expires.
+    JWT_EMBED_CLAIMS: bool = False
+
+    # Keyset pagination: page size of /sync/ and /jobs/, and of list pages
+    # requested with ?cursor but no ?limit (other lists are only paged on request)
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+    # Delta sync (/sync/*). A caught-up cursor points SYNC_SETTLE_SECONDS
+    # back, so rows stamped just before a slow commit are not skipped; they
+    # may be sent twice. Cursors older than the tombstone retention get 410.
+    SYNC_SETTLE_SECONDS: float = 5.0
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    # Upper bound on items per bulk request (/tasks/bulk, /payments/batch)
+    BULK_MAX_ITEMS: int = 1000
+    # How long a stored Idempotency-Key response is replayed
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # Rows fetched per round trip by the streaming /export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Token-bucket rate limits (modules/auth/ratelimit.py) as "N/period",
+    # period one of second, minute, hour, day, optionally with a count
+    # ("5/30seconds"). Login and register are per client IP, submit per user.
+    # "memory" keeps buckets per worker, so with several workers each allows
+    # the full rate; "redis" (needs the redis package) shares them.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_KEY_PREFIX: str = "rl:"
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_REGISTER: str = "20/hour"
+    RATE_LIMIT_SUBMIT: str = "30/hour"
+
+    # Server-sent task events (modules/events). "memory" fans out within this
+    # process only; with several workers use "redis" (needs the redis
+    # package) so an event reaches streams held by any worker.
+    EVENTS_BROKER: str = "memory"
+    EVENTS_REDIS_URL: str = "redis://localhost:6379/0"
+    EVENTS_CHANNEL_PREFIX: str = "events:"
+    # Comment frame sent on idle streams so proxies keep them open
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    # Frames buffered per stream before a slow client is told to resync
+    EVENTS_QUEUE_SIZE: int = 100
+
+    # Background jobs (modules/jobs). The worker runs inside each API process
+    # unless JOB_WORKER_IN_PROCESS is off, in which case run
+    # `python -m app.modules.jobs.worker` separately. A job is retried with
+    # exponential backoff (base..max seconds) up to JOB_MAX_ATTEMPTS times; a
+    # claimed job not finished within JOB_VISIBILITY_TIMEOUT_SECONDS is
+    # handed to another worker.
+    JOB_WORKER_IN_PROCESS: bool = True
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETRY_MAX_SECONDS: float = 600.0
+    # Virus scanner run on every submitted ZIP, with the file path appended,
+    # e.g. "clamdscan --no-summary --fdpass". Exit code 0 = clean, 1 = infected.
+    JOB_VIRUS_SCAN_COMMAND: str = ""
+    # Notifications are POSTed here as JSON when set (logged otherwise)
+    NOTIFY_WEBHOOK_URL: str = ""
+
+    # Request profiling middleware (core/profiling.py): per-route timings and
+    # SQL counts on /metrics plus Server-Timing headers. Requests that run
+    # one statement PROFILE_N_PLUS_ONE_THRESHOLD+ times are flagged. A
+    # PROFILE_SAMPLE_RATE fraction of requests is profiled ("cprofile", or
+    # "pyinstrument" if installed) and kept in PROFILE_DIR when slower than
+    # PROFILE_SLOW_MS.
+    PROFILING_ENABLED: bool = False
+    PROFILE_N_PLUS_ONE_THRESHOLD: int = 10
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_SLOW_MS: float = 500.0
+    PROFILE_ENGINE: str = "cprofile"
+    PROFILE_DIR: str = "profiles"
+
+    # Response cache for hot read endpoints: "memory" (per worker LRU),
+    # "redis" (shared; any Redis-protocol server, needs the redis package) or
+    # "none". Writes invalidate by tag; the TTL bounds staleness otherwise.
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_KEY_PREFIX: str = "rc:"
 
     model_config = ConfigDict(case_sensitive=True)
 
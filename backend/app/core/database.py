@@ -1,8 +1,100 @@
+import hashlib
+import itertools
+import time
+import uuid
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from fastapi import Request
+from sqlalchemy import exc, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import REGISTRY
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+pool_checkout_wait = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+pool_checkout_timeouts = REGISTRY.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ["pool"],
+)
+read_your_writes_errors = REGISTRY.counter(
+    "read_your_writes_errors_total", "Read-your-writes store failures (reads went to the primary)"
+)
+pool_gauges = [
+    (REGISTRY.gauge("db_pool_size", "Configured pool size", ["pool"]), "size"),
+    (REGISTRY.gauge("db_pool_checked_out", "Connections currently in use", ["pool"]), "checkedout"),
+    (REGISTRY.gauge("db_pool_overflow", "Connections beyond pool_size (negative while the pool fills)", ["pool"]), "overflow"),
+    (REGISTRY.gauge("db_pool_idle", "Idle connections in the pool", ["pool"]), "checkedin"),
+]
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    # Times every checkout so pool exhaustion shows up as wait time instead
+    # of requests silently hanging. `label` is set by instrument_pool.
+    label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_checkout_timeouts.inc(pool=self.label)
+            raise
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - started, pool=self.label)
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+def engine_options(database_url: str) -> tuple[str, dict]:
+    url = make_url(database_url)
+    options = {"echo": False, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if url.get_backend_name() == "sqlite":
+        # SQLite keeps SQLAlchemy's default pool for its driver
+        return database_url, options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.get_driver_name() == "asyncpg":
+        if settings.DB_PGBOUNCER_MODE:
+            # PgBouncer in transaction mode hands each transaction to a different
+            # server connection, so named prepared statements must not be reused:
+            # disable both asyncpg's and SQLAlchemy's statement caches and give
+            # every statement a unique name.
+            url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return url.render_as_string(hide_password=False), options
+
+def instrument_pool(engine, label: str = "primary"):
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return
+    pool.label = label
+    for gauge, method in pool_gauges:
+        gauge.set_function(getattr(pool, method), pool=label)
+
+_url, _options = engine_options(settings.DATABASE_URL)
+engine = create_async_engine(_url, **_options)
+instrument_pool(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -14,6 +106,153 @@ AsyncSessionLocal = async_sessionmaker(
 class Base(DeclarativeBase):
     pass
 
-async def get_db():
+def client_key(request: Request) -> str | None:
+    # Identifies "the same client" for read-your-writes without decoding the
+    # token: a digest of the Authorization header.
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+class ReadYourWrites:
+    # Remembers which clients committed recently, so their reads can skip the
+    # (possibly lagging) replicas. Per worker: with several workers a client's
+    # next read may land on one that did not see the write (see RedisReadYourWrites).
+    def __init__(self, window: float, max_size: int = 100_000):
+        self.window = window
+        self.max_size = max_size
+        self._last_write: dict[str, float] = {}
+
+    async def record(self, key: str):
+        if len(self._last_write) >= self.max_size:
+            cutoff = time.monotonic() - self.window
+            self._last_write = {k: t for k, t in self._last_write.items() if t > cutoff}
+        self._last_write[key] = time.monotonic()
+
+    async def pinned(self, key: str) -> bool:
+        last = self._last_write.get(key)
+        return last is not None and time.monotonic() - last < self.window
+
+    async def close(self) -> None:
+        pass
+
+class RedisReadYourWrites(ReadYourWrites):
+    # Shared across workers: one key per recent writer, expiring with the
+    # window. redis is an optional dependency, only imported when selected.
+    # A failed record is counted in read_your_writes_errors_total.
+    def __init__(self, window: float, url: str, prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("READ_YOUR_WRITES_BACKEND=redis requires redis (pip install redis)") from e
+        self.window = window
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def record(self, key: str):
+        try:
+            await self.client.set(self.prefix + key, b"1", px=max(int(self.window * 1000), 1))
+        except Exception:
+            read_your_writes_errors.inc()
+
+    async def pinned(self, key: str) -> bool:
+        try:
+            return bool(await self.client.exists(self.prefix + key))
+        except Exception:
+            # Unknown: the primary is always up to date
+            read_your_writes_errors.inc()
+            return True
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+@lru_cache
+def get_read_your_writes() -> ReadYourWrites:
+    if settings.READ_YOUR_WRITES_BACKEND == "redis":
+        return RedisReadYourWrites(
+            settings.READ_YOUR_WRITES_SECONDS, settings.READ_YOUR_WRITES_REDIS_URL, settings.READ_YOUR_WRITES_KEY_PREFIX
+        )
+    return ReadYourWrites(settings.READ_YOUR_WRITES_SECONDS)
+
+@event.listens_for(Session, "after_commit")
+def _mark_write(session):
+    # Read routes never commit, so any commit on a request session is a
+    # write; get_db records it once the request's work is done
+    session.info["committed"] = True
+
+class ReplicaSet:
+    def __init__(self, urls: list[str]):
+        self.engines = []
+        self.sessionmakers = []
+        for i, replica_url in enumerate(urls):
+            url, options = engine_options(replica_url)
+            replica = create_async_engine(url, **options)
+            instrument_pool(replica, label=f"replica{i}")
+            self.engines.append(replica)
+            self.sessionmakers.append(async_sessionmaker(
+                bind=replica,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+            ))
+        self._down_until = [0.0] * len(urls)
+        self._turn = itertools.count()
+
+    def __len__(self):
+        return len(self.engines)
+
+    def candidates(self) -> list[int]:
+        # Healthy replicas, starting from the next one in round-robin order
+        if not self.engines:
+            return []
+        start = next(self._turn) % len(self.engines)
+        order = [(start + i) % len(self.engines) for i in range(len(self.engines))]
+        now = time.monotonic()
+        return [i for i in order if self._down_until[i] <= now]
+
+    def mark_down(self, index: int):
+        self._down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+    async def dispose(self):
+        for replica in self.engines:
+            await replica.dispose()
+
+replicas = ReplicaSet(settings.DATABASE_REPLICA_URLS)
+
+async def get_db(request: Request):
+    key = client_key(request)
     async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            # Dependency exit runs before the response is sent, so the client
+            # can't read before its write is recorded
+            if key is not None and session.info.get("committed"):
+                await get_read_your_writes().record(key)
+
+@asynccontextmanager
+async def read_session(client_key: str | None = None):
+    # Session for read-only work: a healthy replica, or the primary when no
+    # replica is configured/reachable or the client has just written.
+    if len(replicas) and not (client_key is not None and await get_read_your_writes().pinned(client_key)):
+        for index in replicas.candidates():
+            session = replicas.sessionmakers[index]()
+            try:
+                # Checking out the connection doubles as the health check
+                await session.connection()
+            except (exc.DBAPIError, exc.TimeoutError, OSError):
+                await session.close()
+                replicas.mark_down(index)
+                continue
+            async with session:
+                yield session
+            return
+    async with AsyncSessionLocal() as session:
+        yield session
+
+async def get_read_db(request: Request):
+    async with read_session(client_key(request)) as session:
+        # For the response cache, which must not keep what a lagging replica
+        # returned right after a write (core/cache.py)
+        request.state.replica_read = session.bind is not engine
         yield session
@@ -0,0 +1,137 @@
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from urllib.parse import quote
+from fastapi import Request, Response
+from starlette.types import Receive, Scope, Send
+from app.core.config import settings
+from app.core.storage import StorageBackend, LocalStorage
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    # Returns (start, end) inclusive for a single "bytes=" range. None means
+    # serve the full body: no header, a malformed one (ignored per RFC 9110) or
+    # a multi-range request. Raises ValueError when it cannot be satisfied.
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[len("bytes="):].strip().partition("-")
+    if not sep or not (first.isdigit() or first == "") or not (last.isdigit() or last == ""):
+        return None
+    if first == "":
+        # Suffix range: the last N bytes
+        if last == "" or int(last) == 0:
+            raise ValueError("empty suffix range")
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison as required for If-None-Match
+    candidates = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            # Stored timestamps are naive UTC (datetime.utcnow)
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+class BlobResponse(Response):
+    # Streams [start, end] of a stored blob. For local blobs it hands the file
+    # descriptor to the server when it advertises the ASGI zero-copy send
+    # extension, so the bytes never pass through Python.
+    def __init__(self, storage: StorageBackend, key: str, start: int, end: int, status_code: int, headers: dict, media_type: str):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.storage = storage
+        self.key = key
+        self.start = start
+        self.end = end
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        path = self.storage.local_path(self.key)
+        extensions = scope.get("extensions") or {}
+        if settings.DOWNLOAD_ZERO_COPY and path is not None and "http.response.zerocopysend" in extensions:
+            with open(path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f,
+                    "offset": self.start,
+                    "count": self.end - self.start + 1,
+                })
+            return
+
+        async for chunk in self.storage.iter_bytes(self.key, self.start, self.end):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+async def blob_response(
+    request: Request,
+    storage: StorageBackend,
+    key: str,
+    filename: str,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    media_type: str = "application/zip",
+) -> Response:
+    headers = {
+        "etag": etag,
+        "accept-ranges": "bytes",
+        "content-disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+    }
+    if last_modified is not None:
+        headers["last-modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+    if not_modified(request, etag, last_modified):
+        headers.pop("content-disposition")
+        return Response(status_code=304, headers=headers)
+
+    path = storage.local_path(key)
+    if settings.DOWNLOAD_OFFLOAD != "none" and isinstance(storage, LocalStorage):
+        # The reverse proxy serves the bytes (and handles Range itself)
+        if settings.DOWNLOAD_OFFLOAD == "x-accel":
+            # DOWNLOAD_OFFLOAD_PREFIX is an internal location aliased to UPLOAD_DIR
+            rel = os.path.relpath(path, settings.UPLOAD_DIR)
+            headers["x-accel-redirect"] = f"{settings.DOWNLOAD_OFFLOAD_PREFIX.rstrip('/')}/{rel}"
+        else:
+            headers["x-sendfile"] = path
+        return Response(status_code=200, headers=headers, media_type=media_type)
+
+    size = await storage.size(key)
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={"content-range": f"bytes */{size}", "etag": etag})
+
+    if size == 0:
+        return Response(status_code=200, headers=headers, media_type=media_type)
+    if byte_range is None:
+        return BlobResponse(storage, key, 0, size - 1, 200, headers, media_type)
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    return BlobResponse(storage, key, start, end, 206, headers, media_type)
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+import orjson
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+# Server push of task lifecycle events (modules/events). Each event is
+# encoded once as an SSE frame and fanned out to the subscriptions of its
+# channels ("user:{id}") in this process. The broker carries frames between
+# processes: in-memory for a single worker, Redis pub/sub for several.
+# Delivery is best effort; clients refetch on connect and on "resync".
+
+logger = logging.getLogger(__name__)
+
+events_published = REGISTRY.counter("events_published_total", "Events published", ["type"])
+events_errors = REGISTRY.counter("events_errors_total", "Events that could not be published")
+events_resyncs = REGISTRY.counter(
+    "events_resyncs_total", "Slow or disconnected subscribers whose backlog was dropped for a resync"
+)
+
+# (type, channels, SSE frame), see task_event()
+Event = tuple[str, list[str], bytes]
+
+def sse_frame(event_type: str, data: dict) -> bytes:
+    return b"event: " + event_type.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+# Sent instead of events a subscriber missed: refetch the lists
+RESYNC = sse_frame("resync", {"type": "resync"})
+HEARTBEAT = b": heartbeat\n\n"
+
+class Subscription:
+    # One open stream. The queue is bounded: a consumer that falls
+    # EVENTS_QUEUE_SIZE frames behind loses its backlog and gets a single
+    # RESYNC, so a slow client never holds unbounded memory or slows others.
+    def __init__(self, hub: "_Hub", channels: list[str]):
+        self.hub = hub
+        self.channels = channels
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+
+    def deliver(self, frame: bytes):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.resync()
+
+    def resync(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESYNC)
+        events_resyncs.inc()
+
+    async def next(self, timeout: float) -> Optional[bytes]:
+        # None after `timeout` seconds without an event (time for a heartbeat)
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.hub.remove(self)
+
+class _Hub:
+    # Channel -> local subscriptions; only touched from the event loop thread
+    def __init__(self):
+        self._channels: dict[str, set[Subscription]] = {}
+
+    def add(self, channels: list[str]) -> Subscription:
+        subscription = Subscription(self, channels)
+        for channel in channels:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def remove(self, subscription: Subscription):
+        for channel in subscription.channels:
+            subscribers = self._channels.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[channel]
+
+    def dispatch(self, channel: str, frame: bytes):
+        for subscription in self._channels.get(channel, ()):
+            subscription.deliver(frame)
+
+    def resync_all(self):
+        for subscription in {s for subs in self._channels.values() for s in subs}:
+            subscription.resync()
+
+    def __len__(self) -> int:
+        return len({s for subs in self._channels.values() for s in subs})
+
+_hub = _Hub()
+REGISTRY.gauge("events_subscribers", "Open event streams in this process").set_function(lambda: len(_hub))
+
+class EventBroker(ABC):
+    @abstractmethod
+    async def publish(self, events: list[Event]) -> None: ...
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+class MemoryBroker(EventBroker):
+    # Single process: publishing is local dispatch
+    async def publish(self, events: list[Event]) -> None:
+        for _, channels, frame in events:
+            for channel in channels:
+                _hub.dispatch(channel, frame)
+
+class RedisBroker(EventBroker):
+    # Every process publishes to Redis and receives all events through one
+    # pattern subscription, dispatching those with local subscribers. redis
+    # is an optional dependency, only imported when this broker is selected.
+    def __init__(self, url: str, prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("EVENTS_BROKER=redis requires redis (pip install redis)") from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, events: list[Event]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for _, channels, frame in events:
+                for channel in channels:
+                    pipe.publish(self.prefix + channel, frame)
+            await pipe.execute()
+
+    async def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        connected_before = False
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.prefix + "*")
+                    if connected_before:
+                        # Events published while disconnected are lost
+                        _hub.resync_all()
+                    connected_before = True
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            channel = message["channel"].decode()[len(self.prefix):]
+                            _hub.dispatch(channel, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("event broker connection lost, reconnecting")
+                await asyncio.sleep(1)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        await self.client.aclose()
+
+@lru_cache
+def get_broker() -> EventBroker:
+    if settings.EVENTS_BROKER == "redis":
+        return RedisBroker(settings.EVENTS_REDIS_URL, settings.EVENTS_CHANNEL_PREFIX)
+    return MemoryBroker()
+
+async def subscribe(channels: list[str]) -> Subscription:
+    await get_broker().start()
+    return _hub.add(channels)
+
+def task_event(event_type: str, task_id: int, project_id: int, status, buyer_id: Optional[int], developer_id: Optional[int]) -> Event:
+    # For the project's buyer and the assignee
+    data = {
+        "type": event_type,
+        "task_id": task_id,
+        "project_id": project_id,
+        "status": getattr(status, "value", status),
+        "at": datetime.utcnow().isoformat(),
+    }
+    channels = [f"user:{uid}" for uid in dict.fromkeys((buyer_id, developer_id)) if uid is not None]
+    return event_type, channels, sse_frame(event_type, data)
+
+async def publish(*events: Event):
+    # Call after the change has committed; never fails the request
+    if not events:
+        return
+    try:
+        await get_broker().publish(list(events))
+        for event_type, _, _ in events:
+            events_published.inc(type=event_type)
+    except Exception:
+        events_errors.inc(len(events))
+        logger.exception("could not publish %d event(s)", len(events))
@@ -0,0 +1,59 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+
+class BodyTooLarge(Exception):
+    pass
+
+class BodySizeLimitMiddleware:
+    # Rejects oversized request bodies before they are parsed/spooled.
+    # Content-Length is checked up front; chunked bodies are counted as
+    # they arrive and cut off as soon as they cross the limit.
+    def __init__(self, app: ASGIApp, max_body_size: int | None = None):
+        self.app = app
+        # Multipart framing adds a little on top of the file itself
+        self.max_body_size = max_body_size or settings.MAX_UPLOAD_SIZE_BYTES + 64 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_size:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except BodyTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send: Send):
+        body = b'{"detail":"Request body too large"}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
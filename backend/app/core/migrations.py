@@ -0,0 +1,90 @@
+"""Minimal versioned schema migrations.
+
+Each module in app/migrations named vNNNN_<slug>.py exposes a synchronous
+``upgrade(conn)``. Applied versions are recorded in ``schema_migrations``.
+
+    python -m app.core.migrations           # apply pending migrations
+    python -m app.core.migrations status    # list applied / pending
+"""
+import asyncio
+import importlib
+import pkgutil
+import sys
+from datetime import datetime
+from sqlalchemy import Connection, MetaData, Table, Column, String, DateTime, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+import app.migrations
+
+# Arbitrary constant so concurrently booting workers serialize on PostgreSQL
+ADVISORY_LOCK_ID = 72_410_001
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+def versions() -> list[str]:
+    # Names only; a migration module is imported when it has to run
+    return sorted(
+        m.name for m in pkgutil.iter_modules(app.migrations.__path__)
+        if m.name.startswith("v")
+    )
+
+def applied_versions(conn: Connection) -> set[str]:
+    _meta.create_all(conn)
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+def pending(conn: Connection) -> list[str]:
+    # Read-only: without a schema_migrations table everything is pending
+    if not inspect(conn).has_table(schema_migrations.name):
+        return versions()
+    done = set(conn.execute(select(schema_migrations.c.version)).scalars())
+    return [name for name in versions() if name not in done]
+
+def upgrade(conn: Connection) -> list[str]:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+    done = applied_versions(conn)
+    ran = []
+    for name in versions():
+        if name in done:
+            continue
+        importlib.import_module(f"app.migrations.{name}").upgrade(conn)
+        conn.execute(schema_migrations.insert().values(version=name, applied_at=datetime.utcnow()))
+        ran.append(name)
+    return ran
+
+async def run_migrations(engine: AsyncEngine) -> list[str]:
+    # Single transaction: on PostgreSQL DDL is transactional, so a failing
+    # migration leaves the schema untouched.
+    async with engine.begin() as conn:
+        return await conn.run_sync(upgrade)
+
+async def check_migrations(engine: AsyncEngine) -> list[str]:
+    async with engine.connect() as conn:
+        return await conn.run_sync(pending)
+
+async def main(argv: list[str]) -> int:
+    from app.core.database import engine
+
+    if argv and argv[0] == "status":
+        todo = await check_migrations(engine)
+        for name in versions():
+            print(f"{'pending' if name in todo else 'applied'}  {name}")
+    else:
+        for name in await run_migrations(engine):
+            print(f"applied  {name}")
+        # Also what SCHEMA_MODE=migrate does at startup: seed the stats
+        # rollups of a database that predates them
+        from app.core.database import AsyncSessionLocal
+        from app.modules.stats.reconcile import ensure_initialized
+        async with AsyncSessionLocal() as db:
+            await ensure_initialized(db)
+    await engine.dispose()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
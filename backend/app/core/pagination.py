@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+from collections.abc import Mapping
+from typing import Optional
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+# Keyset pagination dependency. Bodies stay plain JSON arrays so existing
+# clients keep working; the cursor for the following page is returned in the
+# X-Next-Cursor and Link headers and is absent on the last page. Without
+# ?limit or ?cursor the full list is returned, since existing clients don't
+# follow the cursor.
+class PageParams:
+    paged_by_default = False
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+        limit: Optional[int] = Query(None, ge=1, description="Page size, capped at MAX_PAGE_SIZE"),
+    ):
+        self.request = request
+        self.response = response
+        self.after = decode_cursor(cursor) if cursor else None
+        if limit is None and (cursor or self.paged_by_default):
+            limit = settings.DEFAULT_PAGE_SIZE
+        self.limit = min(limit, settings.MAX_PAGE_SIZE) if limit is not None else None
+
+    def apply(self, stmt: Select, key) -> Select:
+        # WHERE key > :last ORDER BY key LIMIT n+1 -- the extra row tells us
+        # whether another page exists without a COUNT(*).
+        if self.after is not None:
+            last = self.after.get(key.key)
+            if not isinstance(last, int):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            stmt = stmt.where(key > last)
+        stmt = stmt.order_by(key)
+        return stmt if self.limit is None else stmt.limit(self.limit + 1)
+
+    def finish(self, rows: list, key) -> list:
+        if self.limit is not None and len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            value = last[key.key] if isinstance(last, Mapping) else getattr(last, key.key)
+            cursor = encode_cursor({key.key: value})
+            self.response.headers["X-Next-Cursor"] = cursor
+            next_url = self.request.url.include_query_params(cursor=cursor, limit=self.limit)
+            self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return rows
+
+    async def fetch(self, db: AsyncSession, stmt: Select, key) -> list:
+        result = await db.execute(self.apply(stmt, key))
+        return self.finish(list(result.scalars().all()), key)
+
+    async def fetch_rows(self, db: AsyncSession, stmt: Select, key) -> list:
+        # For column selects (see core/serialization.py): row mappings, no ORM objects
+        result = await db.execute(self.apply(stmt, key))
+        return self.finish(list(result.mappings().all()), key)
+
+# For endpoints added with pagination, which no client reads in full: pages
+# of DEFAULT_PAGE_SIZE unless ?limit says otherwise
+class PagedByDefault(PageParams):
+    paged_by_default = True
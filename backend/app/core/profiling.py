@@ -0,0 +1,202 @@
+import cProfile
+import itertools
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+# Opt-in request profiling (PROFILING_ENABLED): wall time, SQL statement
+# count/time from engine events, named phases (bcrypt, serialization,
+# storage), N+1 detection and sampled profiles of slow requests. Results go
+# to /metrics and a Server-Timing header on every response.
+
+logger = logging.getLogger(__name__)
+
+request_duration = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request wall time up to the end of the body", ["method", "route", "status"]
+)
+request_sql_queries = REGISTRY.histogram(
+    "http_request_sql_queries", "SQL statements executed per request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+request_sql_seconds = REGISTRY.histogram(
+    "http_request_sql_seconds", "Time spent executing SQL per request", ["route"]
+)
+request_phase_seconds = REGISTRY.histogram(
+    "http_request_phase_seconds", "Time per request in instrumented phases", ["route", "phase"]
+)
+n_plus_one_requests = REGISTRY.counter(
+    "http_n_plus_one_total", "Requests that ran one SQL statement PROFILE_N_PLUS_ONE_THRESHOLD+ times", ["route"]
+)
+slow_profiles = REGISTRY.counter(
+    "http_slow_request_profiles_total", "Profiles written for sampled slow requests", ["route"]
+)
+
+@dataclass
+class RequestProfile:
+    sql_count: int = 0
+    sql_time: float = 0.0
+    # SQL text -> executions; parameters are bound separately, so repeats of
+    # one statement shape collapse into one key
+    statements: Counter = field(default_factory=Counter)
+    phases: dict[str, float] = field(default_factory=dict)
+
+    def repeated_statement(self) -> Optional[tuple[str, int]]:
+        if not self.statements:
+            return None
+        statement, count = self.statements.most_common(1)[0]
+        return (statement, count) if count >= settings.PROFILE_N_PLUS_ONE_THRESHOLD else None
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"app;dur={total * 1000:.1f}", f'db;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries"']
+        parts += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()]
+        repeated = self.repeated_statement()
+        if repeated:
+            parts.append(f'n-plus-one;desc="statement repeated {repeated[1]}x"')
+        return ", ".join(parts)
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+@contextmanager
+def phase(name: str):
+    # Attributes the enclosed time to `name` in the current request's profile;
+    # a no-op when profiling is off or outside a request.
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.phases[name] = profile.phases.get(name, 0.0) + time.perf_counter() - start
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._profile_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    started = getattr(context, "_profile_started", None)
+    if profile is None or started is None:
+        return
+    profile.sql_count += 1
+    profile.sql_time += time.perf_counter() - started
+    profile.statements[statement] += 1
+
+def install_sql_hooks():
+    # On the Engine class, so the primary and every replica engine report.
+    # Engine events run in SQLAlchemy's greenlet, which shares the request's
+    # context, so _current resolves to the right request.
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+class _Sampler:
+    # Profiles a PROFILE_SAMPLE_RATE fraction of requests and keeps the
+    # output of those slower than PROFILE_SLOW_MS. Only one request is
+    # profiled at a time. cProfile sees everything on the event loop thread,
+    # other requests' coroutines included; pyinstrument (optional, set
+    # PROFILE_ENGINE=pyinstrument) attributes async time per task.
+    def __init__(self):
+        self.active = False
+        self._seq = itertools.count()
+
+    def start(self):
+        if self.active or settings.PROFILE_SAMPLE_RATE <= 0 or random.random() >= settings.PROFILE_SAMPLE_RATE:
+            return None
+        if settings.PROFILE_ENGINE == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError as e:
+                raise RuntimeError("PROFILE_ENGINE=pyinstrument requires pyinstrument (pip install pyinstrument)") from e
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        self.active = True
+        return profiler
+
+    def stop(self, profiler, duration: float, method: str, route: str):
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+        else:
+            profiler.stop()
+        self.active = False
+        if duration * 1000 < settings.PROFILE_SLOW_MS:
+            return
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        base = os.path.join(settings.PROFILE_DIR, f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.{next(self._seq)}-{int(duration * 1000)}ms-{method}-{slug}")
+        if isinstance(profiler, cProfile.Profile):
+            # Inspect with `python -m pstats <file>` or snakeviz
+            profiler.dump_stats(base + ".prof")
+        else:
+            with open(base + ".html", "w") as f:
+                f.write(profiler.output_html())
+        slow_profiles.inc(route=route)
+
+_sampler = _Sampler()
+
+def _route_template(scope: Scope) -> str:
+    # Path template rather than the raw path to keep label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        install_sql_hooks()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        start = time.perf_counter()
+        status = 500
+        profiler = _sampler.start()
+
+        async def timing_send(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("server-timing", profile.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            duration = time.perf_counter() - start
+            _current.reset(token)
+            route = _route_template(scope)
+            if profiler is not None:
+                _sampler.stop(profiler, duration, scope["method"], route)
+            request_duration.observe(duration, method=scope["method"], route=route, status=status)
+            request_sql_queries.observe(profile.sql_count, route=route)
+            request_sql_seconds.observe(profile.sql_time, route=route)
+            for name, seconds in profile.phases.items():
+                request_phase_seconds.observe(seconds, route=route, phase=name)
+            repeated = profile.repeated_statement()
+            if repeated:
+                n_plus_one_requests.inc(route=route)
+                logger.warning(
+                    "possible N+1 on %s %s: statement ran %dx: %s",
+                    scope["method"], route, repeated[1], " ".join(repeated[0].split())[:200],
+                )
@@ -1,10 +1,29 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Any, Union
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.profiling import phase
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min == max == default so any hash with another cost reports needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a small thread pool gives real parallelism
+# without the pickling overhead of a process pool.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_hash_inflight = 0
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,12 +31,41 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+async def _run_hashing(fn, *args):
+    # Backpressure: once every worker is busy and the queue is full, fail
+    # fast instead of letting logins pile up behind each other.
+    global _hash_inflight
+    if _hash_inflight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _hash_inflight += 1
+    try:
+        with phase("bcrypt"):
+            return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_inflight -= 1
+
+async def hash_password(password: str) -> str:
+    return await _run_hashing(pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    # Returns (valid, new_hash); new_hash is set when the stored hash uses an
+    # outdated scheme or cost and should be replaced.
+    return await _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
+
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[dict] = None,
+) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
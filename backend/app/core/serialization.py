@@ -0,0 +1,30 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from app.core.profiling import phase
+
+# Fast JSON path for list endpoints. Routes select exactly the columns of the
+# response schema (schema_columns) and fetch them as row mappings, which skips
+# ORM object construction and the identity map; such rows are already in
+# response shape and go straight to orjson. Anything else is validated and
+# dumped by a cached TypeAdapter (pydantic-core, no jsonable_encoder pass).
+# See benchmarks/serialization.py for the numbers.
+
+@lru_cache(maxsize=None)
+def adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+def schema_columns(model, schema: type[BaseModel]) -> list:
+    # Mapped attributes of `model` named like the fields of `schema`, in
+    # schema order; fields the model does not have are left to the caller.
+    return [getattr(model, name) for name in schema.model_fields if hasattr(model, name)]
+
+def dump_json(content: Any, response_type: Any) -> bytes:
+    with phase("serialize"):
+        if isinstance(content, list) and content and isinstance(content[0], Mapping):
+            # Rows/dicts built from schema_columns: trusted, no validation
+            return orjson.dumps([dict(row) for row in content])
+        ta = adapter(response_type)
+        return ta.dump_json(ta.validate_python(content, from_attributes=True))
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+# Startup sequence of the API process (app/main.py lifespan) and the state
+# behind /healthz and /readyz. Each phase is timed into startup_phase_seconds
+# so a slow cold start shows where the time went.
+
+logger = logging.getLogger(__name__)
+
+startup_phase_seconds = REGISTRY.gauge(
+    "startup_phase_seconds", "Duration of each startup phase of this process", ["phase"]
+)
+db_wait_attempts = REGISTRY.gauge(
+    "startup_db_attempts", "Connection attempts before the database answered at startup"
+)
+
+SCHEMA_MODES = ("migrate", "check", "skip")
+
+class Readiness:
+    # Ready between the end of startup and the start of shutdown, so load
+    # balancers only route to a process that has finished booting and stop
+    # before it drains
+    def __init__(self):
+        self.ready = False
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = seconds
+        startup_phase_seconds.set(seconds, phase=name)
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items())
+
+readiness = Readiness()
+
+def backoff_delay(attempt: int) -> float:
+    # Exponential backoff with full jitter, so pods restarted together by a
+    # database outage don't reconnect in lockstep
+    return random.uniform(0, min(settings.DB_RETRY_BASE_SECONDS * 2 ** attempt, settings.DB_RETRY_MAX_SECONDS))
+
+async def ping(engine: AsyncEngine, timeout: float):
+    async def select_one():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    await asyncio.wait_for(select_one(), timeout)
+
+async def wait_for_database(engine: AsyncEngine):
+    # Raises the last error once DB_STARTUP_TIMEOUT_SECONDS have passed
+    deadline = time.monotonic() + settings.DB_STARTUP_TIMEOUT_SECONDS
+    attempt = 0
+    while True:
+        try:
+            await ping(engine, settings.DB_PING_TIMEOUT_SECONDS)
+            db_wait_attempts.set(attempt + 1)
+            return
+        except Exception as e:
+            delay = backoff_delay(attempt)
+            attempt += 1
+            if time.monotonic() + delay > deadline:
+                raise
+            logger.warning("database unavailable (%s), retry %d in %.2fs", type(e).__name__, attempt, delay)
+            await asyncio.sleep(delay)
+
+async def prepare_schema(engine: AsyncEngine):
+    # SCHEMA_MODE, see config. The migration modules are only imported when
+    # the schema is actually touched.
+    if settings.SCHEMA_MODE not in SCHEMA_MODES:
+        raise RuntimeError(f"SCHEMA_MODE must be one of {', '.join(SCHEMA_MODES)}, not {settings.SCHEMA_MODE!r}")
+    if settings.SCHEMA_MODE == "skip":
+        return
+    from app.core.migrations import check_migrations, run_migrations
+
+    if settings.SCHEMA_MODE == "check":
+        todo = await check_migrations(engine)
+        if todo:
+            raise RuntimeError(
+                f"database schema is behind, pending migrations: {', '.join(todo)} "
+                "(run python -m app.core.migrations)"
+            )
+        return
+
+    from app.core.database import AsyncSessionLocal
+    from app.modules.stats.reconcile import ensure_initialized
+
+    await run_migrations(engine)
+    # Seed the stats rollup tables if this database predates them
+    async with AsyncSessionLocal() as db:
+        await ensure_initialized(db)
@@ -0,0 +1,220 @@
+import asyncio
+import os
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, BinaryIO, Optional
+import aiofiles
+from app.core.config import settings
+
+def blob_key(sha256: str) -> str:
+    # Two levels of 256-way sharding keep directories small on local disks
+    return f"sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+class StorageBackend(ABC):
+    # Content-addressed blob store. Keys come from blob_key(); a key's content
+    # never changes, so writers can skip a put when the key already exists.
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    async def put(self, key: str, source: BinaryIO) -> None:
+        # Copies `source` (a seekable file object positioned at 0) to `key`
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def touch(self, key: str) -> bool:
+        # Resets the blob's modification time (see entries()); False when
+        # there is no such blob
+        ...
+
+    @abstractmethod
+    async def modified(self, key: str) -> Optional[datetime]:
+        # Last write or touch (naive UTC), None when there is no such blob
+        ...
+
+    @abstractmethod
+    async def size(self, key: str) -> int: ...
+
+    @abstractmethod
+    def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        # Yields the bytes of [start, end] (inclusive), in chunks
+        ...
+
+    def local_path(self, key: str) -> Optional[str]:
+        # Filesystem path when the blob lives on local disk, else None
+        return None
+
+    async def entries(self) -> AsyncIterator[tuple[str, datetime]]:
+        # Every stored key and when it was last written or touched (naive
+        # UTC), for garbage collection
+        if False:
+            yield "", datetime.min
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: str):
+        self.root = root
+
+    def local_path(self, key: str) -> str:
+        # Absolute keys are pre-dedup solution paths ({UPLOAD_DIR}/{task}_{name})
+        if os.path.isabs(key):
+            return key
+        return os.path.join(self.root, key)
+
+    async def exists(self, key: str) -> bool:
+        return os.path.exists(self.local_path(key))
+
+    async def put(self, key: str, source: BinaryIO) -> None:
+        # Temp file in the target directory + rename, so readers never see a
+        # partially written blob.
+        path = self.local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            async with aiofiles.open(tmp_path, "wb") as out_file:
+                while chunk := await asyncio.to_thread(source.read, settings.UPLOAD_CHUNK_SIZE):
+                    await out_file.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    async def delete(self, key: str) -> None:
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    async def touch(self, key: str) -> bool:
+        try:
+            os.utime(self.local_path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def modified(self, key: str) -> Optional[datetime]:
+        try:
+            return datetime.utcfromtimestamp(os.stat(self.local_path(key)).st_mtime)
+        except FileNotFoundError:
+            return None
+
+    async def size(self, key: str) -> int:
+        return os.stat(self.local_path(key)).st_size
+
+    async def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        async with aiofiles.open(self.local_path(key), "rb") as f:
+            await f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = settings.UPLOAD_CHUNK_SIZE if remaining is None else min(settings.UPLOAD_CHUNK_SIZE, remaining)
+                chunk = await f.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    async def entries(self) -> AsyncIterator[tuple[str, datetime]]:
+        base = os.path.join(self.root, "sha256")
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                if name.endswith(".part"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    modified = datetime.utcfromtimestamp(os.stat(path).st_mtime)
+                except FileNotFoundError:
+                    continue
+                yield os.path.relpath(path, self.root), modified
+
+class S3Storage(StorageBackend):
+    # Any S3-compatible endpoint (MinIO, LocalStack, ...). boto3 is an
+    # optional dependency, only imported when this backend is selected.
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, **client_kwargs):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, **client_kwargs)
+        self._client_error = ClientError
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+            return True
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def put(self, key: str, source: BinaryIO) -> None:
+        # upload_fileobj streams multipart uploads straight from the spooled file
+        await asyncio.to_thread(self.client.upload_fileobj, source, self.bucket, key)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def touch(self, key: str) -> bool:
+        # S3 has no utime; an in-place copy rewrites LastModified
+        try:
+            await asyncio.to_thread(
+                self.client.copy_object,
+                Bucket=self.bucket, Key=key, CopySource={"Bucket": self.bucket, "Key": key}, MetadataDirective="REPLACE",
+            )
+            return True
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def modified(self, key: str) -> Optional[datetime]:
+        try:
+            head = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return head["LastModified"].replace(tzinfo=None)
+
+    async def size(self, key: str) -> int:
+        head = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+        return head["ContentLength"]
+
+    async def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        obj = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=key, Range=byte_range)
+        body = obj["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, settings.UPLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            body.close()
+
+    async def entries(self) -> AsyncIterator[tuple[str, datetime]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        pages = await asyncio.to_thread(lambda: list(paginator.paginate(Bucket=self.bucket, Prefix="sha256/")))
+        for page in pages:
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["LastModified"].replace(tzinfo=None)
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            region_name=settings.S3_REGION,
+        )
+    return LocalStorage(os.path.join(settings.UPLOAD_DIR, "blobs"))
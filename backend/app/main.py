@@ -1,8 +1,20 @@
-import asyncio
-from fastapi import FastAPI
+import logging
+import os
+import time
+
+# Measured from here, see startup_phase_seconds on /metrics
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-from app.core.database import engine, Base
+from app.core.database import engine, replicas, get_read_your_writes
 from app.core.config import settings
+from app.core.middleware import BodySizeLimitMiddleware
+from app.core.metrics import REGISTRY
+from app.core.events import get_broker
+from app.core.startup import readiness, ping, wait_for_database, prepare_schema
+from app.modules.auth.ratelimit import RateLimitMiddleware, get_store as get_ratelimit_store, submit_limit
 
 # Import routers
 from app.modules.auth import routes as auth_routes
@@ -11,47 +23,112 @@ from app.modules.projects import routes as project_routes
 from app.modules.tasks import routes as task_routes
 from app.modules.payments import routes as payment_routes
 from app.modules.stats import routes as stats_routes
+from app.modules.export import routes as export_routes
+from app.modules.jobs import routes as job_routes
+from app.modules.search import routes as search_routes
+from app.modules.events import routes as event_routes
+from app.modules.sync import routes as sync_routes
 
 # Import models for SQLAlchemy
 from app.modules.users import models as user_models
 from app.modules.projects import models as project_models
 from app.modules.payments import models as payment_models
+from app.modules.stats import models as stats_models
+from app.modules.jobs import models as job_models
+from app.modules.sync import models as sync_models
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables with consistency check
-    import os
-    if not os.path.exists(settings.UPLOAD_DIR):
-        os.makedirs(settings.UPLOAD_DIR)
-
-    retries = 5
-    while retries > 0:
-        try:
-            async with engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
-            break
-        except Exception as e:
-            retries -= 1
-            print(f"Database unavailable, retrying in 2s... ({retries} left)")
-            await asyncio.sleep(2)
-            if retries == 0:
-                raise e
+    # Startup. Only what this process needs is imported here: migrations for
+    # SCHEMA_MODE=migrate/check, the job handlers for an in-process worker.
+    started = time.perf_counter()
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+    with readiness.phase("database"):
+        await wait_for_database(engine)
+    with readiness.phase("schema"):
+        await prepare_schema(engine)
+
+    # Background jobs (modules/jobs), unless a separate worker process runs them
+    worker = None
+    if settings.JOB_WORKER_IN_PROCESS:
+        with readiness.phase("job_worker"):
+            from app.modules.jobs.queue import JobWorker
+            from app.modules.jobs import handlers as job_handlers  # noqa: F401  (registers the job kinds)
+            worker = JobWorker()
+            worker.start()
+
+    readiness.record("lifespan", time.perf_counter() - started)
+    logger.info("started: %s", readiness.summary())
+    readiness.ready = True
     yield
     # Shutdown
+    readiness.ready = False
+    if worker:
+        await worker.stop()
+    await get_broker().close()
+    await get_ratelimit_store().close()
+    await get_read_your_writes().close()
+    await replicas.dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # orjson instead of the stdlib encoder for every JSON response
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+app.add_middleware(BodySizeLimitMiddleware)
+# Solution uploads are throttled per user before the body is read
+app.add_middleware(
+    RateLimitMiddleware, limit=submit_limit, method="POST", path=rf"{settings.API_V1_STR}/tasks/\d+/submit"
+)
+if settings.PROFILING_ENABLED:
+    from app.core.profiling import ProfilingMiddleware
+    # Outermost, so its timings cover the other middleware too
+    app.add_middleware(ProfilingMiddleware)
+
 app.include_router(auth_routes.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(user_routes.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
 app.include_router(project_routes.router, prefix=f"{settings.API_V1_STR}/projects", tags=["projects"])
 app.include_router(task_routes.router, prefix=f"{settings.API_V1_STR}/tasks", tags=["tasks"])
 app.include_router(payment_routes.router, prefix=f"{settings.API_V1_STR}/payments", tags=["payments"])
 app.include_router(stats_routes.router, prefix=f"{settings.API_V1_STR}/stats", tags=["stats"])
+app.include_router(export_routes.router, prefix=f"{settings.API_V1_STR}/export", tags=["export"])
+app.include_router(job_routes.router, prefix=f"{settings.API_V1_STR}/jobs", tags=["jobs"])
+app.include_router(search_routes.router, prefix=f"{settings.API_V1_STR}/search", tags=["search"])
+app.include_router(event_routes.router, prefix=f"{settings.API_V1_STR}/events", tags=["events"])
+app.include_router(sync_routes.router, prefix=f"{settings.API_V1_STR}/sync", tags=["sync"])
 
 @app.get("/")
 def root():
     return {"message": "Welcome to Project Management API"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Prometheus text exposition format
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    # Liveness: the process is up and serving; no dependencies checked, so
+    # a database outage never gets healthy pods restarted
+    return {"status": "ok"}
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz(response: Response):
+    # Readiness: startup finished, not shutting down and the database answers
+    if not readiness.ready:
+        response.status_code = 503
+        return {"status": "not ready"}
+    try:
+        await ping(engine, settings.DB_PING_TIMEOUT_SECONDS)
+    except Exception as e:
+        response.status_code = 503
+        return {"status": "database unavailable", "error": type(e).__name__}
+    return {"status": "ok"}
+
+readiness.record("import", time.perf_counter() - _import_started)
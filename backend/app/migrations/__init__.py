@@ -0,0 +1,8 @@
+# Register every model on Base.metadata before any migration runs, so the
+# migrations work the same from the CLI as from the app lifespan.
+from app.modules.users import models as user_models  # noqa: F401
+from app.modules.projects import models as project_models  # noqa: F401
+from app.modules.payments import models as payment_models  # noqa: F401
+from app.modules.stats import models as stats_models  # noqa: F401
+from app.modules.jobs import models as job_models  # noqa: F401
+from app.modules.sync import models as sync_models  # noqa: F401
@@ -0,0 +1,8 @@
+from sqlalchemy import Connection
+from app.core.database import Base
+
+# Creates whatever tables/indexes are missing. On a fresh database this yields
+# the full current schema, so later migrations must be idempotent (guard with
+# checkfirst / IF EXISTS) as they only do real work on older databases.
+def upgrade(conn: Connection):
+    Base.metadata.create_all(conn)
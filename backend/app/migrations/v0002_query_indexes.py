@@ -0,0 +1,36 @@
+from sqlalchemy import Connection, text
+from app.core.database import Base
+
+# Indexes matching the listing / payment-queue queries (see __table_args__ in
+# the models) for databases created before they were declared.
+NEW_INDEXES = {
+    "projects": ["ix_projects_owner_id_id"],
+    "tasks": [
+        "ix_tasks_project_id_id",
+        "ix_tasks_assignee_id_id",
+        "ix_tasks_status_id",
+        "ix_tasks_assignee_id_status_id",
+        "ix_tasks_submitted_project_id",
+    ],
+    "users": ["ix_users_role_id"],
+}
+
+# Secondary indexes duplicating the primary keys, plus title indexes no query
+# filters on. They only cost write amplification.
+DROPPED_INDEXES = [
+    "ix_users_id",
+    "ix_projects_id",
+    "ix_tasks_id",
+    "ix_payments_id",
+    "ix_projects_title",
+    "ix_tasks_title",
+]
+
+def upgrade(conn: Connection):
+    for table_name, names in NEW_INDEXES.items():
+        table = Base.metadata.tables[table_name]
+        for index in table.indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+    for name in DROPPED_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
@@ -0,0 +1,10 @@
+from sqlalchemy import Connection, inspect, text
+from app.core.database import Base
+
+def upgrade(conn: Connection):
+    columns = {c["name"] for c in inspect(conn).get_columns("tasks")}
+    if "solution_sha256" not in columns:
+        conn.execute(text("ALTER TABLE tasks ADD COLUMN solution_sha256 VARCHAR(64)"))
+    for index in Base.metadata.tables["tasks"].indexes:
+        if index.name == "ix_tasks_solution_sha256":
+            index.create(conn, checkfirst=True)
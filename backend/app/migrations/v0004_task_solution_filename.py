@@ -0,0 +1,6 @@
+from sqlalchemy import Connection, inspect, text
+
+def upgrade(conn: Connection):
+    columns = {c["name"] for c in inspect(conn).get_columns("tasks")}
+    if "solution_filename" not in columns:
+        conn.execute(text("ALTER TABLE tasks ADD COLUMN solution_filename VARCHAR"))
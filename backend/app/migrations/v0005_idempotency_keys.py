@@ -0,0 +1,5 @@
+from sqlalchemy import Connection
+from app.core.database import Base
+
+def upgrade(conn: Connection):
+    Base.metadata.tables["idempotency_keys"].create(conn, checkfirst=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import Connection, DateTime, inspect, text
+
+def upgrade(conn: Connection):
+    columns = {c["name"] for c in inspect(conn).get_columns("tasks")}
+    if "created_at" not in columns:
+        column_type = DateTime().compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE tasks ADD COLUMN created_at {column_type}"))
+        # Best available estimate for existing tasks: their project's creation
+        conn.execute(text(
+            "UPDATE tasks SET created_at = "
+            "(SELECT projects.created_at FROM projects WHERE projects.id = tasks.project_id) "
+            "WHERE created_at IS NULL"
+        ))
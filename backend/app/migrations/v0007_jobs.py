@@ -0,0 +1,5 @@
+from sqlalchemy import Connection
+from app.core.database import Base
+
+def upgrade(conn: Connection):
+    Base.metadata.tables["jobs"].create(conn, checkfirst=True)
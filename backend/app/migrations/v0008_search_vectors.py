@@ -0,0 +1,23 @@
+from sqlalchemy import Connection, text
+from app.modules.search.index import TS_CONFIG
+
+# Full-text search (modules/search) on PostgreSQL: a stored generated tsvector
+# per searchable table, title weighted above description, with a GIN index.
+# Generated columns keep themselves current on every INSERT/UPDATE, bulk Core
+# statements included. Not mapped on the models; other databases use the
+# in-process index instead, so this is a no-op there.
+# Adding a stored column rewrites the table; on a large database run this
+# migration in a maintenance window.
+SEARCH_COLUMNS = {"projects": ("title", "description"), "tasks": ("title", "description")}
+
+def upgrade(conn: Connection):
+    if conn.dialect.name != "postgresql":
+        return
+    for table, (title, body) in SEARCH_COLUMNS.items():
+        conn.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{TS_CONFIG}', coalesce({title}, '')), 'A') || "
+            f"setweight(to_tsvector('{TS_CONFIG}', coalesce({body}, '')), 'B')"
+            ") STORED"
+        ))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)"))
@@ -0,0 +1,23 @@
+from sqlalchemy import Connection, DateTime, inspect, text
+from app.core.database import Base
+
+# updated_at on tasks and projects, the delta sync indexes over it, and the
+# tombstones table (modules/sync)
+NEW_INDEXES = {
+    "projects": ["ix_projects_owner_id_updated_at_id"],
+    "tasks": ["ix_tasks_updated_at_id", "ix_tasks_assignee_id_updated_at_id", "ix_tasks_project_id_updated_at_id"],
+}
+
+def upgrade(conn: Connection):
+    column_type = DateTime().compile(dialect=conn.dialect)
+    for table_name in ("projects", "tasks"):
+        columns = {c["name"] for c in inspect(conn).get_columns(table_name)}
+        if "updated_at" not in columns:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN updated_at {column_type}"))
+            # Unknown for existing rows; their creation time is the best bound
+            conn.execute(text(f"UPDATE {table_name} SET updated_at = created_at WHERE updated_at IS NULL"))
+    for table_name, names in NEW_INDEXES.items():
+        for index in Base.metadata.tables[table_name].indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+    Base.metadata.tables["tombstones"].create(conn, checkfirst=True)
@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event, inspect
+from app.core.config import settings
+from app.modules.users.models import User, UserRole
+
+@dataclass(frozen=True)
+class Principal:
+    # What the auth dependencies hand to routes instead of the ORM User.
+    # Routes only need these attributes, and it is safe to share across sessions.
+    id: int
+    email: str
+    role: UserRole
+    full_name: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, role=user.role, full_name=user.full_name)
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        try:
+            return cls(
+                id=int(payload["uid"]),
+                email=payload["sub"],
+                role=UserRole(payload["role"]),
+                full_name=payload.get("name"),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def claims(self) -> dict:
+        return {"uid": self.id, "role": self.role.value, "name": self.full_name}
+
+class PrincipalCache:
+    # LRU bounded by max_size, entries expire ttl seconds after insertion.
+    # Only touched from the event loop thread, so no locking.
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Principal]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return principal
+
+    def set(self, key: str, principal: Principal):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+def invalidate_user(email: str):
+    principal_cache.invalidate(email)
+
+# Any ORM write to a user drops its cached principal on this worker.
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User):
+    invalidate_user(target.email)
+    # The old address is still the cache key if the email itself changed
+    for old in inspect(target).attrs.email.history.deleted or ():
+        invalidate_user(old)
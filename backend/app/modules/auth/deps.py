@@ -6,15 +6,15 @@ from jose import JWTError, jwt
 from app.core.config import settings
 from app.core.database import get_db
 from app.modules.users.crud import get_user_by_email
-from app.modules.users.models import User
 from app.modules.auth.schemas import TokenData
+from app.modules.auth.cache import Principal, principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> User:
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -28,13 +28,28 @@ async def get_current_user(
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    
-    user = await get_user_by_email(db, email=token_data.email)
-    if user is None:
-        raise credentials_exception
-    return user
+
+    # 1. Signed claims, no lookup at all (opt-in, see JWT_EMBED_CLAIMS)
+    if settings.JWT_EMBED_CLAIMS:
+        principal = Principal.from_claims(payload)
+        if principal is not None:
+            return principal
+
+    # 2. Per-worker TTL/LRU cache, 3. database
+    principal = principal_cache.get(token_data.email)
+    if principal is None:
+        user = await get_user_by_email(db, email=token_data.email)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(token_data.email, principal)
+    return principal
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)]
+) -> Principal:
     return current_user
+
+def token_claims(principal: Principal) -> dict | None:
+    # Extra claims for create_access_token when JWT_EMBED_CLAIMS is on
+    return principal.claims() if settings.JWT_EMBED_CLAIMS else None
@@ -0,0 +1,264 @@
+import logging
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import NamedTuple
+from fastapi import HTTPException, Request, Response
+from jose import JWTError, jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+# Token-bucket rate limiting, declared per route as a dependency:
+#
+#     @router.post("/login", dependencies=[Depends(login_limit)])
+#
+# or, for upload routes, as a middleware (RateLimitMiddleware) that runs
+# before the body is read. A bucket holds up to `limit` tokens and refills
+# at limit/period per second; each request takes one. Buckets are keyed by
+# limit name plus client IP (RateLimit) or token subject (the middleware).
+# Every response of a limited route carries RateLimit-* headers; an empty
+# bucket is a 429 with Retry-After.
+
+logger = logging.getLogger(__name__)
+
+ratelimit_rejected = REGISTRY.counter("ratelimit_rejected_total", "Requests rejected by a rate limit", ["limit"])
+ratelimit_errors = REGISTRY.counter(
+    "ratelimit_errors_total", "Rate limit store failures (request let through)"
+)
+
+_REJECTED = "Too many requests, try again later"
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    # "10/minute", "100/hour", "5/30seconds" -> (limit, period in seconds)
+    match = _RATE.match(rate)
+    if match is None or int(match[1]) < 1:
+        raise ValueError(f"invalid rate {rate!r}, expected e.g. '10/minute'")
+    return int(match[1]), float(int(match[2] or 1) * _PERIODS[match[3]])
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: int
+    # Seconds until the bucket is full again, and until the next token
+    reset: float
+    retry_after: float
+
+def _decision(allowed: bool, tokens: float, limit: int, rate: float) -> Decision:
+    # `tokens`: what is left in the bucket after this request
+    return Decision(allowed, int(tokens), (limit - tokens) / rate, 0.0 if allowed else (1 - tokens) / rate)
+
+class RateLimitStore(ABC):
+    @abstractmethod
+    async def hit(self, key: str, limit: int, period: float) -> Decision: ...
+
+    async def close(self) -> None:
+        pass
+
+class MemoryStore(RateLimitStore):
+    # Per worker, only touched from the event loop thread. Buckets are spread
+    # over shards so eviction can sweep one shard at a time: every
+    # EVICT_INTERVAL seconds a hit drops the buckets of the next shard that
+    # have refilled completely (those are indistinguishable from no bucket),
+    # keeping memory proportional to recently active clients without ever
+    # pausing on the whole table.
+    EVICT_INTERVAL = 1.0
+
+    def __init__(self, shards: int = 64):
+        # key -> (tokens, monotonic time of last update, time it is full)
+        self._shards: list[dict[str, tuple[float, float, float]]] = [{} for _ in range(shards)]
+        self._next_evict = time.monotonic() + self.EVICT_INTERVAL
+        self._evict_shard = 0
+
+    async def hit(self, key: str, limit: int, period: float) -> Decision:
+        now = time.monotonic()
+        if now >= self._next_evict:
+            self._evict(now)
+        shard = self._shards[hash(key) % len(self._shards)]
+        rate = limit / period
+        bucket = shard.get(key)
+        if bucket is None:
+            tokens = float(limit)
+        else:
+            tokens = min(limit, bucket[0] + (now - bucket[1]) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        decision = _decision(allowed, tokens, limit, rate)
+        shard[key] = (tokens, now, now + decision.reset)
+        return decision
+
+    def _evict(self, now: float):
+        shard = self._shards[self._evict_shard]
+        for key in [k for k, (_, _, full_at) in shard.items() if full_at <= now]:
+            del shard[key]
+        self._evict_shard = (self._evict_shard + 1) % len(self._shards)
+        self._next_evict = now + self.EVICT_INTERVAL
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+# Refill and take in one round trip, atomically. The bucket hash expires
+# once it would be full again, so idle clients cost nothing. Time comes from
+# the caller (wall clock) so one script serves every Redis version.
+_TAKE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = limit
+if bucket[1] then
+    tokens = math.min(limit, tonumber(bucket[1]) + math.max(0, now - tonumber(bucket[2])) * rate)
+end
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((limit - tokens) / rate * 1000) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+class RedisStore(RateLimitStore):
+    # Shared across workers. redis is an optional dependency, only imported
+    # when this store is selected; any server speaking the Redis protocol
+    # with Lua scripting works.
+    def __init__(self, url: str, prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires redis (pip install redis)") from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(_TAKE_SCRIPT)
+
+    async def hit(self, key: str, limit: int, period: float) -> Decision:
+        rate = limit / period
+        allowed, tokens = await self._take(keys=[self.prefix + key], args=[limit, rate, time.time()])
+        return _decision(bool(allowed), float(tokens), limit, rate)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+@lru_cache
+def get_store() -> RateLimitStore:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisStore(settings.RATE_LIMIT_REDIS_URL, settings.RATE_LIMIT_KEY_PREFIX)
+    return MemoryStore()
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy run uvicorn with --proxy-headers/--forwarded-allow-ips
+    # so this is the real client rather than the proxy
+    return request.client.host if request.client else "unknown"
+
+class RateLimit:
+    # Keyed by client IP, for routes called before anyone is authenticated
+    def __init__(self, name: str, rate: str):
+        self.name = name
+        self.limit, self.period = parse_rate(rate)
+        self._static_headers = [
+            (b"ratelimit-limit", str(self.limit).encode()),
+            (b"ratelimit-policy", f"{self.limit};w={int(self.period)}".encode()),
+        ]
+
+    async def hit(self, identity: str) -> tuple[Decision, list[tuple[bytes, bytes]]] | None:
+        # None when limiting is off or the store failed
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        try:
+            decision = await get_store().hit(f"{self.name}:{identity}", self.limit, self.period)
+        except Exception:
+            # A store outage must not take the endpoints down with it
+            ratelimit_errors.inc()
+            logger.exception("rate limit store failed, letting request through")
+            return None
+        # Raw header pairs, appended as is: MutableHeaders.update costs more
+        # than the bucket update itself
+        headers = self._static_headers + [
+            (b"ratelimit-remaining", str(decision.remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(decision.reset)).encode()),
+        ]
+        if not decision.allowed:
+            ratelimit_rejected.inc(limit=self.name)
+            headers.append((b"retry-after", str(math.ceil(decision.retry_after)).encode()))
+        return decision, headers
+
+    async def check(self, identity: str, response: Response):
+        result = await self.hit(identity)
+        if result is None:
+            return
+        decision, headers = result
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=_REJECTED,
+                headers={name.decode(): value.decode() for name, value in headers},
+            )
+        response.raw_headers.extend(headers)
+
+    async def __call__(self, request: Request, response: Response):
+        await self.check(client_ip(request), response)
+
+def token_subject(scope: Scope) -> str | None:
+    # Subject of a valid bearer token; anything else is left to the route's
+    # own authentication
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            try:
+                return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+            except JWTError:
+                return None
+    return None
+
+class RateLimitMiddleware:
+    # Per-user limit for upload routes. FastAPI reads and spools a multipart
+    # body before it resolves the route's dependencies, so a dependency would
+    # only turn a throttled upload away once it is on disk; this answers
+    # before the body is read.
+    def __init__(self, app: ASGIApp, limit: RateLimit, method: str, path: str):
+        self.app = app
+        self.limit = limit
+        self.method = method
+        self.path = re.compile(path)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != self.method or not self.path.fullmatch(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        subject = token_subject(scope)
+        result = await self.limit.hit(subject) if subject else None
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+        decision, headers = result
+        if not decision.allowed:
+            body = b'{"detail":"' + _REJECTED.encode() + b'"}'
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+# /auth/token and /auth/login share one bucket so neither can be used to
+# get around the other
+login_limit = RateLimit("login", settings.RATE_LIMIT_LOGIN)
+register_limit = RateLimit("register", settings.RATE_LIMIT_REGISTER)
+# Applied in main.py through RateLimitMiddleware, keyed by token subject
+submit_limit = RateLimit("submit", settings.RATE_LIMIT_SUBMIT)
@@ -3,46 +3,49 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token
-from app.modules.users.crud import get_user_by_email, create_user
+from app.core.security import create_access_token
+from app.modules.users.crud import get_user_by_email, create_user, authenticate_user
 from app.modules.users.schemas import UserCreate
 from app.modules.auth import schemas
 from app.modules.auth.schemas import Token, UserLogin
+from app.modules.auth.cache import Principal
+from app.modules.auth.deps import token_claims
+from app.modules.auth.ratelimit import login_limit, register_limit
 
 router = APIRouter()
 
-@router.post("/token", response_model=Token)
+@router.post("/token", response_model=Token, dependencies=[Depends(login_limit)])
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
-    user = await get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await authenticate_user(db, form_data.username, form_data.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(subject=user.email)
+    access_token = create_access_token(subject=user.email, claims=token_claims(Principal.from_user(user)))
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(login_limit)])
 async def login_json(
     login_data: schemas.UserLogin,
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
-    user = await get_user_by_email(db, login_data.email)
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    user = await authenticate_user(db, login_data.email, login_data.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(subject=user.email)
+    access_token = create_access_token(subject=user.email, claims=token_claims(Principal.from_user(user)))
     # Line 41 duplicate removed
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.post("/register", response_model=Token)
+@router.post("/register", response_model=Token, dependencies=[Depends(register_limit)])
 async def register(
     user_data: UserCreate,
     db: Annotated[AsyncSession, Depends(get_db)]
@@ -59,5 +62,5 @@ async def register(
     user = await create_user(db, user_data)
     
     # Login immediately (return token)
-    access_token = create_access_token(subject=user.email)
+    access_token = create_access_token(subject=user.email, claims=token_claims(Principal.from_user(user)))
     return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.events import HEARTBEAT, sse_frame, subscribe
+from app.modules.auth.deps import get_current_user
+from app.modules.auth.cache import Principal
+
+router = APIRouter()
+
+async def _frames(user_id: int):
+    # Subscribes on the first iteration so a response that never starts
+    # cannot leak a subscription; Starlette cancels the generator when the
+    # client disconnects, which runs the finally.
+    subscription = await subscribe([f"user:{user_id}"])
+    try:
+        # Reconnect delay for EventSource clients, then a marker after which
+        # the client should refetch what it shows
+        yield b"retry: 3000\n\n" + sse_frame("ready", {"type": "ready"})
+        while True:
+            frame = await subscription.next(settings.EVENTS_HEARTBEAT_SECONDS)
+            yield frame if frame is not None else HEARTBEAT
+    finally:
+        subscription.close()
+
+@router.get("/stream")
+async def stream_events(current_user: Principal = Depends(get_current_user)):
+    # Task lifecycle events (task.created, task.updated, task.submitted,
+    # task.paid) for the caller's projects or assignments, as SSE
+    return StreamingResponse(
+        _frames(current_user.id),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"},
+    )
@@ -0,0 +1,129 @@
+import csv
+import enum
+import io
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+import orjson
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from app.core.config import settings
+from app.core.database import read_session, client_key
+from app.modules.auth.roles import allow_admin
+from app.modules.users.models import User
+from app.modules.projects.models import Project, Task, TaskStatus
+from app.modules.payments.models import Payment
+
+router = APIRouter()
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+_MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv; charset=utf-8"}
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps are stored as naive UTC (datetime.utcnow)
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _between(stmt: Select, column, since: Optional[datetime], until: Optional[datetime]) -> Select:
+    if since is not None:
+        stmt = stmt.where(column >= _naive_utc(since))
+    if until is not None:
+        stmt = stmt.where(column < _naive_utc(until))
+    return stmt
+
+def _csv_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+async def _stream_rows(stmt: Select, fmt: ExportFormat, key: Optional[str]) -> AsyncIterator[bytes]:
+    # Runs while the response is being sent, after the request's own
+    # dependencies (and their sessions) are closed, so it opens its own.
+    # stream() uses a server-side cursor; yield_per bounds what is buffered.
+    columns = [c.key for c in stmt.selected_columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == ExportFormat.CSV:
+        writer.writerow(columns)
+        # Header goes out before the query runs
+        yield buffer.getvalue().encode()
+    async with read_session(key) as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            if fmt == ExportFormat.NDJSON:
+                yield b"".join(orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE) for row in batch)
+            else:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_csv_value(v) for v in row] for row in batch)
+                yield buffer.getvalue().encode()
+
+def _export(request: Request, stmt: Select, fmt: ExportFormat, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{fmt.value}"
+    return StreamingResponse(
+        _stream_rows(stmt, fmt, client_key(request)),
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"content-disposition": f'attachment; filename="{filename}"', "cache-control": "no-store"},
+    )
+
+@router.get("/tasks")
+async def export_tasks(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    status: Optional[TaskStatus] = Query(None),
+    since: Optional[datetime] = Query(None, description="created_at >= since"),
+    until: Optional[datetime] = Query(None, description="created_at < until"),
+    current_user: User = Depends(allow_admin)
+):
+    stmt = (
+        select(
+            Task.id, Task.project_id, Task.assignee_id, Task.title, Task.description,
+            Task.status, Task.hourly_rate, Task.time_spent, Task.created_at,
+            Payment.payment_date.label("paid_at"),
+        )
+        .outerjoin(Payment, Payment.task_id == Task.id)
+        .order_by(Task.id)
+    )
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    return _export(request, _between(stmt, Task.created_at, since, until), format, "tasks")
+
+@router.get("/payments")
+async def export_payments(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    since: Optional[datetime] = Query(None, description="payment_date >= since"),
+    until: Optional[datetime] = Query(None, description="payment_date < until"),
+    current_user: User = Depends(allow_admin)
+):
+    stmt = (
+        select(
+            Payment.id, Payment.task_id, Task.project_id,
+            Project.owner_id.label("buyer_id"), Task.assignee_id.label("developer_id"),
+            Payment.amount, Payment.payment_date,
+        )
+        .join(Task, Payment.task_id == Task.id)
+        .join(Project, Task.project_id == Project.id)
+        .order_by(Payment.id)
+    )
+    return _export(request, _between(stmt, Payment.payment_date, since, until), format, "payments")
+
+@router.get("/projects")
+async def export_projects(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    since: Optional[datetime] = Query(None, description="created_at >= since"),
+    until: Optional[datetime] = Query(None, description="created_at < until"),
+    current_user: User = Depends(allow_admin)
+):
+    stmt = select(
+        Project.id, Project.title, Project.description, Project.owner_id,
+        Project.created_at, Project.task_count,
+    ).order_by(Project.id)
+    return _export(request, _between(stmt, Project.created_at, since, until), format, "projects")
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+import shlex
+import tempfile
+import urllib.request
+import zipfile
+from contextlib import asynccontextmanager
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.storage import get_storage
+from app.core.events import publish, sse_frame
+from app.modules.jobs.queue import PermanentJobError, enqueue, handler, wake
+from app.modules.projects.models import Project, Task
+from app.modules.users.models import User
+
+# Post-submission processing, queued by submit_task (tasks/routes.py).
+# Each handler takes the job payload and returns a JSON-able result that is
+# stored on the job row.
+
+logger = logging.getLogger(__name__)
+
+# Entries listed in the stored manifest
+_MANIFEST_LIMIT = 200
+# Uncompressed/compressed size beyond which an archive is treated as a
+# decompression bomb and not test-extracted
+_MAX_COMPRESSION_RATIO = 100
+
+@asynccontextmanager
+async def _local_copy(key: str):
+    # A filesystem path for the blob, downloading it first for remote stores
+    storage = get_storage()
+    path = storage.local_path(key)
+    if path is not None:
+        yield path
+        return
+    with tempfile.NamedTemporaryFile(suffix=".zip") as tmp:
+        async for chunk in storage.iter_bytes(key):
+            await asyncio.to_thread(tmp.write, chunk)
+        tmp.flush()
+        yield tmp.name
+
+def _inspect_zip(path: str) -> dict:
+    try:
+        with zipfile.ZipFile(path) as zf:
+            infos = zf.infolist()
+            uncompressed = sum(i.file_size for i in infos)
+            compressed = sum(i.compress_size for i in infos)
+            report = {
+                "entries": len(infos),
+                "uncompressed_bytes": uncompressed,
+                "compressed_bytes": compressed,
+                "manifest": [{"name": i.filename, "size": i.file_size} for i in infos[:_MANIFEST_LIMIT]],
+            }
+            if compressed and uncompressed / compressed > _MAX_COMPRESSION_RATIO:
+                return {**report, "valid": False, "error": "compression ratio too high"}
+            # Decompresses every entry and checks its CRC
+            bad = zf.testzip()
+            if bad is not None:
+                return {**report, "valid": False, "error": f"corrupt entry {bad}"}
+            return {**report, "valid": True, "error": None}
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError, EOFError) as e:
+        return {"valid": False, "error": str(e) or type(e).__name__}
+
+async def _scan(path: str) -> dict:
+    # JOB_VIRUS_SCAN_COMMAND follows the clamscan exit codes
+    if not settings.JOB_VIRUS_SCAN_COMMAND:
+        return {"skipped": True}
+    proc = await asyncio.create_subprocess_exec(
+        *shlex.split(settings.JOB_VIRUS_SCAN_COMMAND), path,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+    )
+    output, _ = await proc.communicate()
+    output = output.decode(errors="replace")[-1000:]
+    if proc.returncode == 0:
+        return {"clean": True}
+    if proc.returncode == 1:
+        return {"clean": False, "output": output}
+    # Scanner error (database missing, daemon down): retry later
+    raise RuntimeError(f"virus scanner exited with {proc.returncode}: {output}")
+
+@handler("solution.inspect")
+async def inspect_solution(payload: dict) -> dict:
+    task_id, key = payload["task_id"], payload["key"]
+    async with AsyncSessionLocal() as db:
+        current = await db.scalar(select(Task.solution_file_path).where(Task.id == task_id))
+    if current != key:
+        # Resubmitted (or deleted) since; the newer submission has its own job
+        return {"skipped": "superseded"}
+    if not await get_storage().exists(key):
+        # Blobs are written before the row referencing them commits and only
+        # `blobs gc` deletes them, so a missing one won't come back
+        raise PermanentJobError(f"blob {key} missing")
+
+    async with _local_copy(key) as path:
+        report = await asyncio.to_thread(_inspect_zip, path)
+        report["scan"] = await _scan(path) if report["valid"] else {"skipped": True}
+
+    problem = report["error"] if not report["valid"] else None
+    if report["scan"].get("clean") is False:
+        problem = "virus scan failed"
+    if problem:
+        logger.warning("submission of task %s rejected by inspection: %s", task_id, problem)
+        async with AsyncSessionLocal() as db:
+            enqueue(db, "notify.fanout", {"event": "solution.rejected", "task_id": task_id, "detail": problem})
+            await db.commit()
+        wake()
+    return report
+
+# Who hears about what, relative to the task
+_RECIPIENTS = {
+    "task.submitted": ["owner"],
+    "solution.rejected": ["assignee"],
+}
+
+@handler("notify.fanout")
+async def fan_out(payload: dict) -> dict:
+    # One notify.deliver job per recipient, so a failing endpoint only
+    # retries its own delivery
+    event, task_id = payload["event"], payload["task_id"]
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(
+            select(Task.title, Task.project_id, Task.assignee_id, Project.owner_id)
+            .join(Project, Task.project_id == Project.id)
+            .where(Task.id == task_id)
+        )).first()
+        if row is None:
+            return {"recipients": 0}
+        user_ids = [row.owner_id if who == "owner" else row.assignee_id for who in _RECIPIENTS.get(event, [])]
+        users = (await db.execute(select(User.id, User.email).where(User.id.in_(user_ids)))).all()
+        for user in users:
+            enqueue(db, "notify.deliver", {
+                **payload,
+                "user_id": user.id,
+                "email": user.email,
+                "project_id": row.project_id,
+                "task_title": row.title,
+            })
+        await db.commit()
+    wake()
+    return {"recipients": len(users)}
+
+def _post_json(url: str, body: dict):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}, method="POST"
+    )
+    # Non-2xx raises HTTPError, so the job is retried
+    with urllib.request.urlopen(request, timeout=10) as response:
+        response.read()
+
+@handler("notify.deliver")
+async def deliver(payload: dict) -> None:
+    # Open event streams of the recipient get it too (best effort)
+    await publish(("notification", [f"user:{payload['user_id']}"], sse_frame("notification", payload)))
+    if settings.NOTIFY_WEBHOOK_URL:
+        await asyncio.to_thread(_post_json, settings.NOTIFY_WEBHOOK_URL, payload)
+    else:
+        logger.info("notification for user %s: %s (task %s)", payload["user_id"], payload["event"], payload["task_id"])
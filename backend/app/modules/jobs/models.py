@@ -0,0 +1,36 @@
+from sqlalchemy import String, Integer, Text, JSON, Enum, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+import enum
+from datetime import datetime
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class Job(Base):
+    # Background work queued by the request handlers (see jobs/queue.py).
+    # A RUNNING job whose locked_until has passed is considered abandoned by
+    # its worker and becomes claimable again (visibility timeout).
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Dequeue: due QUEUED jobs in run_at order
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(100))
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.QUEUED)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer)
+    run_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    locked_until: Mapped[datetime] = mapped_column(nullable=True)
+    locked_by: Mapped[str] = mapped_column(String(255), nullable=True)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    result: Mapped[dict] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    started_at: Mapped[datetime] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(nullable=True)
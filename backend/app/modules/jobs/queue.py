@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import REGISTRY
+from app.modules.jobs.models import Job, JobStatus
+
+# DB-backed job queue. Producers add a Job row inside their own transaction
+# (enqueue), so a job exists iff the change that caused it committed. Workers
+# claim due rows, run the handler registered for the job's kind and record
+# the outcome. A claim holds the job for JOB_VISIBILITY_TIMEOUT_SECONDS; if
+# the worker dies, the job becomes claimable again once that passes.
+# Handlers must therefore be idempotent.
+
+logger = logging.getLogger(__name__)
+
+jobs_processed = REGISTRY.counter(
+    "jobs_processed_total", "Job attempts by outcome (done, retry, failed)", ["kind", "outcome"]
+)
+job_wait_seconds = REGISTRY.histogram(
+    "job_queue_wait_seconds", "Time from a job becoming due to being claimed", ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900),
+)
+job_run_seconds = REGISTRY.histogram(
+    "job_run_seconds", "Handler run time per attempt", ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+workers_busy = REGISTRY.gauge("job_workers_busy", "Worker slots currently running a job")
+
+Handler = Callable[[dict], Awaitable[Optional[dict]]]
+HANDLERS: dict[str, Handler] = {}
+
+class PermanentJobError(Exception):
+    # Raised by a handler when retrying cannot help; the job fails at once
+    pass
+
+def handler(kind: str):
+    def register(fn: Handler) -> Handler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+# Set by wake() so idle workers in this process poll right away instead of
+# waiting out JOB_POLL_INTERVAL_SECONDS
+_wakeup = asyncio.Event()
+
+def wake():
+    _wakeup.set()
+
+def enqueue(db: AsyncSession, kind: str, payload: dict, delay: float = 0, max_attempts: Optional[int] = None) -> Job:
+    # Part of the caller's transaction: commits (or rolls back) with it.
+    # Call wake() after the commit.
+    job = Job(
+        kind=kind,
+        payload=payload,
+        status=JobStatus.QUEUED,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.add(job)
+    return job
+
+def retry_delay(attempts: int) -> float:
+    # Exponential backoff with equal jitter: half fixed, half random
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def _due(now: datetime):
+    return or_(
+        and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+        # Claimed by a worker that never finished it
+        and_(Job.status == JobStatus.RUNNING, Job.locked_until < now),
+    )
+
+async def claim(db: AsyncSession, worker_id: str) -> Optional[Job]:
+    # FOR UPDATE SKIP LOCKED (PostgreSQL) keeps concurrent workers off each
+    # other's candidates; the UPDATE re-checks the due condition, so on
+    # databases without row locks (SQLite) a lost race just claims nothing.
+    now = datetime.utcnow()
+    candidates = (await db.execute(
+        select(Job.id)
+        .where(_due(now))
+        .order_by(Job.run_at)
+        .limit(5)
+        .with_for_update(skip_locked=True)
+    )).scalars().all()
+    for job_id in candidates:
+        job = (await db.execute(
+            update(Job)
+            .where(Job.id == job_id, _due(now))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS),
+                started_at=now,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )).scalar_one_or_none()
+        if job is not None:
+            await db.commit()
+            return job
+    await db.commit()
+    return None
+
+async def _finish(db: AsyncSession, job: Job, values: dict) -> bool:
+    # Only the holder of the current claim may record an outcome; a worker
+    # whose claim expired and was taken over must not overwrite the new one.
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.locked_by == job.locked_by, Job.attempts == job.attempts, Job.status == JobStatus.RUNNING)
+        .values(locked_by=None, locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+async def complete(db: AsyncSession, job: Job, result: Optional[dict]) -> bool:
+    return await _finish(db, job, {"status": JobStatus.DONE, "result": result, "last_error": None, "finished_at": datetime.utcnow()})
+
+async def fail(db: AsyncSession, job: Job, error: str, permanent: bool = False) -> str:
+    if permanent or job.attempts >= job.max_attempts:
+        await _finish(db, job, {"status": JobStatus.FAILED, "last_error": error, "finished_at": datetime.utcnow()})
+        return "failed"
+    run_at = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+    await _finish(db, job, {"status": JobStatus.QUEUED, "last_error": error, "run_at": run_at})
+    return "retry"
+
+class JobWorker:
+    # JOB_WORKER_CONCURRENCY asyncio tasks in this process, each claiming and
+    # running one job at a time; that count is the concurrency limit. Run
+    # inside the API process (main.py lifespan) or on its own (jobs/worker.py).
+    def __init__(self, concurrency: Optional[int] = None, sessionmaker=AsyncSessionLocal):
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.sessionmaker = sessionmaker
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopping = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._run(), name=f"job-worker-{i}") for i in range(self.concurrency)]
+
+    async def stop(self, timeout: float = 10.0):
+        # Lets running jobs finish for up to `timeout`; anything cancelled
+        # after that is picked up again once its visibility timeout passes.
+        self._stopping.set()
+        wake()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                async with self.sessionmaker() as db:
+                    job = await claim(db, self.worker_id)
+            except Exception:
+                logger.exception("job claim failed")
+                job = None
+            if job is None:
+                await self._idle()
+                continue
+            if job.attempts > job.max_attempts:
+                # Reclaimed after its last attempt never finished (worker
+                # crashed or hung): give up instead of running it again
+                try:
+                    async with self.sessionmaker() as db:
+                        await fail(db, job, "visibility timeout expired on the final attempt", permanent=True)
+                    jobs_processed.inc(kind=job.kind, outcome="failed")
+                except Exception:
+                    logger.exception("could not fail abandoned job %s", job.id)
+                continue
+            await self._execute(job)
+
+    async def _idle(self):
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+    async def _execute(self, job: Job):
+        job_wait_seconds.observe(max(0.0, (job.started_at - job.run_at).total_seconds()), kind=job.kind)
+        workers_busy.inc()
+        start = time.perf_counter()
+        error, permanent, result = None, False, None
+        try:
+            fn = HANDLERS.get(job.kind)
+            if fn is None:
+                raise PermanentJobError(f"no handler for job kind {job.kind!r}")
+            # Finish well inside the claim so no other worker starts it meanwhile
+            result = await asyncio.wait_for(fn(job.payload), timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS * 0.9)
+        except PermanentJobError as e:
+            error, permanent = str(e), True
+        except asyncio.TimeoutError:
+            error = "timed out"
+        except Exception as e:
+            logger.exception("job %s (%s) attempt %d failed", job.id, job.kind, job.attempts)
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            workers_busy.dec()
+            job_run_seconds.observe(time.perf_counter() - start, kind=job.kind)
+
+        try:
+            async with self.sessionmaker() as db:
+                if error is None:
+                    await complete(db, job, result)
+                    outcome = "done"
+                else:
+                    outcome = await fail(db, job, error[:2000], permanent)
+            jobs_processed.inc(kind=job.kind, outcome=outcome)
+        except Exception:
+            # The claim simply expires and the job runs again
+            logger.exception("could not record outcome of job %s", job.id)
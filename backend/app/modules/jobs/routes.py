@@ -0,0 +1,99 @@
+import math
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_read_db
+from app.core.pagination import PagedByDefault
+from app.modules.users.models import User
+from app.modules.auth.roles import allow_admin
+from app.modules.jobs.models import Job, JobStatus
+from app.modules.jobs.queue import wake
+from app.modules.jobs import schemas
+
+router = APIRouter()
+
+# Completed jobs the latency figures are computed over
+_LATENCY_SAMPLE = 500
+
+def _p95(values: list[float]) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(0, math.ceil(0.95 * len(values)) - 1)]
+
+@router.get("/stats", response_model=schemas.JobQueueStats)
+async def queue_stats(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(allow_admin)
+):
+    now = datetime.utcnow()
+    by_status: dict[str, int] = {s.value: 0 for s in JobStatus}
+    by_kind: dict[str, dict[str, int]] = {}
+    for kind, status, count in await db.execute(select(Job.kind, Job.status, func.count()).group_by(Job.kind, Job.status)):
+        by_status[status.value] += count
+        by_kind.setdefault(kind, {})[status.value] = count
+
+    due, oldest = (await db.execute(
+        select(func.count(), func.min(Job.run_at)).where(Job.status == JobStatus.QUEUED, Job.run_at <= now)
+    )).one()
+
+    # Newest by primary key rather than finished_at, which has no index
+    recent = (await db.execute(
+        select(Job.run_at, Job.started_at, Job.finished_at)
+        .where(Job.status == JobStatus.DONE)
+        .order_by(Job.id.desc())
+        .limit(_LATENCY_SAMPLE)
+    )).all()
+    waits = [max(0.0, (r.started_at - r.run_at).total_seconds()) for r in recent]
+    runs = [max(0.0, (r.finished_at - r.started_at).total_seconds()) for r in recent]
+
+    return schemas.JobQueueStats(
+        by_status=by_status,
+        by_kind=by_kind,
+        due=due,
+        oldest_due_age_seconds=(now - oldest).total_seconds() if oldest else 0.0,
+        sample=len(recent),
+        avg_wait_seconds=sum(waits) / len(waits) if waits else 0.0,
+        p95_wait_seconds=_p95(waits),
+        avg_run_seconds=sum(runs) / len(runs) if runs else 0.0,
+        p95_run_seconds=_p95(runs),
+    )
+
+@router.get("/", response_model=List[schemas.JobRead])
+async def read_jobs(
+    status: Optional[JobStatus] = Query(None),
+    kind: Optional[str] = Query(None),
+    page: PagedByDefault = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(allow_admin)
+):
+    stmt = select(Job)
+    if status is not None:
+        stmt = stmt.where(Job.status == status)
+    if kind is not None:
+        stmt = stmt.where(Job.kind == kind)
+    return await page.fetch(db, stmt, Job.id)
+
+@router.post("/{job_id}/retry", response_model=schemas.JobRead)
+async def retry_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(allow_admin)
+):
+    # Requeue a FAILED job with a fresh set of attempts
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.FAILED)
+        .values(status=JobStatus.QUEUED, attempts=0, run_at=datetime.utcnow(), finished_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        job = await db.get(Job, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=409, detail="Only failed jobs can be retried")
+    await db.commit()
+    wake()
+    return await db.get(Job, job_id)
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+from app.modules.jobs.models import JobStatus
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    payload: dict
+    result: Optional[dict] = None
+    last_error: Optional[str] = None
+    run_at: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class JobQueueStats(BaseModel):
+    # Job count per status value, overall and per kind
+    by_status: dict[str, int]
+    by_kind: dict[str, dict[str, int]]
+    # QUEUED jobs whose run_at has passed, and how long the oldest has waited
+    due: int
+    oldest_due_age_seconds: float
+    # Over the most recently completed jobs (`sample` of them): due -> claimed
+    # and claimed -> done
+    sample: int
+    avg_wait_seconds: float
+    p95_wait_seconds: float
+    avg_run_seconds: float
+    p95_run_seconds: float
@@ -0,0 +1,34 @@
+"""Run the background job worker on its own.
+
+    python -m app.modules.jobs.worker [--concurrency N]
+
+Set JOB_WORKER_IN_PROCESS=false on the API processes so jobs only run here.
+Stops on SIGINT/SIGTERM, letting running jobs finish first.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+from app.core.database import engine
+from app.modules.jobs.queue import JobWorker
+from app.modules.jobs import handlers  # noqa: F401  (registers the job kinds)
+
+async def main(concurrency: int | None) -> int:
+    worker = JobWorker(concurrency)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    worker.start()
+    print(f"job worker {worker.worker_id} running {worker.concurrency} slot(s)")
+    await stop.wait()
+    await worker.stop()
+    await engine.dispose()
+    return 0
+
+if __name__ == "__main__":
+    import app.migrations  # noqa: F401  (registers all models)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=None, help="defaults to JOB_WORKER_CONCURRENCY")
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(asyncio.run(main(parser.parse_args().concurrency)))
@@ -0,0 +1,73 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.modules.payments.models import IdempotencyKey
+
+# status_code of a key claimed by a request that is still running
+PENDING = 0
+
+_dialect_insert = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def request_hash(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def replay(record: IdempotencyKey) -> JSONResponse:
+    return JSONResponse(record.response, status_code=record.status_code, headers={"Idempotent-Replayed": "true"})
+
+async def lookup(db: AsyncSession, user_id: int, endpoint: str, key: str, body_hash: str) -> IdempotencyKey | None:
+    record = await db.scalar(select(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.endpoint == endpoint,
+        IdempotencyKey.key == key,
+    ))
+    if record is None:
+        return None
+    if record.created_at < datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS):
+        # Expired: forget it and treat the request as new
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == record.id))
+        return None
+    if record.request_hash != body_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+    return record
+
+async def claim(db: AsyncSession, user_id: int, endpoint: str, key: str, body_hash: str) -> IdempotencyKey | None:
+    # Call first thing in the request's transaction. Inserts the key as
+    # PENDING; a concurrent request with the same key blocks on the unique
+    # index until this transaction ends, then replays its stored response
+    # (or claims the key itself if this one rolled back). Returns the record
+    # to replay, or None when this request owns the key and must complete().
+    record = await lookup(db, user_id, endpoint, key, body_hash)
+    if record is None:
+        insert = _dialect_insert[db.bind.dialect.name]
+        claimed = await db.scalar(
+            insert(IdempotencyKey)
+            .values(
+                user_id=user_id, endpoint=endpoint, key=key, request_hash=body_hash,
+                status_code=PENDING, response={}, created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "endpoint", "key"])
+            .returning(IdempotencyKey.id)
+        )
+        if claimed is not None:
+            return None
+        record = await lookup(db, user_id, endpoint, key, body_hash)
+    if record is None or record.status_code == PENDING:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is in progress, retry")
+    return record
+
+async def complete(db: AsyncSession, user_id: int, endpoint: str, key: str, status_code: int, response: dict):
+    # Stores the outcome on the claimed key; commits with the work
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.endpoint == endpoint, IdempotencyKey.key == key)
+        .values(status_code=status_code, response=response)
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Float, ForeignKey, DateTime
+from sqlalchemy import Float, ForeignKey, DateTime, String, Integer, JSON, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 from datetime import datetime
@@ -6,9 +6,27 @@ from datetime import datetime
 class Payment(Base):
     __tablename__ = "payments"
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"), unique=True)
     amount: Mapped[float] = mapped_column(Float)
     payment_date: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
     task = relationship("app.modules.projects.models.Task", back_populates="payment")
+
+class IdempotencyKey(Base):
+    # Stored outcome of a request made with an Idempotency-Key header, so a
+    # retry replays the original response instead of charging again.
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "endpoint", "key", name="uq_idempotency_keys_user_endpoint_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    endpoint: Mapped[str] = mapped_column(String)
+    key: Mapped[str] = mapped_column(String(255))
+    # SHA-256 of the request body; reusing a key with another body is an error
+    request_hash: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[int] = mapped_column(Integer)
+    response: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -1,36 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.cache import invalidate, task_tags
+from app.core.events import publish, task_event
 from app.modules.users.models import User
 from app.modules.auth.roles import allow_buyer
 from app.modules.projects.models import Task, TaskStatus, Project
 from app.modules.payments.models import Payment
+from app.modules.payments import schemas, idempotency
+from app.modules.stats import counters
 
 router = APIRouter()
 
+@router.post("/batch", response_model=schemas.PaymentBatchResult)
+async def pay_batch(
+    payload: schemas.PaymentBatchRequest,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(allow_buyer)
+):
+    if payload.task_ids is not None and len(payload.task_ids) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} tasks per request")
+
+    endpoint = "payments:batch"
+    body_hash = idempotency.request_hash(payload.model_dump())
+    if idempotency_key:
+        # Claimed before any work, so a concurrent duplicate waits for this
+        # request instead of racing it
+        record = await idempotency.claim(db, current_user.id, endpoint, idempotency_key, body_hash)
+        if record is not None:
+            return idempotency.replay(record)
+
+    if payload.project_id is not None:
+        in_scope = Task.project_id == payload.project_id
+    else:
+        in_scope = Task.id.in_(payload.task_ids)
+
+    # Lock the payable rows; rows another settlement holds are skipped rather
+    # than waited on (no-op on SQLite, which serializes writers anyway). A
+    # task resubmitted after it was paid already has its payment row.
+    stmt = (
+        select(Task.id, Task.project_id, Task.assignee_id, Task.hourly_rate, Task.time_spent)
+        .join(Project, Task.project_id == Project.id)
+        .outerjoin(Payment, Payment.task_id == Task.id)
+        .where(Project.owner_id == current_user.id, Task.status == TaskStatus.SUBMITTED, Payment.id.is_(None), in_scope)
+        .order_by(Task.id)
+        .with_for_update(of=Task, skip_locked=True)
+    )
+    payable = (await db.execute(stmt)).all()
+    paid = [schemas.PaidItem(task_id=r.id, amount=r.hourly_rate * (r.time_spent or 0)) for r in payable]
+
+    # Explain the tasks in scope that were not paid
+    paid_ids = {p.task_id for p in paid}
+    found = {r.id: r for r in (await db.execute(
+        select(Task.id, Task.status, Project.owner_id, Payment.id.label("payment_id"))
+        .join(Project, Task.project_id == Project.id)
+        .outerjoin(Payment, Payment.task_id == Task.id)
+        .where(in_scope, Task.id.not_in(paid_ids))
+        .order_by(Task.id)
+    )).all()}
+    if payload.task_ids is not None:
+        rest = [i for i in dict.fromkeys(payload.task_ids) if i not in paid_ids]
+    else:
+        # The whole project: only its submitted tasks that were not paid
+        rest = [r.id for r in found.values() if r.status == TaskStatus.SUBMITTED and r.owner_id == current_user.id]
+    skipped = []
+    for task_id in rest:
+        r = found.get(task_id)
+        if r is None:
+            detail = "Task not found"
+        elif r.owner_id != current_user.id:
+            detail = "Not your project"
+        elif r.status == TaskStatus.SUBMITTED and r.payment_id is not None:
+            detail = "Already paid"
+        elif r.status == TaskStatus.SUBMITTED:
+            detail = "Being settled by another request"
+        else:
+            detail = "Task not ready for payment or already paid"
+        skipped.append(schemas.SkippedItem(task_id=task_id, detail=detail))
+
+    result = schemas.PaymentBatchResult(
+        paid=paid,
+        skipped=skipped,
+        total_amount=sum(p.amount for p in paid),
+    )
+    try:
+        # The Core statements hit the unique payments.task_id at execute time
+        if paid:
+            await db.execute(insert(Payment), [{"task_id": p.task_id, "amount": p.amount} for p in paid])
+            await db.execute(
+                update(Task)
+                .where(Task.id.in_([p.task_id for p in paid]))
+                .values(status=TaskStatus.PAID)
+                .execution_options(synchronize_session=False)
+            )
+            await counters.apply_many(db, [
+                (current_user.id, r.assignee_id, counters.merge(
+                    counters.diff(
+                        counters.task_contribution(TaskStatus.SUBMITTED, r.hourly_rate, r.time_spent),
+                        counters.task_contribution(TaskStatus.PAID, r.hourly_rate, r.time_spent),
+                    ),
+                    {"total_payments_received": p.amount},
+                ))
+                for r, p in zip(payable, paid)
+            ])
+        if idempotency_key:
+            await idempotency.complete(db, current_user.id, endpoint, idempotency_key, 200, result.model_dump(mode="json"))
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request paid the same task; the key claim rolls back
+        # with the rest, so a retry starts over
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Tasks were paid concurrently, retry")
+    if paid:
+        await invalidate(
+            "tasks", f"user:{current_user.id}",
+            *(f"project:{r.project_id}" for r in payable), *(f"user:{r.assignee_id}" for r in payable),
+        )
+        await publish(*(
+            task_event("task.paid", r.id, r.project_id, TaskStatus.PAID, current_user.id, r.assignee_id)
+            for r in payable
+        ))
+    return result
+
 @router.post("/{task_id}")
 async def pay_for_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(allow_buyer)
 ):
-    task = await db.get(Task, task_id)
+    # Row lock so concurrent payments of the same task serialize on it
+    task = await db.get(Task, task_id, with_for_update=True)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    
+
     project = await db.get(Project, task.project_id)
     if project.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your project")
-    
+
     if task.status != TaskStatus.SUBMITTED:
         raise HTTPException(status_code=400, detail="Task not ready for payment or already paid")
-    
+
     amount = task.hourly_rate * (task.time_spent or 0)
-    
+    before = counters.snapshot(task)
+
     payment = Payment(task_id=task.id, amount=amount)
     db.add(payment)
-    
+
     task.status = TaskStatus.PAID
-    
-    await db.commit()
+
+    await counters.on_task_changed(
+        db, before, counters.snapshot(task), project.owner_id, task.assignee_id,
+        extra={"total_payments_received": amount},
+    )
+    try:
+        await db.commit()
+    except IntegrityError:
+        # payments.task_id is unique: someone else paid it first
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Task already paid")
+    await invalidate(*task_tags(task.project_id, project.owner_id, task.assignee_id))
+    await publish(task_event("task.paid", task.id, task.project_id, task.status, project.owner_id, task.assignee_id))
     return {"message": "Payment successful", "amount_paid": amount}
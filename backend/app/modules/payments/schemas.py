@@ -0,0 +1,26 @@
+from pydantic import BaseModel, model_validator
+from typing import List, Optional
+
+class PaymentBatchRequest(BaseModel):
+    # Settle every SUBMITTED task of a project, or the given tasks
+    project_id: Optional[int] = None
+    task_ids: Optional[List[int]] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.project_id is None) == (self.task_ids is None):
+            raise ValueError("Give exactly one of project_id or task_ids")
+        return self
+
+class PaidItem(BaseModel):
+    task_id: int
+    amount: float
+
+class SkippedItem(BaseModel):
+    task_id: int
+    detail: str
+
+class PaymentBatchResult(BaseModel):
+    paid: List[PaidItem]
+    skipped: List[SkippedItem]
+    total_amount: float
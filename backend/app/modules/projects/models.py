@@ -1,5 +1,5 @@
-from sqlalchemy import String, Integer, ForeignKey, Float, Enum, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, ForeignKey, Float, Enum, Text, Index, select, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property
 from app.core.database import Base
 import enum
 from datetime import datetime
@@ -12,32 +12,56 @@ class TaskStatus(str, enum.Enum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # list_projects: WHERE owner_id = ? AND id > :cursor ORDER BY id
+        Index("ix_projects_owner_id_id", "owner_id", "id"),
+        # /sync/projects: WHERE owner_id = ? AND (updated_at, id) > :cursor
+        Index("ix_projects_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    title: Mapped[str] = mapped_column(String, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String)
     description: Mapped[str] = mapped_column(Text)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    # Set on every UPDATE, Core bulk statements included (delta sync cursor)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     owner = relationship("User", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
 
-    @property
-    def task_count(self):
-        return len(self.tasks)
-
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pages of the task listings, one per equality filter
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_assignee_id_id", "assignee_id", "id"),
+        Index("ix_tasks_status_id", "status", "id"),
+        # get_my_tasks?status=.. (developer board columns) paged by id
+        Index("ix_tasks_assignee_id_status_id", "assignee_id", "status", "id"),
+        # /sync/tasks per scope: changes after (updated_at, id)
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        Index("ix_tasks_assignee_id_updated_at_id", "assignee_id", "updated_at", "id"),
+        Index("ix_tasks_project_id_updated_at_id", "project_id", "updated_at", "id"),
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    title: Mapped[str] = mapped_column(String, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String)
     description: Mapped[str] = mapped_column(Text)
     hourly_rate: Mapped[float] = mapped_column(Float)
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), default=TaskStatus.TODO)
     
     # Submission details
     time_spent: Mapped[float] = mapped_column(Float, nullable=True) # Hours
+    # Storage key of the solution blob (see core/storage.py); older rows hold
+    # an absolute path under UPLOAD_DIR instead
     solution_file_path: Mapped[str] = mapped_column(String, nullable=True)
+    solution_filename: Mapped[str] = mapped_column(String, nullable=True)
+    # Hex SHA-256 of the uploaded ZIP, for dedup and integrity checks
+    solution_sha256: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=True)
+    # Set on every UPDATE, Core bulk statements included (delta sync cursor)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
     
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
     assignee_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -45,3 +69,22 @@ class Task(Base):
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", back_populates="assigned_tasks")
     payment = relationship("Payment", back_populates="task", uselist=False)
+
+# Counted in SQL (an index-only scan of ix_tasks_project_id_id) instead of
+# loading every task. Deferred so the many Project loads that don't serialize
+# it skip the subquery; list/create undefer or refresh it explicitly.
+Project.task_count = column_property(
+    select(func.count(Task.id)).where(Task.project_id == Project.id).correlate_except(Task).scalar_subquery(),
+    deferred=True,
+)
+
+# Payment queue: SUBMITTED tasks of a project. Partial, so it only holds the
+# handful of rows awaiting payment instead of the whole table. Defined after
+# the class because the predicate needs the mapped column.
+Index(
+    "ix_tasks_submitted_project_id",
+    Task.project_id,
+    Task.id,
+    postgresql_where=Task.status == TaskStatus.SUBMITTED,
+    sqlite_where=Task.status == TaskStatus.SUBMITTED,
+)
@@ -1,15 +1,18 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from sqlalchemy.orm.attributes import set_committed_value
-from app.core.database import get_db
+from sqlalchemy import select, func
+from app.core.database import get_db, get_read_db
+from app.core.pagination import PageParams
+from app.core.cache import ResponseCache, invalidate
+from app.core.serialization import schema_columns
 from app.modules.users.models import User
 from app.modules.auth.roles import allow_buyer
 from app.modules.projects import models, schemas
+from app.modules.stats import counters
 # Import Task schemas for the response model
 from app.modules.tasks.schemas import TaskRead
+from app.modules.tasks.filters import TaskFilters
 
 router = APIRouter()
 
@@ -21,37 +24,67 @@ async def create_project(
 ):
     db_project = models.Project(**project.model_dump(), owner_id=current_user.id)
     db.add(db_project)
+    await counters.on_project_created(db, current_user.id)
     await db.commit()
-    await db.refresh(db_project)
-    # Manually set tasks to empty list to avoid MissingGreenlet on property access
-    set_committed_value(db_project, "tasks", [])
+    await invalidate(f"user:{current_user.id}", "projects")
+    await db.refresh(db_project, ["created_at", "task_count"])
     return db_project
 
+async def tasks_by_status(db: AsyncSession, project_ids: list[int]) -> dict[int, dict[str, int]]:
+    # One grouped query for the whole page
+    counts = {pid: {s.value: 0 for s in models.TaskStatus} for pid in project_ids}
+    if project_ids:
+        rows = await db.execute(
+            select(models.Task.project_id, models.Task.status, func.count())
+            .where(models.Task.project_id.in_(project_ids))
+            .group_by(models.Task.project_id, models.Task.status)
+        )
+        for project_id, status, n in rows:
+            counts[project_id][models.TaskStatus(status).value] = n
+    return counts
+
 @router.get("/", response_model=List[schemas.ProjectRead])
 async def list_projects(
-    db: AsyncSession = Depends(get_db),
+    page: PageParams = Depends(),
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(allow_buyer) # Buyers see their projects. 
     # Logic might differ for Admin/Developer. 
     # For now, let's assume this endpoint is for buyers to see their projects.
 ):
-    result = await db.execute(
-        select(models.Project)
-        .options(selectinload(models.Project.tasks))
-        .where(models.Project.owner_id == current_user.id)
+    if (hit := await cache.lookup("projects:list", [f"user:{current_user.id}"], vary=current_user.id)) is not None:
+        return hit
+    # task_count is among the selected columns (the correlated COUNT)
+    projects = await page.fetch_rows(
+        db,
+        select(*schema_columns(models.Project, schemas.ProjectRead))
+        .where(models.Project.owner_id == current_user.id),
+        models.Project.id,
+    )
+    by_status = await tasks_by_status(db, [p["id"] for p in projects])
+    return await cache.store(
+        [{**p, "tasks_by_status": by_status[p["id"]]} for p in projects],
+        List[schemas.ProjectRead],
     )
-    return result.scalars().all()
 
 @router.get("/{project_id}/tasks", response_model=List[TaskRead])
 async def list_project_tasks(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    filters: TaskFilters = Depends(),
+    page: PageParams = Depends(),
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(allow_buyer)
 ):
+    # Keyed per user, so only a caller that passed the ownership check below
+    # can be served from the cache
+    if (hit := await cache.lookup("projects:tasks", [f"project:{project_id}"], vary=current_user.id)) is not None:
+        return hit
     project = await db.get(models.Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     if project.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your project")
         
-    result = await db.execute(select(models.Task).where(models.Task.project_id == project_id))
-    return result.scalars().all()
+    stmt = filters.apply(select(*schema_columns(models.Task, TaskRead)).where(models.Task.project_id == project_id))
+    return await cache.store(await page.fetch_rows(db, stmt, models.Task.id), List[TaskRead])
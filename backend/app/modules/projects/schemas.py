@@ -14,6 +14,7 @@ class ProjectRead(ProjectBase):
     owner_id: int
     created_at: datetime
     task_count: int = 0
+    tasks_by_status: dict[str, int] = {}
 
     class Config:
         from_attributes = True
@@ -0,0 +1,106 @@
+import asyncio
+import bisect
+import math
+import re
+from collections import Counter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Text search configuration of the PostgreSQL tsvector columns (migration
+# v0008) and of the queries against them
+TS_CONFIG = "english"
+
+# Weights of title and description matches; the ts_rank defaults for the
+# 'A' and 'B' labels the PostgreSQL columns use
+TITLE_WEIGHT = 1.0
+BODY_WEIGHT = 0.4
+
+# Query terms considered, and vocabulary terms one prefix may expand to
+MAX_QUERY_TERMS = 8
+MAX_EXPANSIONS = 200
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN.findall((text or "").lower())
+
+def to_tsquery(terms: list[str]) -> str:
+    # Every term must match, each as a prefix: "api aut" -> "api:* & aut:*".
+    # Terms are plain word characters, so nothing needs escaping.
+    return " & ".join(f"{term}:*" for term in terms)
+
+class InvertedIndex:
+    # Search fallback for databases without full-text indexes (SQLite): term
+    # -> {row id: weight}, ranked tf-idf style. Rows are only ever added, by
+    # id, since the API never edits titles or descriptions, and SQLite's
+    # single writer makes ids visible in order; status and scope filters are
+    # applied in SQL to the ids it returns.
+    def __init__(self, model):
+        self.model = model
+        self.postings: dict[str, dict[int, float]] = {}
+        self.docs = 0
+        self.last_id = 0
+        self._terms: list[str] = []
+        self._terms_stale = False
+        self._lock = asyncio.Lock()
+
+    def add(self, doc_id: int, title: str | None, body: str | None):
+        weights = Counter()
+        for term in tokenize(title):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(body):
+            weights[term] += BODY_WEIGHT
+        for term, weight in weights.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                self._terms_stale = True
+            posting[doc_id] = weight
+        self.docs += 1
+        self.last_id = max(self.last_id, doc_id)
+
+    async def refresh(self, db: AsyncSession):
+        # Picks up rows inserted since the last call (by this or any other
+        # process), so the first search in a process loads everything
+        async with self._lock:
+            model = self.model
+            result = await db.stream(
+                select(model.id, model.title, model.description)
+                .where(model.id > self.last_id)
+                .order_by(model.id)
+                .execution_options(yield_per=5000)
+            )
+            async for doc_id, title, body in result:
+                self.add(doc_id, title, body)
+
+    def expand(self, prefix: str) -> list[str]:
+        if self._terms_stale:
+            self._terms = sorted(self.postings)
+            self._terms_stale = False
+        start = bisect.bisect_left(self._terms, prefix)
+        matches = []
+        for term in self._terms[start:]:
+            if not term.startswith(prefix) or len(matches) >= MAX_EXPANSIONS:
+                break
+            matches.append(term)
+        return matches
+
+    def search(self, terms: list[str]) -> dict[int, float]:
+        # Row id -> score for rows matching every term (as a prefix)
+        scores: dict[int, float] | None = None
+        for prefix in terms:
+            matched: dict[int, float] = {}
+            for term in self.expand(prefix):
+                posting = self.postings[term]
+                idf = math.log(1 + self.docs / len(posting))
+                for doc_id, weight in posting.items():
+                    score = weight * idf
+                    if score > matched.get(doc_id, 0.0):
+                        matched[doc_id] = score
+            if scores is None:
+                scores = matched
+            else:
+                scores = {doc_id: scores[doc_id] + s for doc_id, s in matched.items() if doc_id in scores}
+            if not scores:
+                return {}
+        return scores or {}
@@ -0,0 +1,98 @@
+import enum
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Select, select, func, exists, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_read_db
+from app.modules.auth.deps import get_current_user
+from app.modules.auth.cache import Principal
+from app.modules.users.models import UserRole
+from app.modules.projects.models import Project, Task, TaskStatus
+from app.modules.search.index import InvertedIndex, MAX_QUERY_TERMS, TS_CONFIG, tokenize, to_tsquery
+from app.modules.search.schemas import SearchHit
+
+router = APIRouter()
+
+class SearchType(str, enum.Enum):
+    ALL = "all"
+    PROJECT = "project"
+    TASK = "task"
+
+# Per-process fallback indexes for databases other than PostgreSQL
+_fallback = {"project": InvertedIndex(Project), "task": InvertedIndex(Task)}
+# Ranked ids checked against the SQL filters per round trip (fallback)
+_FILTER_CHUNK = 500
+
+def _tasks(user: Principal, status: Optional[TaskStatus]) -> Select:
+    # Tasks visible to the user: a buyer's projects, a developer's
+    # assignments, everything for admins
+    stmt = select(Task.id, Task.title, Task.project_id, Task.status)
+    if user.role == UserRole.BUYER:
+        stmt = stmt.join(Project, Task.project_id == Project.id).where(Project.owner_id == user.id)
+    elif user.role == UserRole.DEVELOPER:
+        stmt = stmt.where(Task.assignee_id == user.id)
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    return stmt
+
+def _projects(user: Principal) -> Select:
+    stmt = select(Project.id, Project.title, Project.id.label("project_id"))
+    if user.role == UserRole.BUYER:
+        stmt = stmt.where(Project.owner_id == user.id)
+    elif user.role == UserRole.DEVELOPER:
+        stmt = stmt.where(exists().where(Task.project_id == Project.id, Task.assignee_id == user.id))
+    return stmt
+
+def _hit(kind: str, row, rank: float) -> dict:
+    return {"type": kind, **row, "rank": rank}
+
+async def _search_postgres(db: AsyncSession, kind: str, stmt: Select, model, terms: list[str], limit: int) -> list[dict]:
+    # GIN lookup on the generated search_vector column (migration v0008),
+    # ranked by cover density
+    vector = literal_column(f"{model.__tablename__}.search_vector")
+    query = func.to_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), to_tsquery(terms))
+    rank = func.ts_rank_cd(vector, query).label("rank")
+    rows = (await db.execute(
+        stmt.add_columns(rank).where(vector.op("@@")(query)).order_by(rank.desc(), model.id).limit(limit)
+    )).mappings().all()
+    return [_hit(kind, {k: v for k, v in row.items() if k != "rank"}, row["rank"]) for row in rows]
+
+async def _search_fallback(db: AsyncSession, kind: str, stmt: Select, model, terms: list[str], limit: int) -> list[dict]:
+    index = _fallback[kind]
+    await index.refresh(db)
+    scores = index.search(terms)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    hits = []
+    # Chunks are in rank order, so once one fills the page the rest can't
+    # outrank it
+    for i in range(0, len(ranked), _FILTER_CHUNK):
+        rows = (await db.execute(stmt.where(model.id.in_(ranked[i:i + _FILTER_CHUNK])))).mappings().all()
+        hits += [_hit(kind, row, scores[row["id"]]) for row in rows]
+        if len(hits) >= limit:
+            break
+    return hits
+
+@router.get("/", response_model=List[SearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match; each also matches as a prefix"),
+    type: SearchType = Query(SearchType.ALL),
+    status: Optional[TaskStatus] = Query(None, description="Task status; excludes projects"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    terms = tokenize(q)[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    targets = []
+    if type in (SearchType.ALL, SearchType.TASK):
+        targets.append(("task", _tasks(current_user, status), Task))
+    if type in (SearchType.ALL, SearchType.PROJECT) and status is None:
+        targets.append(("project", _projects(current_user), Project))
+
+    backend = _search_postgres if db.get_bind().dialect.name == "postgresql" else _search_fallback
+    hits = []
+    for kind, stmt, model in targets:
+        hits += await backend(db, kind, stmt, model, terms, limit)
+    hits.sort(key=lambda hit: hit["rank"], reverse=True)
+    return hits[:limit]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+from app.modules.projects.models import TaskStatus
+
+class SearchHit(BaseModel):
+    type: Literal["project", "task"]
+    id: int
+    title: str
+    # The project itself for project hits
+    project_id: int
+    status: Optional[TaskStatus] = None
+    # Relevance; only comparable within one response
+    rank: float
@@ -0,0 +1,111 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects import postgresql, sqlite
+from app.modules.users.models import UserRole
+from app.modules.projects.models import TaskStatus
+from app.modules.stats.models import CounterColumns, PlatformCounters, BuyerCounters, DeveloperCounters
+
+PLATFORM_ROW_ID = 1
+
+_dialect_insert = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def task_contribution(status: TaskStatus, hourly_rate: float, time_spent: float | None) -> dict:
+    # What a single task in the given state adds to the rollup counters.
+    contribution = {
+        f"tasks_{TaskStatus(status).value}": 1,
+        "total_developer_hours": time_spent or 0.0,
+    }
+    if status == TaskStatus.SUBMITTED:
+        contribution["pending_amount"] = hourly_rate * (time_spent or 0)
+    return contribution
+
+def snapshot(task) -> dict:
+    return task_contribution(task.status or TaskStatus.TODO, task.hourly_rate, task.time_spent)
+
+def diff(before: dict, after: dict) -> dict:
+    keys = set(before) | set(after)
+    deltas = {k: after.get(k, 0) - before.get(k, 0) for k in keys}
+    return {k: v for k, v in deltas.items() if v}
+
+def merge(*deltas: dict) -> dict:
+    merged = {}
+    for d in deltas:
+        for k, v in d.items():
+            merged[k] = merged.get(k, 0) + v
+    return {k: v for k, v in merged.items() if v}
+
+async def _increment(db: AsyncSession, model, key: dict, deltas: dict):
+    # INSERT .. ON CONFLICT DO UPDATE SET col = col + excluded.col so the
+    # row is created on first use and concurrent writers never lose updates.
+    insert = _dialect_insert[db.bind.dialect.name]
+    stmt = insert(model).values(**key, **deltas)
+    if deltas:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={k: getattr(model, k) + stmt.excluded[k] for k in deltas},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(key))
+    await db.execute(stmt)
+
+async def apply(
+    db: AsyncSession,
+    deltas: dict,
+    buyer_id: int | None = None,
+    developer_id: int | None = None,
+):
+    # Must run inside the caller's transaction, before its commit.
+    # Rows are always touched in platform -> buyer -> developer order.
+    if deltas:
+        await _increment(db, PlatformCounters, {"id": PLATFORM_ROW_ID}, deltas)
+    if buyer_id is not None:
+        await _increment(db, BuyerCounters, {"buyer_id": buyer_id}, deltas)
+    if developer_id is not None:
+        await _increment(db, DeveloperCounters, {"developer_id": developer_id}, deltas)
+
+async def apply_many(db: AsyncSession, items: list[tuple[int, int, dict]]):
+    # Bulk variant of apply() for (buyer_id, developer_id, deltas) items: one
+    # statement per distinct counter row instead of three per item.
+    per_buyer, per_developer = {}, {}
+    for buyer_id, developer_id, deltas in items:
+        per_buyer[buyer_id] = merge(per_buyer.get(buyer_id, {}), deltas)
+        per_developer[developer_id] = merge(per_developer.get(developer_id, {}), deltas)
+    total = merge(*per_buyer.values())
+    if total:
+        await _increment(db, PlatformCounters, {"id": PLATFORM_ROW_ID}, total)
+    # Sorted so concurrent bulk writers lock rows in the same order
+    for buyer_id in sorted(per_buyer):
+        if per_buyer[buyer_id]:
+            await _increment(db, BuyerCounters, {"buyer_id": buyer_id}, per_buyer[buyer_id])
+    for developer_id in sorted(per_developer):
+        if per_developer[developer_id]:
+            await _increment(db, DeveloperCounters, {"developer_id": developer_id}, per_developer[developer_id])
+
+async def on_user_created(db: AsyncSession, user_id: int, role: UserRole):
+    if role == UserRole.BUYER:
+        await _increment(db, PlatformCounters, {"id": PLATFORM_ROW_ID}, {"total_buyers": 1})
+        await _increment(db, BuyerCounters, {"buyer_id": user_id}, {})
+    elif role == UserRole.DEVELOPER:
+        await _increment(db, PlatformCounters, {"id": PLATFORM_ROW_ID}, {"total_developers": 1})
+        await _increment(db, DeveloperCounters, {"developer_id": user_id}, {})
+
+async def on_project_created(db: AsyncSession, owner_id: int):
+    await apply(db, {"total_projects": 1}, buyer_id=owner_id)
+
+async def on_task_changed(db: AsyncSession, before: dict, after: dict, buyer_id: int, developer_id: int, extra: dict | None = None):
+    await apply(db, merge(diff(before, after), extra or {}), buyer_id=buyer_id, developer_id=developer_id)
+
+def to_stats(row: CounterColumns) -> dict:
+    tasks_by_status = {s.value: getattr(row, f"tasks_{s.value}") or 0 for s in TaskStatus}
+    return {
+        "total_projects": row.total_projects or 0,
+        "total_tasks": sum(tasks_by_status.values()),
+        "completed_tasks": tasks_by_status[TaskStatus.SUBMITTED.value] + tasks_by_status[TaskStatus.PAID.value],
+        "total_payments_received": row.total_payments_received or 0.0,
+        "pending_payments": tasks_by_status[TaskStatus.SUBMITTED.value],
+        "pending_amount": row.pending_amount or 0.0,
+        "total_developer_hours": row.total_developer_hours or 0.0,
+        "tasks_by_status": tasks_by_status,
+    }
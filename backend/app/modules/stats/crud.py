@@ -0,0 +1,52 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case
+from app.modules.users.models import User, UserRole
+from app.modules.projects.models import Project, Task, TaskStatus
+from app.modules.payments.models import Payment
+
+def _count_where(condition):
+    # CASE based conditional count instead of FILTER so the same SQL runs on
+    # PostgreSQL and on SQLite builds that predate aggregate FILTER support.
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def _sum_where(condition, value):
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0.0)
+
+def task_aggregate_columns():
+    # Per-status counts, pending amount and hours over whatever set of tasks
+    # the enclosing statement selects (whole table or GROUP BY buyer/developer).
+    submitted = Task.status == TaskStatus.SUBMITTED
+    return [
+        *[_count_where(Task.status == s).label(f"status_{s.value}") for s in TaskStatus],
+        _sum_where(submitted, Task.hourly_rate * func.coalesce(Task.time_spent, 0)).label("pending_amount"),
+        func.coalesce(func.sum(Task.time_spent), 0.0).label("total_developer_hours"),
+    ]
+
+def platform_stats_query():
+    # Aggregates over tasks are the FROM of the statement, the other tables
+    # are folded in as uncorrelated scalar subqueries -> one round trip.
+    return select(
+        select(func.count(Project.id)).scalar_subquery().label("total_projects"),
+        func.count(Task.id).label("total_tasks"),
+        _count_where(Task.status.in_([TaskStatus.SUBMITTED, TaskStatus.PAID])).label("completed_tasks"),
+        *task_aggregate_columns(),
+        select(func.coalesce(func.sum(Payment.amount), 0.0)).scalar_subquery().label("total_payments_received"),
+        select(_count_where(User.role == UserRole.BUYER)).scalar_subquery().label("total_buyers"),
+        select(_count_where(User.role == UserRole.DEVELOPER)).scalar_subquery().label("total_developers"),
+    ).select_from(Task)
+
+async def get_platform_stats(db: AsyncSession) -> dict:
+    row = (await db.execute(platform_stats_query())).mappings().one()
+    tasks_by_status = {s.value: int(row[f"status_{s.value}"] or 0) for s in TaskStatus}
+    return {
+        "total_projects": int(row["total_projects"] or 0),
+        "total_tasks": int(row["total_tasks"] or 0),
+        "completed_tasks": int(row["completed_tasks"] or 0),
+        "total_payments_received": float(row["total_payments_received"] or 0.0),
+        "pending_payments": tasks_by_status[TaskStatus.SUBMITTED.value],
+        "pending_amount": float(row["pending_amount"] or 0.0),
+        "total_developer_hours": float(row["total_developer_hours"] or 0.0),
+        "total_buyers": int(row["total_buyers"] or 0),
+        "total_developers": int(row["total_developers"] or 0),
+        "tasks_by_status": tasks_by_status,
+    }
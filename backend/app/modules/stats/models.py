@@ -0,0 +1,33 @@
+from sqlalchemy import Integer, Float, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class CounterColumns:
+    # Shared rollup columns. total_tasks / completed_tasks / pending_payments
+    # are derived from the per-status counts when read.
+    total_projects: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    tasks_todo: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    tasks_in_progress: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    tasks_submitted: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    tasks_paid: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    pending_amount: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    total_developer_hours: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    total_payments_received: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+
+class PlatformCounters(CounterColumns, Base):
+    __tablename__ = "platform_counters"
+
+    # Single row table, always id=1
+    id: Mapped[int] = mapped_column(primary_key=True)
+    total_buyers: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    total_developers: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+class BuyerCounters(CounterColumns, Base):
+    __tablename__ = "buyer_counters"
+
+    buyer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+
+class DeveloperCounters(CounterColumns, Base):
+    __tablename__ = "developer_counters"
+
+    developer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
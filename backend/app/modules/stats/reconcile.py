@@ -0,0 +1,139 @@
+"""Rebuild the stats rollup tables from the source tables and report drift.
+
+    python -m app.modules.stats.reconcile            # report and fix
+    python -m app.modules.stats.reconcile --dry-run  # report only
+"""
+import asyncio
+import sys
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import IntegrityError
+from app.core.migrations import ADVISORY_LOCK_ID
+from app.modules.users.models import User, UserRole
+from app.modules.projects.models import Project, Task, TaskStatus
+from app.modules.payments.models import Payment
+from app.modules.stats.models import PlatformCounters, BuyerCounters, DeveloperCounters
+from app.modules.stats.crud import get_platform_stats, task_aggregate_columns
+from app.modules.stats.counters import PLATFORM_ROW_ID
+
+COUNTER_FIELDS = [
+    "total_projects",
+    *[f"tasks_{s.value}" for s in TaskStatus],
+    "pending_amount",
+    "total_developer_hours",
+    "total_payments_received",
+]
+FLOAT_TOLERANCE = 1e-6
+
+def _empty_row() -> dict:
+    return {f: 0 for f in COUNTER_FIELDS}
+
+def _from_task_aggregates(row) -> dict:
+    values = {f"tasks_{s.value}": int(row[f"status_{s.value}"] or 0) for s in TaskStatus}
+    values["pending_amount"] = float(row["pending_amount"] or 0.0)
+    values["total_developer_hours"] = float(row["total_developer_hours"] or 0.0)
+    return values
+
+async def _grouped(db: AsyncSession, role: UserRole, group_col, task_from, project_counts, payments_from) -> dict:
+    expected = {}
+    users = await db.execute(select(User.id).where(User.role == role))
+    for user_id in users.scalars():
+        expected[user_id] = _empty_row()
+
+    tasks = await db.execute(select(group_col.label("key"), *task_aggregate_columns()).select_from(task_from).group_by(group_col))
+    for row in tasks.mappings():
+        expected.setdefault(row["key"], _empty_row()).update(_from_task_aggregates(row))
+
+    if project_counts is not None:
+        for key, count in await db.execute(project_counts):
+            expected.setdefault(key, _empty_row())["total_projects"] = int(count)
+
+    payments = await db.execute(
+        select(group_col, func.coalesce(func.sum(Payment.amount), 0.0)).select_from(payments_from).group_by(group_col)
+    )
+    for key, amount in payments:
+        expected.setdefault(key, _empty_row())["total_payments_received"] = float(amount)
+    return expected
+
+async def compute_expected(db: AsyncSession) -> dict:
+    stats = await get_platform_stats(db)
+    platform = {
+        "total_projects": stats["total_projects"],
+        **{f"tasks_{k}": v for k, v in stats["tasks_by_status"].items()},
+        "pending_amount": stats["pending_amount"],
+        "total_developer_hours": stats["total_developer_hours"],
+        "total_payments_received": stats["total_payments_received"],
+        "total_buyers": stats["total_buyers"],
+        "total_developers": stats["total_developers"],
+    }
+    buyers = await _grouped(
+        db, UserRole.BUYER, Project.owner_id,
+        task_from=Task.__table__.join(Project.__table__, Task.project_id == Project.id),
+        project_counts=select(Project.owner_id, func.count(Project.id)).group_by(Project.owner_id),
+        payments_from=Payment.__table__.join(Task.__table__, Payment.task_id == Task.id).join(Project.__table__, Task.project_id == Project.id),
+    )
+    developers = await _grouped(
+        db, UserRole.DEVELOPER, Task.assignee_id,
+        task_from=Task.__table__,
+        project_counts=None,
+        payments_from=Payment.__table__.join(Task.__table__, Payment.task_id == Task.id),
+    )
+    return {
+        (PlatformCounters, PLATFORM_ROW_ID): platform,
+        **{(BuyerCounters, k): v for k, v in buyers.items()},
+        **{(DeveloperCounters, k): v for k, v in developers.items()},
+    }
+
+def _differs(stored, expected) -> bool:
+    if isinstance(expected, float) or isinstance(stored, float):
+        return abs((stored or 0.0) - expected) > FLOAT_TOLERANCE
+    return (stored or 0) != expected
+
+async def reconcile(db: AsyncSession, fix: bool = True) -> list[dict]:
+    # Returns one entry per drifted field; writes the expected values when fix=True.
+    # Run it with writes quiesced (or accept that in-flight writes may show up as drift).
+    expected = await compute_expected(db)
+    drift = []
+    for (model, key), values in expected.items():
+        row = await db.get(model, key)
+        for field, value in values.items():
+            stored = getattr(row, field) if row is not None else None
+            if row is None or _differs(stored, value):
+                drift.append({"table": model.__tablename__, "key": key, "field": field, "stored": stored, "expected": value})
+        if fix:
+            pk = model.__mapper__.primary_key[0].key
+            await db.merge(model(**{pk: key}, **values))
+    if fix:
+        await db.commit()
+    return drift
+
+async def ensure_initialized(db: AsyncSession):
+    # Seed the rollups on first boot against a database that predates them.
+    # Every booting process gets here; on PostgreSQL they serialize on the
+    # migration lock and all but the first find the row already seeded.
+    if await db.get(PlatformCounters, PLATFORM_ROW_ID) is not None:
+        return
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+        if await db.get(PlatformCounters, PLATFORM_ROW_ID) is not None:
+            await db.rollback()
+            return
+    try:
+        await reconcile(db, fix=True)
+    except IntegrityError:
+        # SQLite has no advisory locks: another process seeded it first
+        await db.rollback()
+
+async def main(argv: list[str]) -> int:
+    from app.core.database import AsyncSessionLocal
+
+    fix = "--dry-run" not in argv
+    async with AsyncSessionLocal() as db:
+        drift = await reconcile(db, fix=fix)
+    for d in drift:
+        print(f"{d['table']}[{d['key']}].{d['field']}: stored={d['stored']} expected={d['expected']}")
+    print(f"{len(drift)} drifted field(s){' fixed' if fix and drift else ''}")
+    return 1 if drift and not fix else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -1,62 +1,52 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from app.core.database import get_db
-from app.modules.users.models import User
-from app.modules.auth.roles import allow_admin
-from app.modules.projects.models import Project, Task, TaskStatus
-from app.modules.payments.models import Payment
-from app.modules.stats.schemas import AdminStats
+from app.core.database import get_read_db
+from app.core.cache import ResponseCache
+from app.modules.users.models import User, UserRole
+from app.modules.auth.roles import allow_admin, RoleChecker
+from app.modules.stats.schemas import AdminStats, UserStats
+from app.modules.stats.models import PlatformCounters, BuyerCounters, DeveloperCounters
+from app.modules.stats.crud import get_platform_stats
+from app.modules.stats.counters import PLATFORM_ROW_ID, to_stats
 
 router = APIRouter()
 
+allow_buyer_or_developer = RoleChecker([UserRole.BUYER, UserRole.DEVELOPER])
+
 @router.get("/", response_model=AdminStats)
 async def get_admin_stats(
-    db: AsyncSession = Depends(get_db),
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(allow_admin)
 ):
-    # Total projects
-    projects_res = await db.execute(select(func.count(Project.id)))
-    total_projects = projects_res.scalar() or 0
-    
-    # Total tasks
-    tasks_res = await db.execute(select(func.count(Task.id)))
-    total_tasks = tasks_res.scalar() or 0
-    
-    # Completed tasks (Assuming PAID or SUBMITTED? User said "Completed tasks")
-    # Let's count tasks that are finished by dev (SUBMITTED/PAID).
-    completed_res = await db.execute(select(func.count(Task.id)).where(Task.status.in_([TaskStatus.SUBMITTED, TaskStatus.PAID])))
-    completed_tasks = completed_res.scalar() or 0
-    
-    # Total payments
-    payments_res = await db.execute(select(func.sum(Payment.amount)))
-    total_payments_received = payments_res.scalar() or 0.0
-    
-    # Pending payments (Submitted but not Paid)
-    pending_res = await db.execute(select(Task).where(Task.status == TaskStatus.SUBMITTED))
-    pending_tasks = pending_res.scalars().all()
-    # Calculate expected amount
-    pending_amount = sum(t.hourly_rate * (t.time_spent or 0) for t in pending_tasks)
-    
-    # Total hours
-    hours_res = await db.execute(select(func.sum(Task.time_spent)))
-    total_developer_hours = hours_res.scalar() or 0.0
-    
-    # User stats
-    buyers_res = await db.execute(select(func.count(User.id)).where(User.role == "buyer"))
-    total_buyers = buyers_res.scalar() or 0
+    if (hit := await cache.lookup("stats:admin", ["tasks", "users", "projects"])) is not None:
+        return hit
+    # O(1) read of the rollup row maintained by the write paths (stats/counters.py)
+    counters = await db.get(PlatformCounters, PLATFORM_ROW_ID)
+    if counters is None:
+        # Rollups not seeded yet, fall back to the single aggregate query
+        stats = await get_platform_stats(db)
+    else:
+        stats = {
+            **to_stats(counters),
+            "total_buyers": counters.total_buyers,
+            "total_developers": counters.total_developers,
+        }
+    return await cache.store(AdminStats(
+        **stats,
+        revenue_generated=stats["total_payments_received"],
+    ), AdminStats)
 
-    developers_res = await db.execute(select(func.count(User.id)).where(User.role == "developer"))
-    total_developers = developers_res.scalar() or 0
-    
-    return AdminStats(
-        total_projects=total_projects,
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        total_payments_received=total_payments_received,
-        pending_payments=len(pending_tasks), 
-        total_developer_hours=total_developer_hours,
-        revenue_generated=total_payments_received,
-        total_buyers=total_buyers,
-        total_developers=total_developers
-    )
+@router.get("/me", response_model=UserStats)
+async def get_my_stats(
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(allow_buyer_or_developer)
+):
+    if (hit := await cache.lookup("stats:me", [f"user:{current_user.id}"], vary=current_user.id)) is not None:
+        return hit
+    model = BuyerCounters if current_user.role == UserRole.BUYER else DeveloperCounters
+    counters = await db.get(model, current_user.id)
+    if counters is None:
+        raise HTTPException(status_code=404, detail="Stats not available yet")
+    return await cache.store(UserStats(**to_stats(counters)), UserStats)
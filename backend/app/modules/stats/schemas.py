@@ -6,7 +6,21 @@ class AdminStats(BaseModel):
     completed_tasks: int
     total_payments_received: float
     pending_payments: int
+    pending_amount: float = 0.0
     total_developer_hours: float
     revenue_generated: float
     total_buyers: int
     total_developers: int
+    # Task count per TaskStatus value, e.g. {"todo": 3, "submitted": 1, ...}
+    tasks_by_status: dict[str, int] = {}
+
+class UserStats(BaseModel):
+    # Per-buyer (tasks in their projects) or per-developer (tasks assigned to them) rollup
+    total_projects: int
+    total_tasks: int
+    completed_tasks: int
+    total_payments_received: float
+    pending_payments: int
+    pending_amount: float
+    total_developer_hours: float
+    tasks_by_status: dict[str, int] = {}
@@ -0,0 +1,45 @@
+from sqlalchemy import String, Integer, Index, event, insert, select
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+from app.modules.projects.models import Project, Task
+from datetime import datetime
+
+class Tombstone(Base):
+    # Deleted tasks/projects, reported by /sync so clients can drop them.
+    # Written by the ORM delete hooks below; Core DELETE statements bypass
+    # them and must insert their own. Purge with `python -m app.modules.sync.tombstones`.
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_entity_deleted_at", "entity", "deleted_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    entity: Mapped[str] = mapped_column(String(20))
+    entity_id: Mapped[int] = mapped_column(Integer)
+    project_id: Mapped[int] = mapped_column(Integer)
+    # Who could see the row, for scoping the sync feeds
+    buyer_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    developer_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    deleted_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+@event.listens_for(Task, "after_delete")
+def _task_deleted(mapper, connection, target):
+    # Within the deleting flush; a project's tasks go before the project row
+    connection.execute(insert(Tombstone).values(
+        entity="task",
+        entity_id=target.id,
+        project_id=target.project_id,
+        buyer_id=select(Project.owner_id).where(Project.id == target.project_id).scalar_subquery(),
+        developer_id=target.assignee_id,
+        deleted_at=datetime.utcnow(),
+    ))
+
+@event.listens_for(Project, "after_delete")
+def _project_deleted(mapper, connection, target):
+    connection.execute(insert(Tombstone).values(
+        entity="project",
+        entity_id=target.id,
+        project_id=target.id,
+        buyer_id=target.owner_id,
+        deleted_at=datetime.utcnow(),
+    ))
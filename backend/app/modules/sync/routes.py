@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import Select, select, func, case, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.serialization import schema_columns
+from app.modules.auth.deps import get_current_user
+from app.modules.auth.cache import Principal
+from app.modules.auth.roles import allow_buyer
+from app.modules.users.models import UserRole
+from app.modules.projects.models import Project, Task
+from app.modules.projects.routes import tasks_by_status
+from app.modules.sync.models import Tombstone
+from app.modules.sync import schemas
+
+router = APIRouter()
+
+# Delta sync: rows changed after the cursor's (updated_at, id), oldest
+# first, plus ids deleted since. A client keeps the cursor from its last
+# call; the first call (no cursor) returns everything in scope.
+
+def _decode(cursor: Optional[str]) -> tuple[datetime, int]:
+    if cursor is None:
+        return datetime.min, 0
+    values = decode_cursor(cursor)
+    try:
+        since, after_id = datetime.fromisoformat(values["t"]), int(values["i"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if since < datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+        # Deletions that old may have been purged; start over
+        raise HTTPException(status_code=410, detail="Sync cursor expired, sync again without a cursor")
+    return since, after_id
+
+def _after(updated_at, id_column, since: datetime, after_id: int):
+    return or_(updated_at > since, and_(updated_at == since, id_column > after_id))
+
+async def _page(db: AsyncSession, stmt: Select, limit: int, since: datetime) -> tuple[list, str, bool, datetime]:
+    # stmt selects updated_at and id and is ordered by them. Returns the rows,
+    # the next cursor, whether more are waiting and the upper bound of this
+    # page for tombstones.
+    rows = list((await db.execute(stmt.limit(limit + 1))).mappings().all())
+    now = datetime.utcnow()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor({"t": last["updated_at"].isoformat(), "i": last["id"]}), True, last["updated_at"]
+    # Caught up: everything up to now was sent, so the cursor moves to the
+    # start of the settle window (see SYNC_SETTLE_SECONDS) even when the
+    # newest row is older. Keeping that row's updated_at would let the
+    # cursor of an idle client expire.
+    settle = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    return rows, encode_cursor({"t": max(settle, since).isoformat(), "i": 0}), False, now
+
+async def _deleted(db: AsyncSession, entity: str, user: Principal, since: datetime, until: datetime) -> list[int]:
+    stmt = select(Tombstone.entity_id).where(
+        Tombstone.entity == entity, Tombstone.deleted_at > since, Tombstone.deleted_at <= until
+    )
+    if user.role == UserRole.BUYER:
+        stmt = stmt.where(Tombstone.buyer_id == user.id)
+    elif user.role == UserRole.DEVELOPER:
+        stmt = stmt.where(Tombstone.developer_id == user.id)
+    return list(dict.fromkeys((await db.execute(stmt.order_by(Tombstone.id))).scalars()))
+
+@router.get("/tasks", response_model=schemas.TaskChanges)
+async def sync_tasks(
+    cursor: Optional[str] = Query(None, description="`cursor` from the previous response"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    # Same scopes as the task lists: assigned tasks, the buyer's project
+    # tasks, or everything for admins
+    since, after_id = _decode(cursor)
+    stmt = select(*schema_columns(Task, schemas.TaskSyncRead))
+    if current_user.role == UserRole.DEVELOPER:
+        stmt = stmt.where(Task.assignee_id == current_user.id)
+    elif current_user.role == UserRole.BUYER:
+        stmt = stmt.join(Project, Task.project_id == Project.id).where(Project.owner_id == current_user.id)
+    stmt = stmt.where(_after(Task.updated_at, Task.id, since, after_id)).order_by(Task.updated_at, Task.id)
+
+    rows, next_cursor, has_more, until = await _page(db, stmt, limit, since)
+    deleted = await _deleted(db, "task", current_user, since, until) if cursor else []
+    return {"changes": rows, "deleted": deleted, "cursor": next_cursor, "has_more": has_more}
+
+@router.get("/projects", response_model=schemas.ProjectChanges)
+async def sync_projects(
+    cursor: Optional[str] = Query(None, description="`cursor` from the previous response"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(allow_buyer)
+):
+    since, after_id = _decode(cursor)
+    # A project's task counts change with its tasks, so it counts as updated
+    # at the later of its own and its tasks' updated_at
+    tasks_updated = (
+        select(Task.project_id, func.max(Task.updated_at).label("updated_at"))
+        .join(Project, Task.project_id == Project.id)
+        .where(Project.owner_id == current_user.id)
+        .group_by(Task.project_id)
+        .subquery()
+    )
+    changed = (
+        select(
+            *schema_columns(Project, schemas.ProjectRead),
+            case(
+                (tasks_updated.c.updated_at > Project.updated_at, tasks_updated.c.updated_at),
+                else_=Project.updated_at,
+            ).label("updated_at"),
+        )
+        .outerjoin(tasks_updated, tasks_updated.c.project_id == Project.id)
+        .where(Project.owner_id == current_user.id)
+        .subquery()
+    )
+    stmt = (
+        select(changed)
+        .where(_after(changed.c.updated_at, changed.c.id, since, after_id))
+        .order_by(changed.c.updated_at, changed.c.id)
+    )
+
+    rows, next_cursor, has_more, until = await _page(db, stmt, limit, since)
+    by_status = await tasks_by_status(db, [p["id"] for p in rows])
+    deleted = await _deleted(db, "project", current_user, since, until) if cursor else []
+    return {
+        "changes": [{**p, "tasks_by_status": by_status[p["id"]]} for p in rows],
+        "deleted": deleted,
+        "cursor": next_cursor,
+        "has_more": has_more,
+    }
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+from app.modules.tasks.schemas import TaskRead
+from app.modules.projects.schemas import ProjectRead
+
+class TaskSyncRead(TaskRead):
+    updated_at: datetime
+
+class ProjectSyncRead(ProjectRead):
+    # Latest change to the project or any of its tasks
+    updated_at: datetime
+
+class TaskChanges(BaseModel):
+    # Rows to upsert and ids to drop, in change order. Pass `cursor` back
+    # as ?cursor= for the next call; keep calling while has_more.
+    changes: List[TaskSyncRead]
+    deleted: List[int]
+    cursor: str
+    has_more: bool
+
+class ProjectChanges(BaseModel):
+    changes: List[ProjectSyncRead]
+    deleted: List[int]
+    cursor: str
+    has_more: bool
@@ -0,0 +1,30 @@
+"""Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+    python -m app.modules.sync.tombstones
+
+Run daily (cron). Sync cursors that old are rejected with 410 anyway, so
+the clients holding them resync from scratch instead of missing deletions.
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.modules.sync.models import Tombstone
+
+async def purge() -> int:
+    cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(Tombstone).where(Tombstone.deleted_at < cutoff))
+        await db.commit()
+    return result.rowcount
+
+async def main() -> int:
+    print(f"{await purge()} tombstone(s) purged")
+    await engine.dispose()
+    return 0
+
+if __name__ == "__main__":
+    import app.migrations  # noqa: F401  (registers all models)
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,84 @@
+"""Maintenance for the content-addressed solution store.
+
+    python -m app.modules.tasks.blobs migrate   # move pre-dedup uploads into the store
+    python -m app.modules.tasks.blobs gc        # delete blobs no task references
+
+gc skips blobs written or reused within BLOB_GC_GRACE_SECONDS, whose task
+row may not have committed yet.
+"""
+import asyncio
+import hashlib
+import os
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.storage import blob_key, get_storage
+from app.modules.projects.models import Task
+from app.modules.tasks.uploads import count_references
+
+async def migrate_legacy() -> int:
+    # Rows written before dedup hold an absolute path; hash each file, put it
+    # in the store once and repoint every row, then drop the old copies.
+    storage = get_storage()
+    moved = 0
+    async with AsyncSessionLocal() as db:
+        tasks = (await db.execute(select(Task).where(Task.solution_file_path.like("/%")))).scalars().all()
+        for task in tasks:
+            path = task.solution_file_path
+            if not os.path.exists(path):
+                print(f"task {task.id}: missing {path}, skipped")
+                continue
+            sha256 = hashlib.sha256()
+            with open(path, "rb") as f:
+                while chunk := f.read(settings.UPLOAD_CHUNK_SIZE):
+                    sha256.update(chunk)
+            digest = sha256.hexdigest()
+            key = blob_key(digest)
+            if not await storage.exists(key):
+                with open(path, "rb") as f:
+                    await storage.put(key, f)
+            task.solution_file_path = key
+            task.solution_sha256 = digest
+            # Legacy names were "{task_id}_{original name}"
+            task.solution_filename = task.solution_filename or os.path.basename(path).split("_", 1)[-1]
+            await db.commit()
+            if await count_references(db, path) == 0:
+                os.remove(path)
+            moved += 1
+    return moved
+
+async def collect_garbage() -> int:
+    storage = get_storage()
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.BLOB_GC_GRACE_SECONDS)
+    deleted = 0
+    async with AsyncSessionLocal() as db:
+        async for key, modified in storage.entries():
+            if modified > cutoff:
+                continue
+            if await count_references(db, key) > 0:
+                continue
+            # A submission may have reused the blob since it was listed: it
+            # touches the blob before committing its reference
+            modified = await storage.modified(key)
+            if modified is None or modified > cutoff:
+                continue
+            await storage.delete(key)
+            deleted += 1
+    return deleted
+
+async def main(argv: list[str]) -> int:
+    command = argv[0] if argv else ""
+    if command == "migrate":
+        print(f"{await migrate_legacy()} solution(s) moved into the blob store")
+    elif command == "gc":
+        print(f"{await collect_garbage()} unreferenced blob(s) deleted")
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    import app.migrations  # noqa: F401  (registers all models)
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,37 @@
+from typing import Optional
+from fastapi import Query
+from sqlalchemy import Select
+from app.modules.projects.models import Task, TaskStatus
+
+# Server-side filters for task listings. The equality filters line up with the
+# (column, id) composite indexes on tasks so a filtered page is a single index
+# range scan in id order; rate bounds are residual predicates on that scan.
+class TaskFilters:
+    def __init__(
+        self,
+        status: Optional[TaskStatus] = Query(None),
+        # Python name differs from the alias so it doesn't clash with the
+        # {project_id} path parameter of /projects/{project_id}/tasks
+        project: Optional[int] = Query(None, alias="project_id"),
+        assignee_id: Optional[int] = Query(None),
+        min_rate: Optional[float] = Query(None, ge=0),
+        max_rate: Optional[float] = Query(None, ge=0),
+    ):
+        self.status = status
+        self.project_id = project
+        self.assignee_id = assignee_id
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+
+    def apply(self, stmt: Select) -> Select:
+        if self.status is not None:
+            stmt = stmt.where(Task.status == self.status)
+        if self.project_id is not None:
+            stmt = stmt.where(Task.project_id == self.project_id)
+        if self.assignee_id is not None:
+            stmt = stmt.where(Task.assignee_id == self.assignee_id)
+        if self.min_rate is not None:
+            stmt = stmt.where(Task.hourly_rate >= self.min_rate)
+        if self.max_rate is not None:
+            stmt = stmt.where(Task.hourly_rate <= self.max_rate)
+        return stmt
@@ -1,16 +1,26 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.core.database import get_db
+from sqlalchemy import select, insert, update
+from sqlalchemy.orm import joinedload
+from app.core.database import get_db, get_read_db
 from app.core.config import settings
-from app.modules.users.models import User
+from app.core.pagination import PageParams
+from app.core.cache import ResponseCache, invalidate, task_tags
+from app.core.events import publish, task_event
+from app.core.serialization import schema_columns
+from app.modules.users.models import User, UserRole
 from app.modules.auth.roles import allow_buyer, allow_developer, allow_buyer_or_admin
 from app.modules.projects.models import Task, TaskStatus, Project
+from app.modules.payments.models import Payment
 from app.modules.tasks import schemas
-import aiofiles
+from app.modules.tasks.filters import TaskFilters
+from app.modules.tasks.uploads import store_solution
+from app.core.storage import get_storage
+from app.core.downloads import blob_response
+from app.modules.stats import counters
+from app.modules.jobs.queue import enqueue, wake
 import os
-import shutil
 
 router = APIRouter()
 
@@ -29,21 +39,147 @@ async def create_task(
 
     db_task = Task(**task.model_dump())
     db.add(db_task)
+    await counters.apply(
+        db,
+        counters.task_contribution(TaskStatus.TODO, db_task.hourly_rate, None),
+        buyer_id=project.owner_id,
+        developer_id=db_task.assignee_id,
+    )
     await db.commit()
+    await invalidate(*task_tags(project.id, project.owner_id, db_task.assignee_id))
     await db.refresh(db_task)
+    await publish(task_event("task.created", db_task.id, project.id, db_task.status, project.owner_id, db_task.assignee_id))
     return db_task
 
+def _check_bulk_size(items: list):
+    if not items:
+        raise HTTPException(status_code=400, detail="No items given")
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+
+@router.post("/bulk", response_model=schemas.TaskBulkCreateResult)
+async def create_tasks_bulk(
+    payload: schemas.TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(allow_buyer)
+):
+    _check_bulk_size(payload.tasks)
+    # Ownership is checked once for the whole batch
+    project = await db.get(Project, payload.project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if project.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to add tasks to this project")
+
+    # One lookup for every distinct assignee instead of failing on the FK later
+    assignee_ids = {t.assignee_id for t in payload.tasks}
+    developers = set((await db.execute(
+        select(User.id).where(User.id.in_(assignee_ids), User.role == UserRole.DEVELOPER)
+    )).scalars())
+
+    errors, rows = [], []
+    for index, item in enumerate(payload.tasks):
+        if item.assignee_id not in developers:
+            errors.append(schemas.BulkItemError(index=index, detail="Assignee not found or not a developer"))
+            continue
+        rows.append({**item.model_dump(), "project_id": project.id, "status": TaskStatus.TODO})
+
+    created = []
+    if rows:
+        # Multi-row INSERT .. RETURNING (batched by SQLAlchemy's insertmanyvalues)
+        created = (await db.scalars(insert(Task).returning(Task), rows)).all()
+        await counters.apply_many(db, [
+            (project.owner_id, t.assignee_id, counters.task_contribution(TaskStatus.TODO, t.hourly_rate, None))
+            for t in created
+        ])
+        await db.commit()
+        await invalidate(*task_tags(project.id, project.owner_id, None), *(f"user:{t.assignee_id}" for t in created))
+        await publish(*(task_event("task.created", t.id, project.id, t.status, project.owner_id, t.assignee_id) for t in created))
+    return schemas.TaskBulkCreateResult(created=created, errors=errors)
+
+@router.patch("/bulk", response_model=schemas.TaskBulkStatusResult)
+async def update_tasks_bulk(
+    payload: schemas.TaskBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(allow_developer)
+):
+    _check_bulk_size(payload.task_ids)
+    if payload.status not in [TaskStatus.TODO, TaskStatus.IN_PROGRESS]:
+        raise HTTPException(status_code=400, detail="Invalid status update")
+    other = TaskStatus.IN_PROGRESS if payload.status == TaskStatus.TODO else TaskStatus.TODO
+    task_ids = list(dict.fromkeys(payload.task_ids))
+
+    # Single UPDATE; only the caller's tasks currently in the other board
+    # column qualify, so every returned row moved other -> payload.status.
+    moved = (await db.execute(
+        update(Task)
+        .where(Task.id.in_(task_ids), Task.assignee_id == current_user.id, Task.status == other)
+        .values(status=payload.status)
+        .returning(Task.id, Task.project_id, Task.hourly_rate, Task.time_spent)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    if moved:
+        owners = dict((await db.execute(
+            select(Project.id, Project.owner_id).where(Project.id.in_({r.project_id for r in moved}))
+        )).all())
+        await counters.apply_many(db, [
+            (owners[r.project_id], current_user.id, counters.diff(
+                counters.task_contribution(other, r.hourly_rate, r.time_spent),
+                counters.task_contribution(payload.status, r.hourly_rate, r.time_spent),
+            ))
+            for r in moved
+        ])
+        await db.commit()
+        await invalidate(
+            "tasks", f"user:{current_user.id}",
+            *(f"project:{pid}" for pid in owners), *(f"user:{owner}" for owner in owners.values()),
+        )
+        await publish(*(
+            task_event("task.updated", r.id, r.project_id, payload.status, owners[r.project_id], current_user.id)
+            for r in moved
+        ))
+
+    # Explain only the ids that were not moved
+    moved_ids = {r.id for r in moved}
+    errors = []
+    rest = [i for i in task_ids if i not in moved_ids]
+    if rest:
+        found = {r.id: r for r in (await db.execute(
+            select(Task.id, Task.assignee_id, Task.status).where(Task.id.in_(rest))
+        )).all()}
+        for task_id in rest:
+            r = found.get(task_id)
+            if r is None:
+                detail = "Task not found"
+            elif r.assignee_id != current_user.id:
+                detail = "Not your task"
+            elif r.status == payload.status:
+                detail = f"Task already {payload.status.value}"
+            else:
+                detail = f"Cannot move a {TaskStatus(r.status).value} task"
+            errors.append(schemas.BulkItemError(index=payload.task_ids.index(task_id), task_id=task_id, detail=detail))
+    return schemas.TaskBulkStatusResult(updated=[r.id for r in moved], errors=errors)
+
 @router.get("/assigned", response_model=List[schemas.TaskRead])
 async def get_my_tasks(
-    db: AsyncSession = Depends(get_db),
+    filters: TaskFilters = Depends(),
+    page: PageParams = Depends(),
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(allow_developer)
 ):
-    result = await db.execute(select(Task).where(Task.assignee_id == current_user.id))
-    return result.scalars().all()
+    if (hit := await cache.lookup("tasks:assigned", [f"user:{current_user.id}"], vary=current_user.id)) is not None:
+        return hit
+    stmt = filters.apply(select(*schema_columns(Task, schemas.TaskRead)).where(Task.assignee_id == current_user.id))
+    return await cache.store(await page.fetch_rows(db, stmt, Task.id), List[schemas.TaskRead])
 
 @router.get("/all", response_model=List[schemas.TaskRead])
 async def get_all_tasks(
-    db: AsyncSession = Depends(get_db),
+    filters: TaskFilters = Depends(),
+    page: PageParams = Depends(),
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(allow_buyer_or_admin) # Allow buyer to see all? Or just admin? Req says Admin. 
 ):
     # Requirement: Admin can see Tasks by status with hourly rate.
@@ -61,9 +197,12 @@ async def get_all_tasks(
     if current_user.role != "admin":
          raise HTTPException(status_code=403, detail="Admin only")
          
-    result = await db.execute(select(Task))
-    return result.scalars().all()
+    if (hit := await cache.lookup("tasks:all", ["tasks"])) is not None:
+        return hit
+    stmt = filters.apply(select(*schema_columns(Task, schemas.TaskRead)))
+    return await cache.store(await page.fetch_rows(db, stmt, Task.id), List[schemas.TaskRead])
 
+# Rate limited by RateLimitMiddleware (main.py), before the upload is read
 @router.post("/{task_id}/submit")
 async def submit_task(
     task_id: int,
@@ -72,23 +211,34 @@ async def submit_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(allow_developer)
 ):
-    task = await db.get(Task, task_id)
+    # Project is joined in for the buyer side of the stats counters
+    task = await db.get(Task, task_id, options=[joinedload(Task.project)])
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     if task.assignee_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your task")
+    before = counters.snapshot(task)
     
-    # Save file
-    file_location = f"{settings.UPLOAD_DIR}/{task_id}_{file.filename}"
-    async with aiofiles.open(file_location, 'wb') as out_file:
-        content = await file.read()
-        await out_file.write(content)
-    
+    # Store by content hash; identical ZIPs share one blob
+    key, sha256 = await store_solution(file)
+
     task.time_spent = hours
-    task.solution_file_path = file_location
+    task.solution_file_path = key
+    task.solution_filename = os.path.basename(file.filename or "solution.zip")
+    task.solution_sha256 = sha256
     task.status = TaskStatus.SUBMITTED
-    
+
+    await counters.on_task_changed(db, before, counters.snapshot(task), task.project.owner_id, task.assignee_id)
+    # Inspection and notifications run on the job workers (modules/jobs),
+    # queued in this transaction so they exist iff the submission does
+    enqueue(db, "solution.inspect", {"task_id": task.id, "key": key})
+    enqueue(db, "notify.fanout", {"event": "task.submitted", "task_id": task.id})
     await db.commit()
+    wake()
+    await invalidate(*task_tags(task.project_id, task.project.owner_id, task.assignee_id))
+    await publish(task_event("task.submitted", task.id, task.project_id, task.status, task.project.owner_id, task.assignee_id))
+    # A replaced solution's blob is left to `blobs gc`: deleting it here
+    # would race a concurrent submission of the same file
     return {"message": "Task submitted successfully"}
 
 @router.patch("/{task_id}", response_model=schemas.TaskRead)
@@ -98,11 +248,14 @@ async def update_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(allow_developer)
 ):
-    task = await db.get(Task, task_id)
+    # Project is joined in for the buyer side of the stats counters
+    task = await db.get(Task, task_id, options=[joinedload(Task.project)])
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     if task.assignee_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your task")
+    before = counters.snapshot(task)
+    previous_status = task.status
 
     if payload.status:
         if payload.status not in [TaskStatus.TODO, TaskStatus.IN_PROGRESS]:
@@ -112,29 +265,48 @@ async def update_task(
     if payload.time_spent is not None:
         task.time_spent = payload.time_spent
 
+    await counters.on_task_changed(db, before, counters.snapshot(task), task.project.owner_id, task.assignee_id)
     await db.commit()
+    await invalidate(*task_tags(task.project_id, task.project.owner_id, task.assignee_id))
+    if task.status != previous_status:
+        await publish(task_event("task.updated", task.id, task.project_id, task.status, task.project.owner_id, task.assignee_id))
     await db.refresh(task)
     return task
 
-@router.get("/{task_id}/download")
+# HEAD gives size, ETag and Accept-Ranges, e.g. before resuming a download
+@router.api_route("/{task_id}/download", methods=["GET", "HEAD"])
 async def download_solution(
     task_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(allow_buyer)
 ):
-    task = await db.get(Task, task_id)
-    if not task:
+    # Task, owning buyer and payment date in one round trip
+    row = (await db.execute(
+        select(Task, Project.owner_id, Payment.payment_date)
+        .join(Project, Task.project_id == Project.id)
+        .outerjoin(Payment, Payment.task_id == Task.id)
+        .where(Task.id == task_id)
+    )).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Task not found")
-    
+    task, owner_id, paid_at = row
+
     # Check if buyer owns project
-    project = await db.get(Project, task.project_id)
-    if project.owner_id != current_user.id:
+    if owner_id != current_user.id:
          raise HTTPException(status_code=403, detail="Not your project")
 
     if task.status != TaskStatus.PAID:
         raise HTTPException(status_code=402, detail="Payment required to download solution")
-    
-    # In a real app we would return StreamingResponse or FileResponse
-    # returning path for now or FileResponse
-    from fastapi.responses import FileResponse
-    return FileResponse(task.solution_file_path, filename=os.path.basename(task.solution_file_path), media_type='application/zip')
+    if not task.solution_file_path:
+        raise HTTPException(status_code=404, detail="No solution uploaded")
+
+    # Range / conditional GET aware, see core/downloads.py
+    return await blob_response(
+        request,
+        get_storage(),
+        task.solution_file_path,
+        filename=task.solution_filename or os.path.basename(task.solution_file_path),
+        etag=f'"{task.solution_sha256 or f"task-{task.id}"}"',
+        last_modified=paid_at,
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from app.modules.projects.models import TaskStatus
 
 class TaskBase(BaseModel):
@@ -27,3 +27,25 @@ class TaskRead(TaskBase):
     
     class Config:
         from_attributes = True
+
+class TaskBulkCreate(BaseModel):
+    project_id: int
+    tasks: List[TaskBase]
+
+class TaskBulkStatusUpdate(BaseModel):
+    task_ids: List[int]
+    status: TaskStatus
+
+class BulkItemError(BaseModel):
+    # index into the request list; task_id when the item refers to a task
+    index: int
+    task_id: Optional[int] = None
+    detail: str
+
+class TaskBulkCreateResult(BaseModel):
+    created: List[TaskRead]
+    errors: List[BulkItemError]
+
+class TaskBulkStatusResult(BaseModel):
+    updated: List[int]
+    errors: List[BulkItemError]
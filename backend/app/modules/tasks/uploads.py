@@ -0,0 +1,43 @@
+import hashlib
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.storage import blob_key, get_storage
+from app.core.profiling import phase
+from app.modules.projects.models import Task
+
+async def hash_upload(file: UploadFile) -> tuple[str, int]:
+    # First pass over the spooled upload: only reads, in UPLOAD_CHUNK_SIZE pieces
+    sha256 = hashlib.sha256()
+    size = 0
+    await file.seek(0)
+    while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > settings.MAX_UPLOAD_SIZE_BYTES:
+            raise HTTPException(status_code=413, detail="Solution file too large")
+        sha256.update(chunk)
+    return sha256.hexdigest(), size
+
+async def ensure_blob(key: str, file: UploadFile):
+    # Content addressed: an existing key already holds these exact bytes, so a
+    # repeated submission costs no write at all. Reusing a blob touches it, so
+    # `blobs gc` can't take an orphan this upload is about to reference.
+    storage = get_storage()
+    if not await storage.touch(key):
+        await file.seek(0)
+        await storage.put(key, file.file)
+
+async def store_solution(file: UploadFile) -> tuple[str, str]:
+    with phase("storage"):
+        sha256, _ = await hash_upload(file)
+        key = blob_key(sha256)
+        await ensure_blob(key, file)
+    return key, sha256
+
+async def count_references(db: AsyncSession, key: str) -> int:
+    stmt = select(func.count(Task.id)).where(Task.solution_file_path == key)
+    if key.startswith("sha256/"):
+        # Narrow through the indexed digest column first
+        stmt = stmt.where(Task.solution_sha256 == key.rsplit("/", 1)[-1])
+    return await db.scalar(stmt)
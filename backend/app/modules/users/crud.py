@@ -1,15 +1,32 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.modules.users.models import User
-from app.modules.users.schemas import UserCreate
-from app.core.security import get_password_hash
+from app.modules.users.schemas import UserCreate, UserRead
+from app.core.security import hash_password, verify_and_update_password
+from app.core.pagination import PageParams
+from app.core.cache import invalidate
+from app.core.serialization import schema_columns
+from app.modules.stats import counters
 
 async def get_user_by_email(db: AsyncSession, email: str):
     result = await db.execute(select(User).where(User.email == email))
     return result.scalars().first()
 
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was made
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
+
 async def create_user(db: AsyncSession, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = User(
         email=user.email, 
         hashed_password=hashed_password, 
@@ -17,14 +34,27 @@ async def create_user(db: AsyncSession, user: UserCreate):
         full_name=user.full_name
     )
     db.add(db_user)
+    await db.flush()
+    await counters.on_user_created(db, db_user.id, db_user.role)
     await db.commit()
+    await invalidate("users")
     await db.refresh(db_user)
     return db_user
 
-async def get_users_by_role(db: AsyncSession, role: str):
-    result = await db.execute(select(User).where(User.role == role))
-    return result.scalars().all()
+# The listings return UserRead-shaped row mappings, not User objects
+
+async def get_users_by_role(db: AsyncSession, role: str, page: PageParams | None = None):
+    stmt = select(*schema_columns(User, UserRead)).where(User.role == role)
+    if page is not None:
+        return await page.fetch_rows(db, stmt, User.id)
+    result = await db.execute(stmt)
+    return result.mappings().all()
 
-async def get_all_users(db: AsyncSession):
-    result = await db.execute(select(User))
-    return result.scalars().all()
+async def get_all_users(db: AsyncSession, page: PageParams | None = None, role: str | None = None):
+    stmt = select(*schema_columns(User, UserRead))
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    if page is not None:
+        return await page.fetch_rows(db, stmt, User.id)
+    result = await db.execute(stmt)
+    return result.mappings().all()
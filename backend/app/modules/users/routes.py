@@ -1,6 +1,10 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import PageParams
+from app.core.cache import ResponseCache
+from app.modules.users.models import UserRole
 from app.modules.users import crud, schemas
 from app.modules.auth.deps import get_current_active_user
 
@@ -24,15 +28,25 @@ async def read_users_me(
 
 @router.get("/", response_model=list[schemas.UserRead])
 async def list_users(
-    db: AsyncSession = Depends(get_db),
+    role: Optional[UserRole] = None,
+    page: PageParams = Depends(),
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     # In a real app, restrict this to Admin
 ):
-    return await crud.get_all_users(db)
+    if (hit := await cache.lookup("users:list", ["users"])) is not None:
+        return hit
+    users = await crud.get_all_users(db, page=page, role=role)
+    return await cache.store(users, list[schemas.UserRead])
 
 @router.get("/developers", response_model=list[schemas.UserRead])
 async def list_developers(
-    db: AsyncSession = Depends(get_db)
+    page: PageParams = Depends(),
+    cache: ResponseCache = Depends(),
+    db: AsyncSession = Depends(get_read_db)
     # In a real app, restrict this to Admin/Buyer
 ):
-    from app.modules.users.models import UserRole
-    return await crud.get_users_by_role(db, UserRole.DEVELOPER)
+    if (hit := await cache.lookup("users:developers", ["users"])) is not None:
+        return hit
+    developers = await crud.get_users_by_role(db, UserRole.DEVELOPER, page=page)
+    return await cache.store(developers, list[schemas.UserRead])
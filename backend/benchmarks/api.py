@@ -0,0 +1,243 @@
+"""Load test of the API hot paths, driving the real app in process.
+
+    python -m benchmarks.api [--concurrency 1,8,32] [--requests 200] [--scenarios login,assigned,...]
+                             [--save benchmarks/baseline.json] [--compare benchmarks/baseline.json]
+                             [--tolerance 0.25] [volume options, see benchmarks.seed]
+
+Without DATABASE_URL a throwaway SQLite database is created and seeded; point
+DATABASE_URL at an empty local Postgres database to benchmark that instead.
+Requests go through httpx's ASGITransport straight into app.main:app, so the
+numbers cover the application and database, not a server or the network.
+
+Reports p50/p95/p99 latency and requests/s per scenario and concurrency.
+--save writes them as a baseline; --compare exits non-zero when p95 or
+throughput regress by more than --tolerance against one.
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass, asdict
+
+_tmp = tempfile.mkdtemp(prefix="bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp}/bench.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_tmp, "uploads"))
+# All requests come from one client address; the limiter has its own
+# benchmark (benchmarks.ratelimit)
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from app.main import app
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import create_access_token
+from app.modules.auth.cache import Principal
+from app.modules.auth.deps import token_claims
+from app.modules.users.models import UserRole
+from benchmarks.seed import ADMIN_EMAIL, PASSWORD, Seeded, add_volume_arguments, email_for, seed, volumes_from
+
+P = settings.API_V1_STR
+
+@dataclass
+class Result:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}@{self.concurrency}"
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    # Nearest rank
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+def _bearer(principal: Principal) -> dict:
+    token = create_access_token(subject=principal.email, claims=token_claims(principal))
+    return {"Authorization": f"Bearer {token}"}
+
+class Scenarios:
+    # Each scenario takes the request number and issues one request. Writes
+    # consume seeded tasks, so each submit/pay hits a different task.
+    def __init__(self, client: httpx.AsyncClient, seeded: Seeded):
+        self.client = client
+        self.admin = _bearer(Principal(seeded.admin_id, ADMIN_EMAIL, UserRole.ADMIN))
+        self.buyers = {uid: _bearer(Principal(uid, email_for(UserRole.BUYER, i), UserRole.BUYER)) for i, uid in enumerate(seeded.buyer_ids)}
+        self.developers = {uid: _bearer(Principal(uid, email_for(UserRole.DEVELOPER, i), UserRole.DEVELOPER)) for i, uid in enumerate(seeded.developer_ids)}
+        self.buyer_headers = list(self.buyers.values())
+        self.developer_headers = list(self.developers.values())
+        self.developer_emails = [email_for(UserRole.DEVELOPER, i) for i in range(len(seeded.developer_ids))]
+        self.todo = list(seeded.todo_tasks)
+        self.submitted = list(seeded.submitted_tasks)
+        self.writes = {"submit": self.todo, "pay": self.submitted}
+
+    def available(self, name: str) -> float:
+        pool = self.writes.get(name)
+        return math.inf if pool is None else len(pool)
+
+    async def login(self, i: int) -> httpx.Response:
+        email = self.developer_emails[i % len(self.developer_emails)]
+        return await self.client.post(f"{P}/auth/login", json={"email": email, "password": PASSWORD})
+
+    async def assigned(self, i: int) -> httpx.Response:
+        headers = self.developer_headers[i % len(self.developer_headers)]
+        return await self.client.get(f"{P}/tasks/assigned", headers=headers)
+
+    async def projects(self, i: int) -> httpx.Response:
+        headers = self.buyer_headers[i % len(self.buyer_headers)]
+        return await self.client.get(f"{P}/projects/", headers=headers)
+
+    async def stats(self, i: int) -> httpx.Response:
+        return await self.client.get(f"{P}/stats/", headers=self.admin)
+
+    async def submit(self, i: int) -> httpx.Response:
+        task_id, developer_id = self.todo.pop()
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as z:
+            z.writestr("solution.py", f"# task {task_id}\n" + "print('done')\n" * 200)
+        return await self.client.post(
+            f"{P}/tasks/{task_id}/submit",
+            data={"hours": "3"},
+            files={"file": ("solution.zip", buf.getvalue(), "application/zip")},
+            headers=self.developers[developer_id],
+        )
+
+    async def pay(self, i: int) -> httpx.Response:
+        task_id, owner_id = self.submitted.pop()
+        return await self.client.post(f"{P}/payments/{task_id}", headers=self.buyers[owner_id])
+
+SCENARIOS = ["login", "assigned", "projects", "stats", "submit", "pay"]
+READS = {"assigned", "projects", "stats"}
+
+async def run(scenarios: Scenarios, name: str, requests: int, concurrency: int, warmup: int) -> Result:
+    fn = getattr(scenarios, name)
+    if name in READS:
+        for i in range(warmup):
+            await fn(i)
+
+    latencies: list[float] = []
+    errors = 0
+    numbers = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (i := next(numbers)) < requests:
+            start = time.perf_counter()
+            response = await fn(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return Result(
+        scenario=name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        rps=len(latencies) / wall if wall else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+    )
+
+def compare(results: list[Result], baseline: dict, tolerance: float) -> bool:
+    # True when nothing regressed beyond the tolerance
+    ok = True
+    base = baseline.get("results", {})
+    for r in results:
+        b = base.get(r.key)
+        if b is None:
+            continue
+        slower = r.p95_ms > b["p95_ms"] * (1 + tolerance)
+        fewer = r.rps < b["rps"] * (1 - tolerance)
+        verdict = "REGRESSION" if slower or fewer else "ok"
+        ok = ok and not (slower or fewer)
+        print(f"  {r.key:16s} p95 {b['p95_ms']:8.1f} -> {r.p95_ms:8.1f} ms   rps {b['rps']:8.1f} -> {r.rps:8.1f}   {verdict}")
+    return ok
+
+def environment(volumes) -> dict:
+    return {
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "volumes": asdict(volumes),
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "response_cache": settings.RESPONSE_CACHE_BACKEND,
+    }
+
+async def main(args) -> int:
+    volumes = volumes_from(args)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    names = args.scenarios.split(",")
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        print(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+        return 2
+
+    async with app.router.lifespan_context(app):
+        async with AsyncSessionLocal() as db:
+            seeded = await seed(db, volumes)
+        print(f"{engine.dialect.name}: {volumes.tasks} tasks, {len(seeded.developer_ids)} developers, {len(seeded.buyer_ids)} buyers")
+        print(f"{'scenario':10s} {'conc':>5s} {'n':>6s} {'err':>5s} {'rps':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}")
+        results = []
+        # App exceptions (e.g. SQLite "database is locked" under write
+        # concurrency) come back as 500s and count as errors
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://bench", timeout=None) as client:
+            scenarios = Scenarios(client, seeded)
+            for name in names:
+                for concurrency in levels:
+                    if scenarios.available(name) < args.requests:
+                        print(f"{name:10s} {concurrency:5d}  skipped: not enough seeded tasks left (raise the volumes)")
+                        continue
+                    r = await run(scenarios, name, args.requests, concurrency, args.warmup)
+                    results.append(r)
+                    print(f"{r.scenario:10s} {r.concurrency:5d} {r.requests:6d} {r.errors:5d} {r.rps:9.1f} {r.p50_ms:9.1f} {r.p95_ms:9.1f} {r.p99_ms:9.1f}")
+
+    env = environment(volumes)
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != env:
+            print(f"warning: baseline was recorded with {baseline.get('environment')}")
+        print(f"compared with {args.compare} (tolerance {args.tolerance:.0%}):")
+        if not compare(results, baseline, args.tolerance):
+            status = 1
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": env, "results": {r.key: asdict(r) for r in results}}, f, indent=2)
+            f.write("\n")
+        print(f"baseline saved to {args.save}")
+    await engine.dispose()
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32", help="comma separated levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed requests before each read scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    add_volume_arguments(parser)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,128 @@
+"""Per-request overhead of the rate limiter.
+
+    python -m benchmarks.ratelimit [--keys 100000] [--hits 200000] [--repeat 5]
+                                   [--redis redis://localhost:6379/0]
+
+Times, best of --repeat, in microseconds per request:
+  store.hit            MemoryStore bucket update alone, spread over --keys
+                       clients (so shard eviction runs as it would in a
+                       long-lived worker)
+  dependency           the RateLimit dependency as FastAPI calls it: store
+                       hit plus RateLimit-* headers on the response
+  route                a trivial route through the ASGI stack: bare, with
+                       a no-op dependency of the same signature, and with
+                       the limit; the last difference is the limiter's own
+                       end-to-end cost, the rest is FastAPI's dependency
+                       resolution
+With --redis the RedisStore is timed too (one round trip per hit).
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from fastapi import Depends, FastAPI, Request, Response
+from app.modules.auth.ratelimit import MemoryStore, RateLimit, RedisStore
+
+# Generous enough that every timed hit is allowed
+LIMIT, PERIOD = 10**9, 60.0
+
+class _Request:
+    # What RateLimit reads from a starlette Request
+    class client:
+        host = "203.0.113.7"
+
+async def best_of(repeat: int, n: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - start)
+    return best / n * 1e6
+
+async def time_store(store, keys: list[str], hits: int, repeat: int) -> float:
+    async def run():
+        for i in range(hits):
+            await store.hit(keys[i % len(keys)], LIMIT, PERIOD)
+    return await best_of(repeat, hits, run)
+
+async def time_dependency(hits: int, repeat: int) -> float:
+    limit = RateLimit("bench", f"{LIMIT}/minute")
+    request = _Request()
+
+    async def run():
+        for _ in range(hits):
+            await limit(request, Response())
+    return await best_of(repeat, hits, run)
+
+async def time_routes(requests: int, repeat: int) -> list[float]:
+    # One app per variant, each with a single route, so route matching costs
+    # the same for all of them
+    async def noop(request: Request, response: Response):
+        pass
+
+    apps = []
+    for dependencies in ([], [Depends(noop)], [Depends(RateLimit("bench-route", f"{LIMIT}/minute"))]):
+        app = FastAPI()
+
+        @app.get("/", dependencies=dependencies)
+        async def route():
+            return {"ok": True}
+
+        apps.append(app)
+
+    # Straight into the ASGI app, no HTTP client: only server-side work is
+    # timed, and the variants are interleaved so drift hits them all alike
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    def scope(path: str) -> dict:
+        return {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": b"", "headers": [(b"host", b"bench")],
+            "client": ("203.0.113.7", 50000), "server": ("bench", 80),
+        }
+
+    request_scope = scope("/")
+    best = [float("inf")] * len(apps)
+    for _ in range(repeat):
+        for i, app in enumerate(apps):
+            start = time.perf_counter()
+            for _ in range(requests):
+                await app(dict(request_scope), receive, send)
+            best[i] = min(best[i], (time.perf_counter() - start) / requests * 1e6)
+    return best
+
+async def main(keys: int, hits: int, repeat: int, redis_url: str | None):
+    names = [f"bench:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(keys)]
+    store = MemoryStore()
+    print(f"{hits} hits over {keys} keys, best of {repeat}")
+    print(f"  {'memory store.hit':22s} {await time_store(store, names, hits, repeat):8.2f} us  ({len(store)} buckets held)")
+    print(f"  {'dependency':22s} {await time_dependency(hits, repeat):8.2f} us")
+    requests = min(hits, 20000)
+    plain, noop, limited = await time_routes(requests, repeat)
+    print(f"  {'route':22s} {plain:8.2f} us")
+    print(f"  {'route + no-op dep':22s} {noop:8.2f} us  (+{noop - plain:.2f} us)")
+    print(f"  {'route + limit':22s} {limited:8.2f} us  (+{limited - plain:.2f} us, {limited - noop:+.2f} us over no-op)")
+    if redis_url:
+        redis_store = RedisStore(redis_url, "rl-bench:")
+        redis_hits = min(hits, 10000)
+        print(f"  {'redis store.hit':22s} {await time_store(redis_store, names, redis_hits, repeat):8.2f} us")
+        await redis_store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--hits", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--redis", default=None, help="also time RedisStore against this server")
+    args = parser.parse_args()
+    asyncio.run(main(args.keys, args.hits, args.repeat, args.redis))
@@ -0,0 +1,148 @@
+"""Seed a database with benchmark data.
+
+    python -m benchmarks.seed [--buyers 20] [--developers 50] [--projects-per-buyer 5] [--tasks-per-project 40]
+
+Targets DATABASE_URL, which must point at a migrated, empty database (a
+scratch SQLite file or local Postgres). Every account gets the password
+PASSWORD. Task statuses cycle 40% todo, 10% in progress, 20% submitted and
+30% paid, and paid tasks get a payment row. The stats rollups are rebuilt
+afterwards.
+"""
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import get_password_hash
+from app.modules.users.models import User, UserRole
+from app.modules.projects.models import Project, Task, TaskStatus
+from app.modules.payments.models import Payment
+from app.modules.stats.reconcile import reconcile
+
+PASSWORD = "bench-password"
+ADMIN_EMAIL = "admin@bench.io"
+
+# Status of task i is _STATUS_CYCLE[i % 10]
+_STATUS_CYCLE = [TaskStatus.TODO] * 4 + [TaskStatus.IN_PROGRESS] + [TaskStatus.SUBMITTED] * 2 + [TaskStatus.PAID] * 3
+_CHUNK = 5000
+
+@dataclass
+class Volumes:
+    buyers: int = 20
+    developers: int = 50
+    projects_per_buyer: int = 5
+    tasks_per_project: int = 40
+
+    @property
+    def tasks(self) -> int:
+        return self.buyers * self.projects_per_buyer * self.tasks_per_project
+
+@dataclass
+class Seeded:
+    admin_id: int = 0
+    buyer_ids: list[int] = field(default_factory=list)
+    developer_ids: list[int] = field(default_factory=list)
+    # (task_id, assignee_id) of TODO tasks, for submit scenarios
+    todo_tasks: list[tuple[int, int]] = field(default_factory=list)
+    # (task_id, owner_id) of SUBMITTED tasks, for pay scenarios
+    submitted_tasks: list[tuple[int, int]] = field(default_factory=list)
+
+def email_for(role: UserRole, index: int) -> str:
+    return f"{role.value}{index}@bench.io"
+
+async def _insert_returning(db: AsyncSession, model, columns, rows: list[dict]) -> list:
+    out = []
+    for i in range(0, len(rows), _CHUNK):
+        out.extend((await db.execute(insert(model).returning(*columns), rows[i:i + _CHUNK])).all())
+    return out
+
+async def seed(db: AsyncSession, volumes: Volumes, rng_seed: int = 42) -> Seeded:
+    rng = random.Random(rng_seed)
+    # One bcrypt hash shared by every account keeps seeding fast
+    hashed = get_password_hash(PASSWORD)
+    seeded = Seeded()
+
+    users = [{"email": ADMIN_EMAIL, "hashed_password": hashed, "role": UserRole.ADMIN, "full_name": "Admin"}]
+    users += [{"email": email_for(UserRole.BUYER, i), "hashed_password": hashed, "role": UserRole.BUYER, "full_name": f"Buyer {i}"} for i in range(volumes.buyers)]
+    users += [{"email": email_for(UserRole.DEVELOPER, i), "hashed_password": hashed, "role": UserRole.DEVELOPER, "full_name": f"Developer {i}"} for i in range(volumes.developers)]
+    for user_id, role in await _insert_returning(db, User, [User.id, User.role], users):
+        if role == UserRole.ADMIN:
+            seeded.admin_id = user_id
+        elif role == UserRole.BUYER:
+            seeded.buyer_ids.append(user_id)
+        else:
+            seeded.developer_ids.append(user_id)
+
+    start = datetime.utcnow() - timedelta(days=90)
+    projects = [
+        {"title": f"Project {b}-{p}", "description": "Benchmark project", "owner_id": buyer_id, "created_at": start + timedelta(hours=b * volumes.projects_per_buyer + p)}
+        for b, buyer_id in enumerate(seeded.buyer_ids)
+        for p in range(volumes.projects_per_buyer)
+    ]
+    project_rows = await _insert_returning(db, Project, [Project.id, Project.owner_id, Project.created_at], projects)
+
+    tasks, i = [], 0
+    for project_id, owner_id, created_at in project_rows:
+        for _ in range(volumes.tasks_per_project):
+            status = _STATUS_CYCLE[i % len(_STATUS_CYCLE)]
+            tasks.append({
+                "title": f"Task {i}",
+                "description": "Implement the feature, add tests and document it.",
+                "hourly_rate": float(rng.randint(10, 120)),
+                "status": status,
+                "time_spent": float(rng.randint(1, 40)) if status in (TaskStatus.SUBMITTED, TaskStatus.PAID) else None,
+                "project_id": project_id,
+                "assignee_id": seeded.developer_ids[i % len(seeded.developer_ids)],
+                "created_at": created_at,
+            })
+            i += 1
+    owners = {project_id: owner_id for project_id, owner_id, _ in project_rows}
+    task_rows = await _insert_returning(
+        db, Task, [Task.id, Task.status, Task.assignee_id, Task.project_id, Task.hourly_rate, Task.time_spent], tasks
+    )
+
+    payments = []
+    for task_id, status, assignee_id, project_id, rate, hours in task_rows:
+        if status == TaskStatus.TODO:
+            seeded.todo_tasks.append((task_id, assignee_id))
+        elif status == TaskStatus.SUBMITTED:
+            seeded.submitted_tasks.append((task_id, owners[project_id]))
+        elif status == TaskStatus.PAID:
+            payments.append({"task_id": task_id, "amount": rate * hours, "payment_date": start + timedelta(minutes=task_id)})
+    for i in range(0, len(payments), _CHUNK):
+        await db.execute(insert(Payment), payments[i:i + _CHUNK])
+    await db.commit()
+
+    # Rollup tables (stats/counters.py) from the rows just written
+    await reconcile(db, fix=True)
+    return seeded
+
+async def main(volumes: Volumes):
+    from app.core.database import AsyncSessionLocal, engine
+    from app.core.migrations import run_migrations
+
+    await run_migrations(engine)
+    async with AsyncSessionLocal() as db:
+        seeded = await seed(db, volumes)
+    print(
+        f"seeded {len(seeded.buyer_ids)} buyers, {len(seeded.developer_ids)} developers, "
+        f"{len(seeded.buyer_ids) * volumes.projects_per_buyer} projects, {volumes.tasks} tasks"
+    )
+    await engine.dispose()
+
+def add_volume_arguments(parser: argparse.ArgumentParser):
+    defaults = Volumes()
+    parser.add_argument("--buyers", type=int, default=defaults.buyers)
+    parser.add_argument("--developers", type=int, default=defaults.developers)
+    parser.add_argument("--projects-per-buyer", type=int, default=defaults.projects_per_buyer)
+    parser.add_argument("--tasks-per-project", type=int, default=defaults.tasks_per_project)
+
+def volumes_from(args: argparse.Namespace) -> Volumes:
+    return Volumes(args.buyers, args.developers, args.projects_per_buyer, args.tasks_per_project)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_volume_arguments(parser)
+    asyncio.run(main(volumes_from(parser.parse_args())))
@@ -0,0 +1,99 @@
+"""Serialization throughput of a large task listing.
+
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+
+Seeds a throwaway SQLite database and times query + JSON encoding of every
+task for:
+  orm+response_model   ORM objects, validated and encoded the way FastAPI's
+                       response_model path does (jsonable_encoder + json)
+  orm+adapter          ORM objects through a cached TypeAdapter.dump_json
+  rows+orjson          schema columns as row mappings straight to orjson
+                       (what the list endpoints do, core/serialization.py)
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp}/bench.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("UPLOAD_DIR", _tmp)
+
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, insert
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.core.serialization import adapter, dump_json, schema_columns
+import app.migrations  # noqa: F401  (registers every model)
+from app.modules.projects.models import Project, Task, TaskStatus
+from app.modules.tasks.schemas import TaskRead
+from app.modules.users.models import User, UserRole
+
+async def seed(rows: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        buyer = User(email="buyer@bench.io", hashed_password="x", role=UserRole.BUYER)
+        developer = User(email="dev@bench.io", hashed_password="x", role=UserRole.DEVELOPER)
+        db.add_all([buyer, developer])
+        await db.flush()
+        project = Project(title="bench", description="bench", owner_id=buyer.id)
+        db.add(project)
+        await db.flush()
+        statuses = list(TaskStatus)
+        await db.execute(insert(Task), [
+            {
+                "title": f"Task {i}",
+                "description": "Implement the thing and write it up " * 2,
+                "hourly_rate": 10.0 + i % 50,
+                "time_spent": float(i % 8) if i % 3 else None,
+                "status": statuses[i % len(statuses)],
+                "project_id": project.id,
+                "assignee_id": developer.id,
+            }
+            for i in range(rows)
+        ])
+        await db.commit()
+
+async def orm_response_model(db) -> bytes:
+    tasks = (await db.scalars(select(Task))).all()
+    ta = adapter(List[TaskRead])
+    content = ta.dump_python(ta.validate_python(tasks, from_attributes=True), mode="json")
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode()
+
+async def orm_adapter(db) -> bytes:
+    tasks = (await db.scalars(select(Task))).all()
+    ta = adapter(List[TaskRead])
+    return ta.dump_json(ta.validate_python(tasks, from_attributes=True))
+
+async def rows_orjson(db) -> bytes:
+    rows = (await db.execute(select(*schema_columns(Task, TaskRead)))).mappings().all()
+    return dump_json(list(rows), List[TaskRead])
+
+async def main(rows: int, repeat: int):
+    await seed(rows)
+    results = {}
+    print(f"{rows} tasks, best of {repeat}")
+    for name, fn in [("orm+response_model", orm_response_model), ("orm+adapter", orm_adapter), ("rows+orjson", rows_orjson)]:
+        best = float("inf")
+        for _ in range(repeat):
+            async with AsyncSessionLocal() as db:
+                start = time.perf_counter()
+                body = await fn(db)
+                best = min(best, time.perf_counter() - start)
+        results[name] = (best, body)
+        print(f"  {name:20s} {best * 1000:8.1f} ms  {rows / best:10.0f} rows/s  {len(body)} bytes")
+    base = results["orm+response_model"][0]
+    print(f"  rows+orjson is {base / results['rows+orjson'][0]:.1f}x the response_model path")
+    assert json.loads(results["rows+orjson"][1]) == json.loads(results["orm+response_model"][1])
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,76 @@
+"""Cold start time of the API process per SCHEMA_MODE.
+
+    python -m benchmarks.startup [--runs 5] [--modes migrate,check,skip]
+
+Every run is a fresh interpreter that imports app.main and runs its lifespan
+startup against an already migrated database, which is what a restarted or
+newly scaled-out pod does. Reports the median of --runs for:
+  process     spawn to the end of startup, interpreter start included
+  import      import of app.main (routers, models, settings)
+  lifespan    database wait + schema step + job worker start, with the
+              phases the app records in startup_phase_seconds
+
+Without DATABASE_URL a throwaway SQLite database is created and migrated;
+point DATABASE_URL at an existing local Postgres database to measure that.
+The in-process job worker is off so it does not start polling mid-run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp(prefix="bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp}/bench.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("JOB_WORKER_IN_PROCESS", "false")
+
+_CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+async def boot():
+    async with main.lifespan(main.app):
+        return time.perf_counter()
+ready = asyncio.run(boot())
+# Older trees have no phase timings; the totals still compare
+phases = dict(main.readiness.phases) if hasattr(main, "readiness") else {}
+print(json.dumps({"import": imported - started, "lifespan": ready - imported, "phases": phases}))
+"""
+
+def boot(mode: str) -> dict:
+    env = {**os.environ, "SCHEMA_MODE": mode}
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - started
+    return result
+
+def median_ms(values: list[float]) -> float:
+    return statistics.median(values) * 1000
+
+def main(runs: int, modes: list[str]):
+    subprocess.run([sys.executable, "-m", "app.core.migrations"], check=True, capture_output=True)
+    print(f"median of {runs} cold starts")
+    for mode in modes:
+        boot(mode)  # warm the OS file cache
+        results = [boot(mode) for _ in range(runs)]
+        phases = {name: median_ms([r["phases"].get(name, 0.0) for r in results]) for name in results[0]["phases"]}
+        detail = "  ".join(f"{name} {ms:.1f}" for name, ms in phases.items() if name not in ("import", "lifespan"))
+        print(
+            f"  {mode:8s} process {median_ms([r['process'] for r in results]):7.0f} ms"
+            f"  import {median_ms([r['import'] for r in results]):7.0f} ms"
+            f"  lifespan {median_ms([r['lifespan'] for r in results]):6.1f} ms  ({detail})"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", default="migrate,check,skip")
+    args = parser.parse_args()
+    main(args.runs, args.modes.split(","))
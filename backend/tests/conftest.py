@@ -0,0 +1,93 @@
+import io
+import itertools
+import os
+import tempfile
+import zipfile
+
+# Settings are read at import time: point the app at a throwaway SQLite
+# database (or TEST_DATABASE_URL, an empty PostgreSQL database) first
+_tmp = tempfile.mkdtemp(prefix="tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite+aiosqlite:///{_tmp}/test.db")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp, "uploads")
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["JOB_WORKER_IN_PROCESS"] = "false"
+
+import httpx
+import pytest
+from app.main import app
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+P = settings.API_V1_STR
+_emails = itertools.count()
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+async def client():
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+
+@pytest.fixture
+async def db(client):
+    async with AsyncSessionLocal() as session:
+        yield session
+
+@pytest.fixture
+def register(client):
+    # register("buyer") -> (auth headers, user id) of a new user
+    async def register(role: str) -> tuple[dict, int]:
+        email = f"{role}{next(_emails)}@test.io"
+        r = await client.post(f"{P}/auth/register", json={"email": email, "password": "pw", "role": role})
+        assert r.status_code == 200, r.text
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        me = await client.get(f"{P}/users/me", headers=headers)
+        return headers, me.json()["id"]
+    return register
+
+@pytest.fixture
+def project_with_tasks(client, register):
+    # A buyer's project with n tasks assigned to a new developer
+    async def create(n: int) -> dict:
+        buyer, _ = await register("buyer")
+        developer, developer_id = await register("developer")
+        r = await client.post(f"{P}/projects/", json={"title": "p", "description": "d"}, headers=buyer)
+        assert r.status_code == 200, r.text
+        project_id = r.json()["id"]
+        task_ids = []
+        if n:
+            r = await client.post(f"{P}/tasks/bulk", json={"project_id": project_id, "tasks": [
+                {"title": f"t{i}", "description": "d", "hourly_rate": 10, "assignee_id": developer_id}
+                for i in range(n)
+            ]}, headers=buyer)
+            assert r.status_code == 200, r.text
+            task_ids = [t["id"] for t in r.json()["created"]]
+        return {
+            "buyer": buyer,
+            "developer": developer,
+            "developer_id": developer_id,
+            "project_id": project_id,
+            "task_ids": task_ids,
+        }
+    return create
+
+@pytest.fixture
+def submit(client):
+    # Submit a solution ZIP for a task as its developer
+    async def submit(headers: dict, task_id: int, hours: float = 2, content: bytes = b"print(1)"):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("main.py", content)
+        r = await client.post(
+            f"{P}/tasks/{task_id}/submit",
+            data={"hours": str(hours)},
+            files={"file": ("solution.zip", buf.getvalue(), "application/zip")},
+            headers=headers,
+        )
+        assert r.status_code == 200, r.text
+    return submit
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.core.storage import get_storage
+from app.modules.projects.models import Task
+from app.modules.tasks import blobs
+from app.modules.tasks.blobs import collect_garbage
+
+pytestmark = pytest.mark.anyio
+
+async def test_resubmission_leaves_old_blob_to_gc(db, project_with_tasks, submit, monkeypatch):
+    data = await project_with_tasks(1)
+    task_id = data["task_ids"][0]
+    await submit(data["developer"], task_id, content=b"first version")
+    old_key = (await db.get(Task, task_id)).solution_file_path
+    await submit(data["developer"], task_id, content=b"second version")
+    db.expire_all()
+    new_key = (await db.get(Task, task_id)).solution_file_path
+    assert new_key != old_key
+
+    storage = get_storage()
+    assert await storage.exists(old_key)
+    # Within the grace period the orphan stays
+    await collect_garbage()
+    assert await storage.exists(old_key)
+
+    monkeypatch.setattr(settings, "BLOB_GC_GRACE_SECONDS", -1)
+    assert await collect_garbage() >= 1
+    assert not await storage.exists(old_key)
+    assert await storage.exists(new_key)
+
+async def test_gc_keeps_blob_reused_after_listing(project_with_tasks, submit, monkeypatch):
+    # The blob is listed as an old orphan, then reused by a submission before
+    # gc gets to it
+    data = await project_with_tasks(1)
+    await submit(data["developer"], data["task_ids"][0], content=b"listed then reused")
+    storage = get_storage()
+    monkeypatch.setattr(settings, "BLOB_GC_GRACE_SECONDS", 60)
+    old = datetime.utcnow() - timedelta(hours=1)
+    entries = storage.entries
+
+    async def listed_as_old():
+        async for key, _ in entries():
+            yield key, old
+    monkeypatch.setattr(storage, "entries", listed_as_old)
+
+    async def orphan(db, key):
+        return 0
+    monkeypatch.setattr(blobs, "count_references", orphan)
+    assert await collect_garbage() == 0
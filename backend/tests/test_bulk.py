@@ -0,0 +1,67 @@
+import pytest
+from app.core.config import settings
+from tests.conftest import P
+
+pytestmark = pytest.mark.anyio
+
+async def test_create_partial_failure(client, register, project_with_tasks):
+    data = await project_with_tasks(0)
+    _, buyer_id = await register("buyer")
+    tasks = [
+        {"title": "ok", "description": "d", "hourly_rate": 10, "assignee_id": data["developer_id"]},
+        {"title": "buyer", "description": "d", "hourly_rate": 10, "assignee_id": buyer_id},
+        {"title": "missing", "description": "d", "hourly_rate": 10, "assignee_id": 10**9},
+    ]
+    r = await client.post(f"{P}/tasks/bulk", json={"project_id": data["project_id"], "tasks": tasks}, headers=data["buyer"])
+    assert r.status_code == 200
+    body = r.json()
+    assert [t["title"] for t in body["created"]] == ["ok"]
+    assert [(e["index"], e["detail"]) for e in body["errors"]] == [
+        (1, "Assignee not found or not a developer"),
+        (2, "Assignee not found or not a developer"),
+    ]
+    r = await client.get(f"{P}/projects/{data['project_id']}/tasks", headers=data["buyer"])
+    assert [t["title"] for t in r.json()] == ["ok"]
+
+async def test_create_other_buyers_project(client, register, project_with_tasks):
+    data = await project_with_tasks(0)
+    other, _ = await register("buyer")
+    task = {"title": "t", "description": "d", "hourly_rate": 10, "assignee_id": data["developer_id"]}
+    r = await client.post(f"{P}/tasks/bulk", json={"project_id": data["project_id"], "tasks": [task]}, headers=other)
+    assert r.status_code == 403
+
+async def test_create_size_limits(client, project_with_tasks):
+    data = await project_with_tasks(0)
+    task = {"title": "t", "description": "d", "hourly_rate": 10, "assignee_id": data["developer_id"]}
+    r = await client.post(f"{P}/tasks/bulk", json={"project_id": data["project_id"], "tasks": []}, headers=data["buyer"])
+    assert r.status_code == 400
+    tasks = [task] * (settings.BULK_MAX_ITEMS + 1)
+    r = await client.post(f"{P}/tasks/bulk", json={"project_id": data["project_id"], "tasks": tasks}, headers=data["buyer"])
+    assert r.status_code == 413
+
+async def test_status_partial_failure(client, project_with_tasks):
+    data = await project_with_tasks(3)
+    other = await project_with_tasks(1)
+    first, second, third = data["task_ids"]
+    r = await client.patch(f"{P}/tasks/bulk", json={"task_ids": [first], "status": "in_progress"}, headers=data["developer"])
+    assert r.json()["updated"] == [first]
+
+    task_ids = [first, second, other["task_ids"][0], 10**9, third]
+    r = await client.patch(f"{P}/tasks/bulk", json={"task_ids": task_ids, "status": "in_progress"}, headers=data["developer"])
+    assert r.status_code == 200
+    body = r.json()
+    assert sorted(body["updated"]) == [second, third]
+    assert [(e["index"], e["task_id"], e["detail"]) for e in body["errors"]] == [
+        (0, first, "Task already in_progress"),
+        (2, other["task_ids"][0], "Not your task"),
+        (3, 10**9, "Task not found"),
+    ]
+    r = await client.get(f"{P}/tasks/assigned", params={"status": "in_progress"}, headers=data["developer"])
+    assert sorted(t["id"] for t in r.json()) == [first, second, third]
+    r = await client.get(f"{P}/tasks/assigned", params={"status": "in_progress"}, headers=other["developer"])
+    assert r.json() == []
+
+async def test_status_rejects_terminal_status(client, project_with_tasks):
+    data = await project_with_tasks(1)
+    r = await client.patch(f"{P}/tasks/bulk", json={"task_ids": data["task_ids"], "status": "paid"}, headers=data["developer"])
+    assert r.status_code == 400
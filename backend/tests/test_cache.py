@@ -0,0 +1,37 @@
+import pytest
+from fastapi import Request, Response
+from app.core.cache import MemoryCache, ResponseCache
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+def _cache(backend: MemoryCache, replica: bool) -> ResponseCache:
+    request = Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []})
+    request.state.replica_read = replica
+    cache = ResponseCache(request, Response())
+    cache.backend = backend
+    return cache
+
+async def _cached(backend: MemoryCache, replica: bool) -> bool:
+    # Miss, store, then look again
+    cache = _cache(backend, replica)
+    assert await cache.lookup("things", ["thing:1"]) is None
+    await cache.store([1, 2], list[int])
+    return await _cache(backend, replica).lookup("things", ["thing:1"]) is not None
+
+async def test_primary_reads_are_cached_after_a_write():
+    backend = MemoryCache(100)
+    await backend.bump(["thing:1"])
+    assert await _cached(backend, replica=False)
+
+async def test_replica_reads_right_after_a_write_are_not_cached():
+    backend = MemoryCache(100)
+    await backend.bump(["thing:1"])
+    assert not await _cached(backend, replica=True)
+
+async def test_replica_reads_are_cached_outside_the_lag_window(monkeypatch):
+    backend = MemoryCache(100)
+    assert await _cached(backend, replica=True)  # never written
+    await backend.bump(["thing:1"])
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0)
+    assert await _cached(backend, replica=True)
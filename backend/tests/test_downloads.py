@@ -0,0 +1,33 @@
+import pytest
+from tests.conftest import P
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def paid(client, project_with_tasks, submit):
+    data = await project_with_tasks(1)
+    task_id = data["task_ids"][0]
+    await submit(data["developer"], task_id)
+    r = await client.post(f"{P}/payments/{task_id}", headers=data["buyer"])
+    assert r.status_code == 200, r.text
+    return data["buyer"], f"{P}/tasks/{task_id}/download"
+
+async def test_head(client, paid):
+    headers, url = paid
+    full = await client.get(url, headers=headers)
+    assert full.status_code == 200
+    r = await client.head(url, headers=headers)
+    assert r.status_code == 200
+    assert r.content == b""
+    assert r.headers["content-length"] == str(len(full.content))
+    assert r.headers["etag"] == full.headers["etag"]
+    assert r.headers["accept-ranges"] == "bytes"
+
+async def test_range_and_conditional(client, paid):
+    headers, url = paid
+    full = await client.get(url, headers=headers)
+    r = await client.get(url, headers={**headers, "Range": "bytes=2-9"})
+    assert r.status_code == 206
+    assert r.content == full.content[2:10]
+    r = await client.get(url, headers={**headers, "If-None-Match": full.headers["etag"]})
+    assert r.status_code == 304
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from sqlalchemy import func, select
+from app.modules.payments.models import IdempotencyKey, Payment
+from tests.conftest import P
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def submitted(project_with_tasks, submit):
+    data = await project_with_tasks(2)
+    for task_id in data["task_ids"]:
+        await submit(data["developer"], task_id)
+    return data
+
+async def _payments(db, task_ids) -> int:
+    return await db.scalar(select(func.count(Payment.id)).where(Payment.task_id.in_(task_ids)))
+
+async def test_replay(client, db, submitted):
+    headers = {**submitted["buyer"], "Idempotency-Key": "replay-1"}
+    body = {"task_ids": submitted["task_ids"]}
+    first = await client.post(f"{P}/payments/batch", json=body, headers=headers)
+    assert first.status_code == 200
+    assert first.json()["total_amount"] == 40
+    assert "idempotent-replayed" not in first.headers
+
+    again = await client.post(f"{P}/payments/batch", json=body, headers=headers)
+    assert again.status_code == 200
+    assert again.headers["idempotent-replayed"] == "true"
+    assert again.json() == first.json()
+    assert await _payments(db, submitted["task_ids"]) == 2
+
+async def test_key_reused_with_different_body(client, submitted):
+    headers = {**submitted["buyer"], "Idempotency-Key": "reuse-1"}
+    r = await client.post(f"{P}/payments/batch", json={"task_ids": submitted["task_ids"][:1]}, headers=headers)
+    assert r.status_code == 200
+    r = await client.post(f"{P}/payments/batch", json={"task_ids": submitted["task_ids"]}, headers=headers)
+    assert r.status_code == 422
+
+async def test_keys_are_per_user(client, register, submitted):
+    other, _ = await register("buyer")
+    body = {"task_ids": submitted["task_ids"]}
+    r = await client.post(f"{P}/payments/batch", json=body, headers={**other, "Idempotency-Key": "shared"})
+    assert r.status_code == 200
+    assert r.json()["paid"] == []
+    r = await client.post(f"{P}/payments/batch", json=body, headers={**submitted["buyer"], "Idempotency-Key": "shared"})
+    assert "idempotent-replayed" not in r.headers
+    assert len(r.json()["paid"]) == 2
+
+async def test_concurrent_duplicates_pay_once(client, db, submitted):
+    headers = {**submitted["buyer"], "Idempotency-Key": "race-1"}
+    body = {"project_id": submitted["project_id"]}
+    responses = await asyncio.gather(*(
+        client.post(f"{P}/payments/batch", json=body, headers=headers) for _ in range(4)
+    ))
+    ok = [r for r in responses if r.status_code == 200]
+    assert ok and all(r.status_code in (200, 409) for r in responses)
+    # Every 200 is the one settlement: the winner's or a replay of it
+    assert all(r.json() == ok[0].json() for r in ok)
+    assert len(ok[0].json()["paid"]) == 2
+    assert await _payments(db, submitted["task_ids"]) == 2
+    record = await db.scalar(select(IdempotencyKey).where(IdempotencyKey.key == "race-1"))
+    assert record.status_code == 200 and record.response == ok[0].json()
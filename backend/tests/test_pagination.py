@@ -0,0 +1,39 @@
+import pytest
+from tests.conftest import P
+
+pytestmark = pytest.mark.anyio
+
+async def test_full_list_without_limit(client, project_with_tasks):
+    # Existing clients don't follow cursors: no silent cap
+    data = await project_with_tasks(105)
+    r = await client.get(f"{P}/projects/{data['project_id']}/tasks", headers=data["buyer"])
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()] == sorted(data["task_ids"])
+    assert "x-next-cursor" not in r.headers
+
+async def test_cursor_pages(client, project_with_tasks):
+    data = await project_with_tasks(25)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10} if cursor is None else {"limit": 10, "cursor": cursor}
+        r = await client.get(f"{P}/tasks/assigned", params=params, headers=data["developer"])
+        assert r.status_code == 200
+        page = [t["id"] for t in r.json()]
+        assert len(page) <= 10
+        seen += page
+        cursor = r.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        assert 'rel="next"' in r.headers["link"]
+    assert seen == sorted(data["task_ids"])
+
+async def test_cursor_without_limit_uses_default_page(client, project_with_tasks):
+    data = await project_with_tasks(3)
+    r = await client.get(f"{P}/tasks/assigned", params={"limit": 1}, headers=data["developer"])
+    r = await client.get(f"{P}/tasks/assigned", params={"cursor": r.headers["x-next-cursor"]}, headers=data["developer"])
+    assert [t["id"] for t in r.json()] == sorted(data["task_ids"])[1:]
+
+async def test_invalid_cursor(client, register):
+    buyer, _ = await register("buyer")
+    r = await client.get(f"{P}/projects/", params={"cursor": "not-a-cursor"}, headers=buyer)
+    assert r.status_code == 400
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import func, select
+from app.modules.payments.models import Payment
+from tests.conftest import P
+
+pytestmark = pytest.mark.anyio
+
+async def test_batch_skips_resubmitted_paid_task(client, db, project_with_tasks, submit):
+    data = await project_with_tasks(2)
+    first, second = data["task_ids"]
+    await submit(data["developer"], first)
+    r = await client.post(f"{P}/payments/batch", json={"project_id": data["project_id"]}, headers=data["buyer"])
+    assert [p["task_id"] for p in r.json()["paid"]] == [first]
+
+    # Back to SUBMITTED with its payment row still there
+    await submit(data["developer"], first, content=b"fix")
+    await submit(data["developer"], second)
+    r = await client.post(f"{P}/payments/batch", json={"project_id": data["project_id"]}, headers=data["buyer"])
+    assert r.status_code == 200, r.text
+    assert [p["task_id"] for p in r.json()["paid"]] == [second]
+    assert r.json()["skipped"] == [{"task_id": first, "detail": "Already paid"}]
+
+    r = await client.post(f"{P}/payments/batch", json={"task_ids": [first]}, headers=data["buyer"])
+    assert r.status_code == 200
+    assert r.json()["skipped"] == [{"task_id": first, "detail": "Already paid"}]
+    assert await db.scalar(select(func.count(Payment.id)).where(Payment.task_id == first)) == 1
+
+async def test_batch_by_task_ids_explains_skips(client, register, project_with_tasks, submit):
+    data = await project_with_tasks(2)
+    other = await project_with_tasks(1)
+    ready, todo = data["task_ids"]
+    await submit(data["developer"], ready)
+    task_ids = [ready, todo, other["task_ids"][0], 10**9]
+    r = await client.post(f"{P}/payments/batch", json={"task_ids": task_ids}, headers=data["buyer"])
+    assert r.status_code == 200
+    assert r.json()["paid"] == [{"task_id": ready, "amount": 20}]
+    assert r.json()["skipped"] == [
+        {"task_id": todo, "detail": "Task not ready for payment or already paid"},
+        {"task_id": other["task_ids"][0], "detail": "Not your project"},
+        {"task_id": 10**9, "detail": "Task not found"},
+    ]
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import insert, select, text
+from app.modules.projects.models import Project, Task, TaskStatus
+from app.modules.tasks.filters import TaskFilters
+from app.modules.users.models import User, UserRole
+
+# The hot listing queries must be index range scans in id order (migration
+# v0002), shaped the way the routes build them: equality filters from
+# TaskFilters, then the keyset page (id > :cursor ORDER BY id LIMIT n+1).
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def analyzed(db):
+    # Planner statistics for a table shaped like production: many tasks, few
+    # awaiting payment. Without them SQLite can't tell the partial index is
+    # the smaller one. All of it rolls back with the session.
+    owner = await db.scalar(insert(User).values(email="plans@test.io", hashed_password="x", role=UserRole.BUYER).returning(User.id))
+    projects = [
+        await db.scalar(insert(Project).values(title="p", description="d", owner_id=owner).returning(Project.id))
+        for _ in range(10)
+    ]
+    statuses = [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.PAID] * 16 + [TaskStatus.SUBMITTED]
+    await db.execute(insert(Task), [
+        {"title": "t", "description": "d", "hourly_rate": 1, "status": statuses[i % len(statuses)],
+         "project_id": projects[i % len(projects)], "assignee_id": owner}
+        for i in range(2000)
+    ])
+    await db.execute(text("ANALYZE"))
+    return db
+
+def _filters(**values) -> TaskFilters:
+    return TaskFilters(**{"status": None, "project": None, "assignee_id": None, "min_rate": None, "max_rate": None, **values})
+
+def _page(stmt, key):
+    return stmt.where(key > 0).order_by(key).limit(101)
+
+async def plan(db, stmt) -> str:
+    dialect = db.bind.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "postgresql":
+        # Test tables are tiny; make the planner show what it would pick at size
+        await db.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = await db.execute(text(f"EXPLAIN {sql}"))
+        return "\n".join(row[0] for row in rows)
+    rows = await db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return "\n".join(row[-1] for row in rows)
+
+@pytest.mark.parametrize("stmt, index", [
+    (
+        _page(select(Project.id, Project.title).where(Project.owner_id == 1), Project.id),
+        "ix_projects_owner_id_id",
+    ),
+    (
+        _page(_filters().apply(select(Task.id, Task.title).where(Task.project_id == 1)), Task.id),
+        "ix_tasks_project_id_id",
+    ),
+    (
+        _page(_filters().apply(select(Task.id, Task.title).where(Task.assignee_id == 1)), Task.id),
+        "ix_tasks_assignee_id_id",
+    ),
+    (
+        _page(_filters(status=TaskStatus.IN_PROGRESS).apply(select(Task.id, Task.title).where(Task.assignee_id == 1)), Task.id),
+        "ix_tasks_assignee_id_status_id",
+    ),
+    (
+        _page(_filters(status=TaskStatus.TODO).apply(select(Task.id, Task.title)), Task.id),
+        "ix_tasks_status_id",
+    ),
+    (
+        _page(select(User.id, User.email).where(User.role == UserRole.DEVELOPER), User.id),
+        "ix_users_role_id",
+    ),
+], ids=lambda value: value if isinstance(value, str) else "")
+async def test_listing_uses_index(db, stmt, index):
+    assert index in await plan(db, stmt)
+
+async def test_payment_queue_uses_partial_index(analyzed):
+    # pay_batch by project
+    stmt = (
+        select(Task.id, Task.hourly_rate)
+        .where(Task.project_id == 1, Task.status == TaskStatus.SUBMITTED)
+        .order_by(Task.id)
+    )
+    assert "ix_tasks_submitted_project_id" in await plan(analyzed, stmt)
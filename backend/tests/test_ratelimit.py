@@ -0,0 +1,59 @@
+import pytest
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.modules.auth.ratelimit import RateLimit, RateLimitMiddleware
+
+pytestmark = pytest.mark.anyio
+
+def _scope(token: str | None, path: str = "/api/v1/tasks/1/submit") -> dict:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {"type": "http", "method": "POST", "path": path, "headers": headers}
+
+async def _call(middleware: RateLimitMiddleware, scope: dict) -> tuple[int, dict, bool]:
+    # (status, response headers, whether the body was read)
+    body_read = False
+    sent = []
+
+    async def receive():
+        nonlocal body_read
+        body_read = True
+        return {"type": "http.request", "body": b"upload", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    start = sent[0]
+    return start["status"], dict(start["headers"]), body_read
+
+async def _app(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+@pytest.fixture
+def middleware(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    return RateLimitMiddleware(_app, RateLimit("test-submit", "2/hour"), "POST", r"/api/v1/tasks/\d+/submit")
+
+async def test_rejects_before_reading_the_body(middleware):
+    token = create_access_token("limited@test.io")
+    for remaining in (b"1", b"0"):
+        status, headers, body_read = await _call(middleware, _scope(token))
+        assert (status, headers[b"ratelimit-remaining"], body_read) == (200, remaining, True)
+    status, headers, body_read = await _call(middleware, _scope(token))
+    assert status == 429
+    assert int(headers[b"retry-after"]) >= 1
+    assert not body_read
+
+async def test_buckets_are_per_user(middleware):
+    for _ in range(3):
+        await _call(middleware, _scope(create_access_token("busy@test.io")))
+    status, _, _ = await _call(middleware, _scope(create_access_token("idle@test.io")))
+    assert status == 200
+
+async def test_other_requests_pass_unlimited(middleware):
+    # Other paths, and tokens the route itself will reject
+    for scope in [_scope(None), _scope("not-a-token"), _scope(create_access_token("x@test.io"), "/api/v1/tasks/1")] * 3:
+        status, headers, _ = await _call(middleware, scope)
+        assert status == 200 and b"ratelimit-limit" not in headers
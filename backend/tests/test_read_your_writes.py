@@ -0,0 +1,24 @@
+import hashlib
+import pytest
+from app.core.database import get_read_your_writes
+from tests.conftest import P
+
+pytestmark = pytest.mark.anyio
+
+def _key(headers: dict) -> str:
+    return hashlib.sha256(headers["Authorization"].encode()).hexdigest()
+
+async def test_writes_pin_the_client(client, register):
+    buyer, _ = await register("buyer")
+    store = get_read_your_writes()
+    await client.get(f"{P}/projects/", headers=buyer)
+    assert not await store.pinned(_key(buyer))
+    r = await client.post(f"{P}/projects/", json={"title": "p", "description": "d"}, headers=buyer)
+    assert r.status_code == 200
+    assert await store.pinned(_key(buyer))
+
+async def test_failed_writes_do_not_pin(client, register):
+    developer, _ = await register("developer")
+    r = await client.post(f"{P}/projects/", json={"title": "p", "description": "d"}, headers=developer)
+    assert r.status_code == 403
+    assert not await get_read_your_writes().pinned(_key(developer))
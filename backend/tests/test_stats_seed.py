@@ -0,0 +1,21 @@
+import asyncio
+import pytest
+from sqlalchemy import delete
+from app.core.database import AsyncSessionLocal
+from app.modules.stats.models import BuyerCounters, DeveloperCounters, PlatformCounters
+from app.modules.stats.reconcile import ensure_initialized, reconcile
+
+pytestmark = pytest.mark.anyio
+
+async def _seed():
+    async with AsyncSessionLocal() as db:
+        await ensure_initialized(db)
+
+async def test_concurrent_boots_seed_once(db, project_with_tasks):
+    await project_with_tasks(2)
+    # A database that predates the rollups, booted by several processes at once
+    for model in (PlatformCounters, BuyerCounters, DeveloperCounters):
+        await db.execute(delete(model))
+    await db.commit()
+    await asyncio.gather(*(_seed() for _ in range(4)))
+    assert await reconcile(db, fix=False) == []
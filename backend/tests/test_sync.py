@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.modules.projects.models import Task
+from tests.conftest import P
+
+pytestmark = pytest.mark.anyio
+
+async def _sync(client, headers, cursor=None, **params):
+    if cursor is not None:
+        params["cursor"] = cursor
+    r = await client.get(f"{P}/sync/tasks", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+async def test_full_then_delta(client, project_with_tasks):
+    data = await project_with_tasks(3)
+    first = await _sync(client, data["developer"])
+    assert sorted(t["id"] for t in first["changes"]) == sorted(data["task_ids"])
+    assert first["has_more"] is False
+
+    moved = data["task_ids"][0]
+    r = await client.patch(f"{P}/tasks/bulk", json={"task_ids": [moved], "status": "in_progress"}, headers=data["developer"])
+    assert r.json()["updated"] == [moved]
+    delta = await _sync(client, data["developer"], first["cursor"])
+    assert {t["id"]: t["status"] for t in delta["changes"]}[moved] == "in_progress"
+
+async def test_pages(client, project_with_tasks):
+    data = await project_with_tasks(5)
+    seen, cursor = [], None
+    while True:
+        page = await _sync(client, data["buyer"], cursor, limit=2)
+        assert len(page["changes"]) <= 2
+        seen += [t["id"] for t in page["changes"]]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+    assert sorted(seen) == sorted(data["task_ids"])
+
+async def test_idle_cursor_does_not_expire(client, db, project_with_tasks):
+    # Nothing changed for longer than the tombstone retention: the cursor of a
+    # caught-up client must still be accepted
+    data = await project_with_tasks(1)
+    stale = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 10)
+    await db.execute(update(Task).where(Task.id.in_(data["task_ids"])).values(updated_at=stale))
+    await db.commit()
+    first = await _sync(client, data["developer"])
+    assert [t["id"] for t in first["changes"]] == data["task_ids"]
+    second = await _sync(client, data["developer"], first["cursor"])
+    assert second["changes"] == []
+
+async def test_deleted(client, db, project_with_tasks):
+    data = await project_with_tasks(2)
+    first = await _sync(client, data["developer"])
+    gone = data["task_ids"][1]
+    await db.delete(await db.get(Task, gone))
+    await db.commit()
+    delta = await _sync(client, data["developer"], first["cursor"])
+    assert delta["deleted"] == [gone]
+    assert gone not in [t["id"] for t in delta["changes"]]
+
+async def test_expired_cursor(client, project_with_tasks):
+    data = await project_with_tasks(1)
+    old = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+    r = await client.get(f"{P}/sync/tasks", params={"cursor": encode_cursor({"t": old.isoformat(), "i": 0})}, headers=data["developer"])
+    assert r.status_code == 410